@@ -0,0 +1,16 @@
+-- Migration: Add composite indexes for grocery list queries
+-- Description: Match the filter + ORDER BY shapes in GroceryListRepository so lookups avoid sort-after-scan
+
+-- Active lists per user / meal plan, newest first
+CREATE INDEX IF NOT EXISTS idx_gl_user_active_created ON grocery_lists (user_id, created_at) WHERE is_active;
+CREATE INDEX IF NOT EXISTS idx_gl_mealplan_active_created ON grocery_lists (meal_plan_id, created_at) WHERE is_active;
+
+-- Items of a list ordered by category then name (also serves the per-category lookup)
+CREATE INDEX IF NOT EXISTS idx_gli_list_cat_name ON grocery_list_items (grocery_list_id, category, ingredient_name);
+
+-- Checked / custom counts and filters per list
+CREATE INDEX IF NOT EXISTS idx_gli_list_checked ON grocery_list_items (grocery_list_id, is_checked);
+CREATE INDEX IF NOT EXISTS idx_gli_list_custom ON grocery_list_items (grocery_list_id, is_custom);
+
+-- Migration complete
+SELECT 'grocery list composite indexes created successfully' as status;
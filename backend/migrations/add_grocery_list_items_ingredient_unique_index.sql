@@ -0,0 +1,29 @@
+-- Migration: Add unique ingredient/unit index to grocery_list_items
+-- Description: One row per (list, ingredient, unit) so adding an ingredient already on a list merges into it with INSERT ... ON CONFLICT
+
+-- Fold existing duplicates into the row with the lowest id before the index is built
+UPDATE grocery_list_items g
+SET quantity = d.quantity,
+    estimated_cost = d.estimated_cost
+FROM (
+    SELECT (array_agg(id ORDER BY id))[1] AS keep_id,
+           left(string_agg(quantity, ', ' ORDER BY id), 100) AS quantity,
+           sum(estimated_cost) AS estimated_cost
+    FROM grocery_list_items
+    GROUP BY grocery_list_id, lower(ingredient_name), coalesce(unit, '')
+    HAVING count(*) > 1
+) d
+WHERE g.id = d.keep_id;
+
+DELETE FROM grocery_list_items g
+USING grocery_list_items k
+WHERE g.grocery_list_id = k.grocery_list_id
+  AND lower(g.ingredient_name) = lower(k.ingredient_name)
+  AND coalesce(g.unit, '') = coalesce(k.unit, '')
+  AND k.id < g.id;
+
+CREATE UNIQUE INDEX IF NOT EXISTS ux_gli_list_ing_unit
+    ON grocery_list_items (grocery_list_id, lower(ingredient_name), coalesce(unit, ''));
+
+-- Migration complete
+SELECT 'grocery_list_items unique ingredient index created successfully' as status;
@@ -0,0 +1,8 @@
+-- Migration: Add version counter to grocery_lists
+-- Description: Bumped whenever a list's items change so cached list statistics can be keyed on (list id, version)
+
+ALTER TABLE grocery_lists
+    ADD COLUMN IF NOT EXISTS version INTEGER NOT NULL DEFAULT 0;
+
+-- Migration complete
+SELECT 'grocery_lists version column added successfully' as status;
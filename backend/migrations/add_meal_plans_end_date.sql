@@ -0,0 +1,14 @@
+-- Migration: Persist end_date on meal_plans
+-- Description: Store plan_date + duration_days - 1 so overlap checks can compare both range bounds against an index
+
+ALTER TABLE meal_plans ADD COLUMN IF NOT EXISTS end_date DATE;
+
+UPDATE meal_plans
+SET end_date = plan_date + (COALESCE(duration_days, 1) - 1)
+WHERE end_date IS NULL;
+
+CREATE INDEX IF NOT EXISTS idx_meal_plans_user_active_dates
+    ON meal_plans (user_id, is_active, plan_date, end_date);
+
+-- Migration complete
+SELECT 'meal_plans end_date column and index created successfully' as status;
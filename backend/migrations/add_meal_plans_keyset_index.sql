@@ -0,0 +1,8 @@
+-- Migration: Add keyset pagination index to meal_plans
+-- Description: Serve a user's plans newest-first by (created_at, id) so each page seeks instead of skipping OFFSET rows
+
+CREATE INDEX IF NOT EXISTS idx_meal_plans_user_active_created
+    ON meal_plans (user_id, is_active, created_at DESC, id DESC);
+
+-- Migration complete
+SELECT 'meal_plans keyset pagination index created successfully' as status;
@@ -0,0 +1,11 @@
+-- Migration: Make the meal_plans keyset index partial on is_active
+-- Description: Soft-deleted plans stay in the table (grocery_lists.meal_plan_id references them), so keep them out of the hot indexes instead of partitioning
+
+CREATE INDEX IF NOT EXISTS idx_meal_plans_user_created_active
+    ON meal_plans (user_id, created_at DESC, id DESC) WHERE is_active;
+
+-- Superseded by the partial index above
+DROP INDEX IF EXISTS idx_meal_plans_user_active_created;
+
+-- Migration complete
+SELECT 'meal_plans partial keyset index created successfully' as status;
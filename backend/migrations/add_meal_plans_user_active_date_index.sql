@@ -0,0 +1,11 @@
+-- Migration: Add partial covering index for active meal plans by date
+-- Description: Serve current/recent/date-range lookups and overlap checks as index range scans; end_date and id are included so they need no heap access
+
+CREATE INDEX IF NOT EXISTS idx_meal_plans_user_active_date
+    ON meal_plans (user_id, plan_date DESC) INCLUDE (end_date, id) WHERE is_active;
+
+-- Superseded by the partial covering index above
+DROP INDEX IF EXISTS idx_meal_plans_user_active_dates;
+
+-- Migration complete
+SELECT 'meal_plans active date index created successfully' as status;
@@ -0,0 +1,10 @@
+-- Migration: Add partial index on active recipe ids
+-- Description: Let get_recipe_count's count(id) over active recipes run as an index-only scan
+
+CREATE INDEX IF NOT EXISTS idx_recipes_active_id ON recipes (id) WHERE is_active;
+
+-- Index-only scans need an up-to-date visibility map
+VACUUM ANALYZE recipes;
+
+-- Migration complete
+SELECT 'recipe active id index created successfully' as status;
@@ -0,0 +1,8 @@
+-- Migration: Add partial indexes on active recipes
+-- Description: Serve the meal type and difficulty GROUP BY counts in get_recipe_statistics from small partial indexes
+
+CREATE INDEX IF NOT EXISTS idx_recipes_active_meal ON recipes (meal_type) WHERE is_active;
+CREATE INDEX IF NOT EXISTS idx_recipes_active_difficulty ON recipes (difficulty_level) WHERE is_active;
+
+-- Migration complete
+SELECT 'recipe partial indexes created successfully' as status;
@@ -0,0 +1,7 @@
+-- Migration: Add partial index on active recipe cost
+-- Description: Serve get_recipes_by_budget_range cost range filters from an index instead of a sequential scan
+
+CREATE INDEX IF NOT EXISTS idx_recipes_cost_active ON recipes (estimated_cost_usd) WHERE is_active;
+
+-- Migration complete
+SELECT 'recipe cost index created successfully' as status;
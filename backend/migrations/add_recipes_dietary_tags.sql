@@ -0,0 +1,24 @@
+-- Migration: Add dietary_tags to recipes
+-- Description: Store the dietary restrictions each recipe satisfies as a JSONB array so restriction filters run in SQL
+
+ALTER TABLE recipes ADD COLUMN IF NOT EXISTS dietary_tags JSONB;
+
+-- Backfill using the same keyword rules as core.models.recipe.DIETARY_RESTRICTION_KEYWORDS
+UPDATE recipes r
+SET dietary_tags = (
+    SELECT COALESCE(jsonb_agg(rules.tag ORDER BY rules.tag), '[]'::jsonb)
+    FROM (VALUES
+        ('vegan', 'meat|chicken|beef|pork|fish|dairy|milk|cheese|egg'),
+        ('vegetarian', 'meat|chicken|beef|pork|fish'),
+        ('gluten-free', 'wheat|flour|bread|pasta|gluten'),
+        ('dairy-free', 'milk|cheese|butter|cream|dairy'),
+        ('nut-free', 'nuts|almond|peanut|walnut|cashew')
+    ) AS rules(tag, forbidden)
+    WHERE lower(r.name || ' ' || COALESCE(r.description, '') || ' ' || r.ingredients::text) !~ rules.forbidden
+)
+WHERE r.dietary_tags IS NULL;
+
+CREATE INDEX IF NOT EXISTS idx_recipes_tags_gin ON recipes USING gin (dietary_tags jsonb_path_ops);
+
+-- Migration complete
+SELECT 'recipes dietary_tags column added successfully' as status;
@@ -0,0 +1,39 @@
+-- Migration: Fill recipes.dietary_tags on write
+-- Description: Compute dietary_tags in a BEFORE INSERT/UPDATE trigger when a writer leaves it NULL (e.g. the raw-SQL recipe seeds), so restriction filters never miss those rows
+
+-- Same keyword rules as core.models.recipe.DIETARY_RESTRICTION_KEYWORDS
+CREATE OR REPLACE FUNCTION recipe_dietary_tags(name TEXT, description TEXT, ingredients TEXT)
+RETURNS JSONB AS $$
+    SELECT COALESCE(jsonb_agg(rules.tag ORDER BY rules.tag), '[]'::jsonb)
+    FROM (VALUES
+        ('vegan', 'meat|chicken|beef|pork|fish|dairy|milk|cheese|egg'),
+        ('vegetarian', 'meat|chicken|beef|pork|fish'),
+        ('gluten-free', 'wheat|flour|bread|pasta|gluten'),
+        ('dairy-free', 'milk|cheese|butter|cream|dairy'),
+        ('nut-free', 'nuts|almond|peanut|walnut|cashew')
+    ) AS rules(tag, forbidden)
+    WHERE lower(name || ' ' || COALESCE(description, '') || ' ' || COALESCE(ingredients, '')) !~ rules.forbidden
+$$ LANGUAGE sql IMMUTABLE;
+
+CREATE OR REPLACE FUNCTION fill_recipes_dietary_tags()
+RETURNS TRIGGER AS $$
+BEGIN
+    NEW.dietary_tags = recipe_dietary_tags(NEW.name, NEW.description, NEW.ingredients::text);
+    RETURN NEW;
+END;
+$$ LANGUAGE plpgsql;
+
+DROP TRIGGER IF EXISTS trigger_fill_recipes_dietary_tags ON recipes;
+CREATE TRIGGER trigger_fill_recipes_dietary_tags
+    BEFORE INSERT OR UPDATE ON recipes
+    FOR EACH ROW
+    WHEN (NEW.dietary_tags IS NULL)
+    EXECUTE FUNCTION fill_recipes_dietary_tags();
+
+-- Rows inserted without tags since add_recipes_dietary_tags.sql ran
+UPDATE recipes
+SET dietary_tags = recipe_dietary_tags(name, description, ingredients::text)
+WHERE dietary_tags IS NULL;
+
+-- Migration complete
+SELECT 'recipes dietary_tags trigger added successfully' as status;
@@ -0,0 +1,16 @@
+-- Migration: Add composite indexes for search_recipes filter combinations
+-- Description: Single-index lookups for the meal type / difficulty / cuisine filters combined with name search
+
+CREATE EXTENSION IF NOT EXISTS pg_trgm;
+CREATE EXTENSION IF NOT EXISTS btree_gin;
+
+CREATE INDEX IF NOT EXISTS idx_recipes_meal_diff_active ON recipes (meal_type, difficulty_level) WHERE is_active;
+
+-- cuisine_type is matched with ILIKE '%term%', which only a trigram index can serve
+CREATE INDEX IF NOT EXISTS idx_recipes_cuisine_trgm_active ON recipes USING gin (cuisine_type gin_trgm_ops) WHERE is_active;
+
+-- Meal type equality plus name substring search in one GIN index
+CREATE INDEX IF NOT EXISTS idx_recipes_meal_name_gin ON recipes USING gin (meal_type, name gin_trgm_ops) WHERE is_active;
+
+-- Migration complete
+SELECT 'recipe search composite indexes created successfully' as status;
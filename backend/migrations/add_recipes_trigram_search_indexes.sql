@@ -0,0 +1,10 @@
+-- Migration: Add trigram indexes for recipe search
+-- Description: Let the unanchored ILIKE '%term%' predicates in search_recipes use GIN trigram indexes instead of a sequential scan
+
+CREATE EXTENSION IF NOT EXISTS pg_trgm;
+
+CREATE INDEX IF NOT EXISTS idx_recipes_name_trgm ON recipes USING gin (name gin_trgm_ops);
+CREATE INDEX IF NOT EXISTS idx_recipes_desc_trgm ON recipes USING gin (description gin_trgm_ops);
+
+-- Migration complete
+SELECT 'recipe trigram search indexes created successfully' as status;
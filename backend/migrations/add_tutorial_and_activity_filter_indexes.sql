@@ -0,0 +1,13 @@
+-- Migration: Add composite indexes for tutorial filters and activity feed queries
+-- Description: Lets tutorial listing and feed visibility queries use index range scans instead of sequential scans
+
+-- Tutorial listing filters (category, difficulty, duration) on active tutorials
+CREATE INDEX IF NOT EXISTS idx_tut_cat_diff_dur ON tutorials (category, difficulty_level, estimated_duration_minutes) WHERE is_active;
+CREATE INDEX IF NOT EXISTS idx_tut_beginner ON tutorials (is_beginner_friendly) WHERE is_active;
+
+-- Activity feed: per-user newest-first and public activities newest-first
+CREATE INDEX IF NOT EXISTS idx_act_user_created ON user_activities (user_id, created_at DESC);
+CREATE INDEX IF NOT EXISTS idx_act_public ON user_activities (created_at DESC) WHERE privacy_level = 'public';
+
+-- Migration complete
+SELECT 'tutorial and activity filter indexes created successfully' as status;
@@ -0,0 +1,46 @@
+-- Migration: Keep tutorial_tags in sync on write
+-- Description: Rebuild a tutorial's tutorial_tags rows in an AFTER INSERT/UPDATE trigger, so tutorials written by raw SQL (e.g. seed_tutorials.sql) stay searchable
+
+CREATE OR REPLACE FUNCTION sync_tutorial_tags()
+RETURNS TRIGGER AS $$
+BEGIN
+    DELETE FROM tutorial_tags WHERE tutorial_id = NEW.id;
+    
+    INSERT INTO tutorial_tags (tutorial_id, kind, tag)
+    SELECT DISTINCT NEW.id, terms.kind, lower(trim(terms.term))
+    FROM (
+        SELECT 'tag' AS kind, value AS term FROM json_array_elements_text(COALESCE(NEW.tags::json, '[]'::json))
+        UNION ALL
+        SELECT 'keyword', value FROM json_array_elements_text(COALESCE(NEW.keywords::json, '[]'::json))
+        UNION ALL
+        SELECT 'equipment', value FROM json_array_elements_text(COALESCE(NEW.equipment_needed::json, '[]'::json))
+    ) AS terms
+    WHERE trim(terms.term) <> ''
+    ON CONFLICT DO NOTHING;
+    
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+
+DROP TRIGGER IF EXISTS trigger_sync_tutorial_tags ON tutorials;
+CREATE TRIGGER trigger_sync_tutorial_tags
+    AFTER INSERT OR UPDATE OF tags, keywords, equipment_needed ON tutorials
+    FOR EACH ROW
+    EXECUTE FUNCTION sync_tutorial_tags();
+
+-- Tutorials inserted since create_tutorial_tags_table.sql ran
+INSERT INTO tutorial_tags (tutorial_id, kind, tag)
+SELECT DISTINCT t.id, terms.kind, lower(trim(terms.term))
+FROM tutorials t
+CROSS JOIN LATERAL (
+    SELECT 'tag' AS kind, value AS term FROM json_array_elements_text(COALESCE(t.tags::json, '[]'::json))
+    UNION ALL
+    SELECT 'keyword', value FROM json_array_elements_text(COALESCE(t.keywords::json, '[]'::json))
+    UNION ALL
+    SELECT 'equipment', value FROM json_array_elements_text(COALESCE(t.equipment_needed::json, '[]'::json))
+) AS terms
+WHERE trim(terms.term) <> ''
+ON CONFLICT DO NOTHING;
+
+-- Migration complete
+SELECT 'tutorial_tags sync trigger added successfully' as status;
@@ -0,0 +1,11 @@
+-- Migration: Add generated total_time_minutes to user_recipes
+-- Description: Store prep + cook time as a generated column so "under N minutes" filters use an index instead of computing per row
+
+ALTER TABLE user_recipes
+    ADD COLUMN IF NOT EXISTS total_time_minutes INTEGER
+    GENERATED ALWAYS AS (prep_time_minutes + cook_time_minutes) STORED;
+
+CREATE INDEX IF NOT EXISTS idx_user_recipes_total_time ON user_recipes (total_time_minutes);
+
+-- Migration complete
+SELECT 'user_recipes total_time_minutes column added successfully' as status;
@@ -0,0 +1,7 @@
+-- Migration: Index users.email_verification_token
+-- Description: Email verification looks users up by token
+
+CREATE INDEX IF NOT EXISTS ix_users_email_verification_token ON users(email_verification_token);
+
+-- Migration complete
+SELECT 'users.email_verification_token index created successfully' as status;
@@ -0,0 +1,15 @@
+-- Migration: Store user_activities.activity_data as JSONB
+-- Description: The driver returns JSONB as a Python dict, so feed reads no longer re-parse JSON text
+
+-- Convert the existing JSON text payloads in place
+ALTER TABLE user_activities
+    ALTER COLUMN activity_data TYPE JSONB USING activity_data::jsonb;
+
+ALTER TABLE user_activities
+    ALTER COLUMN activity_data SET DEFAULT '{}'::jsonb;
+
+-- Index activity payloads for containment (@>) queries
+CREATE INDEX IF NOT EXISTS idx_activity_data ON user_activities USING GIN (activity_data jsonb_path_ops);
+
+-- Migration complete
+SELECT 'user_activities.activity_data converted to JSONB successfully' as status;
@@ -0,0 +1,21 @@
+-- Migration: Store tutorial category and difficulty_level as PostgreSQL enums
+-- Description: Fixed-width enum comparisons instead of variable-length text for tutorial filters
+
+DO $$
+BEGIN
+    IF NOT EXISTS (SELECT 1 FROM pg_type WHERE typname = 'category_enum') THEN
+        CREATE TYPE category_enum AS ENUM ('knife_skills', 'cooking_methods', 'food_safety', 'baking_basics', 'kitchen_basics');
+    END IF;
+    IF NOT EXISTS (SELECT 1 FROM pg_type WHERE typname = 'difficulty_enum') THEN
+        CREATE TYPE difficulty_enum AS ENUM ('beginner', 'intermediate', 'advanced');
+    END IF;
+END
+$$;
+
+-- Indexes on these columns are rebuilt automatically by ALTER COLUMN TYPE
+ALTER TABLE tutorials
+    ALTER COLUMN category TYPE category_enum USING category::category_enum,
+    ALTER COLUMN difficulty_level TYPE difficulty_enum USING difficulty_level::difficulty_enum;
+
+-- Migration complete
+SELECT 'tutorials category/difficulty_level converted to enums successfully' as status;
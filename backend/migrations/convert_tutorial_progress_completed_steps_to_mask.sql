@@ -0,0 +1,18 @@
+-- Migration: Replace tutorial_progress.completed_steps JSON array with a bitmask
+-- Description: Bit (n - 1) of completed_mask is set when step n is completed (up to 63 steps)
+
+ALTER TABLE tutorial_progress ADD COLUMN IF NOT EXISTS completed_mask BIGINT DEFAULT 0;
+
+-- Backfill the mask from the existing JSON step lists
+UPDATE tutorial_progress
+SET completed_mask = COALESCE((
+    SELECT SUM(DISTINCT (1::bigint << (step.value::int - 1)))
+    FROM json_array_elements_text(completed_steps::json) AS step
+    WHERE step.value::int BETWEEN 1 AND 63
+), 0)
+WHERE completed_steps IS NOT NULL;
+
+ALTER TABLE tutorial_progress DROP COLUMN IF EXISTS completed_steps;
+
+-- Migration complete
+SELECT 'tutorial_progress.completed_mask backfilled successfully' as status;
@@ -0,0 +1,13 @@
+-- Migration: Store tutorial_progress.user_id as UUID with a foreign key to users
+-- Description: Joins with users compare 16-byte UUIDs instead of casting 36-byte text per row
+
+ALTER TABLE tutorial_progress
+    ALTER COLUMN user_id TYPE UUID USING user_id::uuid;
+
+ALTER TABLE tutorial_progress
+    ADD CONSTRAINT fk_progress_user FOREIGN KEY (user_id) REFERENCES users(id);
+
+CREATE INDEX IF NOT EXISTS ix_tutorial_progress_user_id ON tutorial_progress(user_id);
+
+-- Migration complete
+SELECT 'tutorial_progress.user_id converted to UUID successfully' as status;
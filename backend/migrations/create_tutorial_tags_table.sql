@@ -0,0 +1,28 @@
+-- Migration: Create tutorial_tags table
+-- Description: Inverted index of tutorial tags, keywords and equipment so "tutorials having X" is an index lookup
+
+CREATE TABLE IF NOT EXISTS tutorial_tags (
+    tutorial_id INTEGER NOT NULL REFERENCES tutorials(id) ON DELETE CASCADE,
+    kind VARCHAR(20) NOT NULL, -- tag, keyword, equipment
+    tag VARCHAR(255) NOT NULL, -- lowercased term
+    PRIMARY KEY (tutorial_id, kind, tag)
+);
+
+CREATE INDEX IF NOT EXISTS idx_tutorial_tags_tag ON tutorial_tags (kind, tag) INCLUDE (tutorial_id);
+
+-- Backfill from the denormalized JSON columns on tutorials
+INSERT INTO tutorial_tags (tutorial_id, kind, tag)
+SELECT DISTINCT t.id, terms.kind, lower(trim(terms.term))
+FROM tutorials t
+CROSS JOIN LATERAL (
+    SELECT 'tag' AS kind, value AS term FROM json_array_elements_text(COALESCE(t.tags::json, '[]'::json))
+    UNION ALL
+    SELECT 'keyword', value FROM json_array_elements_text(COALESCE(t.keywords::json, '[]'::json))
+    UNION ALL
+    SELECT 'equipment', value FROM json_array_elements_text(COALESCE(t.equipment_needed::json, '[]'::json))
+) AS terms
+WHERE trim(terms.term) <> ''
+ON CONFLICT DO NOTHING;
+
+-- Migration complete
+SELECT 'tutorial_tags table created successfully' as status;
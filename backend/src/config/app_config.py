@@ -23,8 +23,10 @@ class Config:
     SQLALCHEMY_TRACK_MODIFICATIONS = False
     SQLALCHEMY_ENGINE_OPTIONS = {
         'pool_pre_ping': True,
-        'pool_recycle': 300,
+        'pool_recycle': int(os.getenv('DATABASE_POOL_RECYCLE', 1800)),
     }
+    # Set when connecting through PgBouncer so it, not the app, pools connections
+    SQLALCHEMY_USE_NULLPOOL = os.getenv('DATABASE_USE_PGBOUNCER', 'False').lower() == 'true'
     
     # MongoDB Configuration
     MONGODB_URI = os.getenv('MONGODB_URI', 'mongodb://localhost:27017/foodi_mongo')
@@ -48,10 +50,14 @@ class Config:
     
     # Rate Limiting
     RATE_LIMIT_STORAGE_URL = os.getenv('RATE_LIMIT_STORAGE_URL', 'memory://')
+    
+    # Log lazy loads that should have been eager loads (requires the nplusone package)
+    NPLUSONE_ENABLED = os.getenv('NPLUSONE_ENABLED', 'False').lower() == 'true'
 
 class DevelopmentConfig(Config):
     """Development configuration"""
     DEBUG = True
+    NPLUSONE_ENABLED = True
 
 class ProductionConfig(Config):
     """Production configuration"""
@@ -7,8 +7,9 @@ import uuid
 from datetime import datetime
 from typing import Optional, List, Dict, Any
 from sqlalchemy.dialects.postgresql import UUID
-from sqlalchemy import Column, String, DateTime, Boolean, ForeignKey, Integer
+from sqlalchemy import Column, String, DateTime, Boolean, ForeignKey, Integer, Index, func, literal_column, text
 from sqlalchemy.types import JSON
+from sqlalchemy.orm import relationship
 from decimal import Decimal
 
 from data_access.database import db
@@ -31,11 +32,23 @@ class GroceryList(db.Model):
     
     # Status
     is_active = Column(Boolean, default=True)
+    version = Column(Integer, nullable=False, default=0, server_default=text('0'))  # Bumped on every item change
     
     # Timestamps
     created_at = Column(DateTime, default=datetime.utcnow)
     updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
     
+    # Relationships
+    items = relationship(
+        "GroceryListItem", back_populates="grocery_list",
+        order_by="[GroceryListItem.category, GroceryListItem.ingredient_name]"
+    )
+    
+    __table_args__ = (
+        Index('idx_gl_user_active_created', 'user_id', 'created_at', postgresql_where=text('is_active')),
+        Index('idx_gl_mealplan_active_created', 'meal_plan_id', 'created_at', postgresql_where=text('is_active')),
+    )
+    
     def __init__(self, user_id: str, name: str, meal_plan_id: Optional[str] = None,
                  total_estimated_cost: Optional[int] = None):
         """Initialize a new grocery list"""
@@ -99,6 +112,21 @@ class GroceryListItem(db.Model):
     # Timestamps
     created_at = Column(DateTime, default=datetime.utcnow)
     
+    # Relationships
+    grocery_list = relationship("GroceryList", back_populates="items")
+    
+    __table_args__ = (
+        Index('idx_gli_list_cat_name', 'grocery_list_id', 'category', 'ingredient_name'),
+        Index('idx_gli_list_checked', 'grocery_list_id', 'is_checked'),
+        Index('idx_gli_list_custom', 'grocery_list_id', 'is_custom'),
+        # One row per ingredient and unit on a list; repeat adds merge into it
+        Index(
+            'ux_gli_list_ing_unit',
+            grocery_list_id, func.lower(ingredient_name), func.coalesce(unit, literal_column("''")),
+            unique=True,
+        ),
+    )
+    
     def __init__(self, grocery_list_id: str, ingredient_name: str, quantity: str,
                  unit: Optional[str] = None, category: Optional[str] = None,
                  estimated_cost: Optional[int] = None, is_custom: bool = False):
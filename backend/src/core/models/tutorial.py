@@ -5,13 +5,54 @@ Represents cooking tutorials and skill-building content
 
 import uuid
 from datetime import datetime
-from typing import Optional, List, Dict, Any
+from enum import StrEnum
+from operator import attrgetter
+from typing import Optional, List, Dict, Any, Set, Tuple
 from sqlalchemy.dialects.postgresql import UUID
-from sqlalchemy import Column, String, DateTime, Integer, Text, Boolean
+from sqlalchemy import Column, String, DateTime, Integer, BigInteger, Text, Boolean, Index, ForeignKey, Enum, text, false
 from sqlalchemy.types import JSON
 
 from data_access.database import db
 
+class TutorialCategory(StrEnum):
+    """Tutorial categories, mirrored by the category_enum database type"""
+    KNIFE_SKILLS = 'knife_skills'
+    COOKING_METHODS = 'cooking_methods'
+    FOOD_SAFETY = 'food_safety'
+    BAKING_BASICS = 'baking_basics'
+    KITCHEN_BASICS = 'kitchen_basics'
+
+
+class TutorialDifficulty(StrEnum):
+    """Tutorial difficulty levels, mirrored by the difficulty_enum database type"""
+    BEGINNER = 'beginner'
+    INTERMEDIATE = 'intermediate'
+    ADVANCED = 'advanced'
+
+
+# StrEnum members hash like their values, so plain strings can be tested for membership
+_CATEGORIES = frozenset(TutorialCategory)
+_DIFFICULTIES = frozenset(TutorialDifficulty)
+
+
+def _enum_column_type(enum_class, name: str) -> Enum:
+    """Native enum type storing member values (not names) and rejecting unknown strings"""
+    return Enum(enum_class, name=name, values_callable=lambda members: [m.value for m in members],
+                validate_strings=True)
+
+# Serialized fields for Tutorial.to_dict, resolved once at import time
+_TUTORIAL_FIELDS = tuple((name, attrgetter(name)) for name in (
+    'id', 'title', 'description', 'category', 'subcategory', 'difficulty_level',
+    'estimated_duration_minutes', 'skill_level_required', 'thumbnail_url', 'video_url',
+    'learning_objectives', 'prerequisites', 'equipment_needed', 'tags', 'keywords',
+    'is_beginner_friendly', 'is_featured', 'is_active', 'step_count', 'view_count',
+    'completion_count', 'completion_rate', 'average_rating', 'rating_count',
+))
+_TUTORIAL_DATETIME_FIELDS = tuple((name, attrgetter(name)) for name in ('created_at', 'updated_at'))
+
+# TutorialProgress.completed_mask is a signed 64-bit column, one bit per step
+MAX_TRACKED_STEPS = 63
+
 class Tutorial(db.Model):
     """Tutorial model for storing cooking tutorial data"""
     
@@ -26,11 +67,11 @@ class Tutorial(db.Model):
     steps = Column(JSON, nullable=False)  # [{"step": 1, "title": "...", "description": "...", "image_url": "...", "video_url": "...", "duration_minutes": 5}]
     
     # Classification
-    category = Column(String(100), nullable=False)  # knife_skills, cooking_methods, food_safety, baking_basics, etc.
+    category = Column(_enum_column_type(TutorialCategory, 'category_enum'), nullable=False)
     subcategory = Column(String(100), nullable=True)  # specific technique within category
     
     # Learning Information
-    difficulty_level = Column(String(20), nullable=False)  # beginner, intermediate, advanced
+    difficulty_level = Column(_enum_column_type(TutorialDifficulty, 'difficulty_enum'), nullable=False)
     estimated_duration_minutes = Column(Integer, nullable=False)
     skill_level_required = Column(String(50), nullable=True)  # none, basic, intermediate
     
@@ -62,6 +103,13 @@ class Tutorial(db.Model):
     created_at = Column(DateTime, default=datetime.utcnow)
     updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
     
+    # Indexes backing the listing filters (partial on PostgreSQL: only active tutorials are listed)
+    __table_args__ = (
+        Index('idx_tut_cat_diff_dur', 'category', 'difficulty_level', 'estimated_duration_minutes',
+              postgresql_where=text('is_active')),
+        Index('idx_tut_beginner', 'is_beginner_friendly', postgresql_where=text('is_active')),
+    )
+    
     def __init__(self, title: str, description: str, steps: List[Dict[str, Any]], 
                  category: str, difficulty_level: str, estimated_duration_minutes: int,
                  subcategory: Optional[str] = None, skill_level_required: Optional[str] = None,
@@ -150,6 +198,40 @@ class Tutorial(db.Model):
         
         return True
     
+    def tag_terms(self) -> Set[Tuple[str, str]]:
+        """Get normalized (kind, term) pairs for the tutorial_tags index"""
+        terms = set()
+        for kind, values in ((TutorialTag.TAG, self.tags),
+                             (TutorialTag.KEYWORD, self.keywords),
+                             (TutorialTag.EQUIPMENT, self.equipment_needed)):
+            for value in values or []:
+                if value:
+                    terms.add((kind, str(value).strip().lower()))
+        return terms
+    
+    @classmethod
+    def filter_criteria(cls, category: Optional[str] = None,
+                        difficulty: Optional[str] = None,
+                        duration_max_minutes: Optional[int] = None,
+                        beginner_friendly: Optional[bool] = None) -> List[Any]:
+        """Build SQL filter clauses equivalent to matches_filters"""
+        criteria = [cls.is_active == True]
+        
+        # Values outside the enum can never match; comparing them would be an error on PostgreSQL
+        if category:
+            criteria.append(cls.category == category if category in _CATEGORIES else false())
+        
+        if difficulty:
+            criteria.append(cls.difficulty_level == difficulty if difficulty in _DIFFICULTIES else false())
+        
+        if duration_max_minutes:
+            criteria.append(cls.estimated_duration_minutes <= duration_max_minutes)
+        
+        if beginner_friendly is not None:
+            criteria.append(cls.is_beginner_friendly == beginner_friendly)
+        
+        return criteria
+    
     def increment_view_count(self):
         """Increment view count"""
         self.view_count += 1
@@ -171,46 +253,52 @@ class Tutorial(db.Model):
         
         self.rating_count = rating_count + 1
     
-    def to_dict(self, include_steps: bool = True) -> Dict[str, Any]:
-        """Convert tutorial to dictionary"""
-        data = {
-            'id': self.id,
-            'title': self.title,
-            'description': self.description,
-            'category': self.category,
-            'subcategory': self.subcategory,
-            'difficulty_level': self.difficulty_level,
-            'estimated_duration_minutes': self.estimated_duration_minutes,
-            'skill_level_required': self.skill_level_required,
-            'thumbnail_url': self.thumbnail_url,
-            'video_url': self.video_url,
-            'learning_objectives': self.learning_objectives,
-            'prerequisites': self.prerequisites,
-            'equipment_needed': self.equipment_needed,
-            'tags': self.tags,
-            'keywords': self.keywords,
-            'is_beginner_friendly': self.is_beginner_friendly,
-            'is_featured': self.is_featured,
-            'is_active': self.is_active,
-            'step_count': self.step_count,
-            'view_count': self.view_count,
-            'completion_count': self.completion_count,
-            'completion_rate': self.completion_rate,
-            'average_rating': self.average_rating,
-            'rating_count': self.rating_count,
-            'created_at': self.created_at.isoformat() if self.created_at else None,
-            'updated_at': self.updated_at.isoformat() if self.updated_at else None
-        }
+    def to_payload(self, include_steps: bool = True) -> Dict[str, Any]:
+        """Convert tutorial to a response payload with raw datetime values"""
+        data = {key: getter(self) for key, getter in _TUTORIAL_FIELDS}
+        for key, getter in _TUTORIAL_DATETIME_FIELDS:
+            data[key] = getter(self)
         
         if include_steps:
             data['steps'] = self.steps
         
         return data
     
+    def to_dict(self, include_steps: bool = True) -> Dict[str, Any]:
+        """Convert tutorial to dictionary"""
+        data = self.to_payload(include_steps=include_steps)
+        for key, _ in _TUTORIAL_DATETIME_FIELDS:
+            value = data[key]
+            data[key] = value.isoformat() if value else None
+        return data
+    
     def __repr__(self) -> str:
         return f"<Tutorial(id={self.id}, title='{self.title}', category='{self.category}', difficulty='{self.difficulty_level}')>"
 
 
+class TutorialTag(db.Model):
+    """Inverted index of tutorial tags, keywords and equipment for indexed lookups"""
+    
+    __tablename__ = 'tutorial_tags'
+    
+    # Term kinds
+    TAG = 'tag'
+    KEYWORD = 'keyword'
+    EQUIPMENT = 'equipment'
+    
+    # Primary Fields
+    tutorial_id = Column(Integer, ForeignKey('tutorials.id', ondelete='CASCADE'), primary_key=True)
+    kind = Column(String(20), primary_key=True)  # tag, keyword, equipment
+    tag = Column(String(255), primary_key=True)  # Lowercased term
+    
+    __table_args__ = (
+        Index('idx_tutorial_tags_tag', 'kind', 'tag', postgresql_include=['tutorial_id']),
+    )
+    
+    def __repr__(self) -> str:
+        return f"<TutorialTag(tutorial_id={self.tutorial_id}, kind='{self.kind}', tag='{self.tag}')>"
+
+
 class TutorialProgress(db.Model):
     """Model to track user progress through tutorials"""
     
@@ -218,12 +306,12 @@ class TutorialProgress(db.Model):
     
     # Primary Fields
     id = Column(Integer, primary_key=True, autoincrement=True)
-    user_id = Column(String(36), nullable=False)  # Foreign key to users table (UUID)
+    user_id = Column(UUID(as_uuid=True), ForeignKey('users.id'), nullable=False, index=True)
     tutorial_id = Column(Integer, nullable=False)  # Foreign key to tutorials table
     
     # Progress Information
     current_step = Column(Integer, default=1)  # Current step user is on
-    completed_steps = Column(JSON, default=list)  # List of completed step numbers
+    completed_mask = Column(BigInteger, default=0)  # Bit (n - 1) set when step n is completed
     is_completed = Column(Boolean, default=False)
     completion_percentage = Column(Integer, default=0)  # 0-100
     
@@ -245,25 +333,33 @@ class TutorialProgress(db.Model):
         """Initialize tutorial progress for a user"""
         self.user_id = user_id
         self.tutorial_id = tutorial_id
-        self.completed_steps = []
+        self.completed_mask = 0
+    
+    @property
+    def completed_steps(self) -> List[int]:
+        """Get completed step numbers in ascending order"""
+        mask = self.completed_mask or 0
+        return [bit + 1 for bit in range(mask.bit_length()) if mask >> bit & 1]
     
     def mark_step_completed(self, step_number: int, tutorial_step_count: int):
         """Mark a specific step as completed"""
-        if step_number not in self.completed_steps:
-            self.completed_steps.append(step_number)
-            self.completed_steps.sort()
+        if not 1 <= step_number <= MAX_TRACKED_STEPS:
+            raise ValueError(f"Step number must be between 1 and {MAX_TRACKED_STEPS}")
+        
+        self.completed_mask = (self.completed_mask or 0) | (1 << (step_number - 1))
+        completed_count = self.completed_mask.bit_count()
         
         # Update current step to next uncompleted step
         self.current_step = self._find_next_uncompleted_step(tutorial_step_count)
         
         # Update completion percentage
         if tutorial_step_count > 0:
-            self.completion_percentage = int((len(self.completed_steps) / tutorial_step_count) * 100)
+            self.completion_percentage = int((completed_count / tutorial_step_count) * 100)
         else:
             self.completion_percentage = 0
         
         # Check if tutorial is completed
-        if len(self.completed_steps) >= tutorial_step_count:
+        if completed_count >= tutorial_step_count:
             self.is_completed = True
             self.completed_at = datetime.utcnow()
         
@@ -271,9 +367,9 @@ class TutorialProgress(db.Model):
     
     def _find_next_uncompleted_step(self, tutorial_step_count: int) -> int:
         """Find the next uncompleted step number"""
-        for step_num in range(1, tutorial_step_count + 1):
-            if step_num not in self.completed_steps:
-                return step_num
+        remaining = ~(self.completed_mask or 0) & ((1 << tutorial_step_count) - 1)
+        if remaining:
+            return (remaining & -remaining).bit_length()  # Lowest unset bit
         return tutorial_step_count  # All steps completed
     
     def add_time_spent(self, minutes: int):
@@ -294,7 +390,7 @@ class TutorialProgress(db.Model):
         """Convert progress to dictionary"""
         return {
             'id': self.id,
-            'user_id': self.user_id,
+            'user_id': str(self.user_id),
             'tutorial_id': self.tutorial_id,
             'current_step': self.current_step,
             'completed_steps': self.completed_steps,
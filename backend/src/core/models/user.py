@@ -4,8 +4,10 @@ Represents a Foodi user account and profile information
 """
 
 import uuid
-import json
+import hmac
+import secrets
 from datetime import datetime
+from operator import attrgetter
 from typing import Optional, List, Dict, Any
 from sqlalchemy.dialects.postgresql import UUID
 from sqlalchemy import Column, String, DateTime, Boolean, Text
@@ -14,6 +16,23 @@ from sqlalchemy.orm import relationship
 import bcrypt
 
 from data_access.database import db
+from core import serialization
+
+# Serialized fields for User.to_dict, resolved once at import time
+_USER_FIELDS = tuple((key, attrgetter(attr)) for key, attr in (
+    ('username', 'username'),
+    ('email', 'email'),
+    ('first_name', 'first_name'),
+    ('last_name', 'last_name'),
+    ('dietary_restrictions', 'dietary_restrictions_list'),
+    ('cooking_experience_level', 'cooking_experience_level'),
+    ('email_verified', 'email_verified'),
+    ('is_active', 'is_active'),
+))
+_USER_DATETIME_FIELDS = tuple((name, attrgetter(name)) for name in ('created_at', 'updated_at', 'last_login'))
+_USER_SENSITIVE_FIELDS = tuple((name, attrgetter(name)) for name in (
+    'email_verification_token', 'google_id', 'apple_id',
+))
 
 class User(db.Model):
     """User model for storing user account and profile information"""
@@ -38,7 +57,7 @@ class User(db.Model):
     
     # Authentication and Verification
     email_verified = Column(Boolean, default=False)
-    email_verification_token = Column(String(255), nullable=True)
+    email_verification_token = Column(String(255), nullable=True, index=True)
     
     # Social Login Information
     google_id = Column(String(255), nullable=True, unique=True)
@@ -76,8 +95,8 @@ class User(db.Model):
         if not self.dietary_restrictions:
             return []
         try:
-            return json.loads(self.dietary_restrictions)
-        except (json.JSONDecodeError, TypeError):
+            return serialization.loads(self.dietary_restrictions)
+        except (serialization.JSONDecodeError, TypeError):
             return []
     
     @dietary_restrictions_list.setter
@@ -86,7 +105,7 @@ class User(db.Model):
         if value is None:
             self.dietary_restrictions = '[]'
         else:
-            self.dietary_restrictions = json.dumps(value)
+            self.dietary_restrictions = serialization.dumps(value)
     
     def set_password(self, password: str) -> None:
         """Hash and set the user's password"""
@@ -108,13 +127,17 @@ class User(db.Model):
     
     def generate_verification_token(self) -> str:
         """Generate a new email verification token"""
-        token = str(uuid.uuid4())
+        token = secrets.token_urlsafe(32)
         self.email_verification_token = token
         return token
     
     def verify_email(self, token: str) -> bool:
         """Verify email with the provided token"""
-        if self.email_verification_token == token:
+        if not self.email_verification_token or not token:
+            return False
+        
+        # Constant-time comparison; bytes so non-ASCII input can't raise TypeError
+        if hmac.compare_digest(self.email_verification_token.encode('utf-8'), token.encode('utf-8')):
             self.email_verified = True
             self.email_verification_token = None
             return True
@@ -124,33 +147,28 @@ class User(db.Model):
         """Update the last login timestamp"""
         self.last_login = datetime.utcnow()
     
-    def to_dict(self, include_sensitive: bool = False) -> Dict[str, Any]:
-        """Convert user to dictionary for API responses"""
-        user_dict = {
-            'id': str(self.id),
-            'username': self.username,
-            'email': self.email,
-            'first_name': self.first_name,
-            'last_name': self.last_name,
-            'dietary_restrictions': self.dietary_restrictions_list,
-            'cooking_experience_level': self.cooking_experience_level,
-            'nutritional_goals': self.nutritional_goals or {},
-            'budget_info': self.budget_info or {},
-            'email_verified': self.email_verified,
-            'is_active': self.is_active,
-            'created_at': self.created_at.isoformat() if self.created_at else None,
-            'updated_at': self.updated_at.isoformat() if self.updated_at else None,
-            'last_login': self.last_login.isoformat() if self.last_login else None,
-        }
+    def to_payload(self, include_sensitive: bool = False) -> Dict[str, Any]:
+        """Convert user to a response payload with raw UUID and datetime values"""
+        user_dict = {key: getter(self) for key, getter in _USER_FIELDS}
+        user_dict['id'] = self.id
+        user_dict['nutritional_goals'] = self.nutritional_goals or {}
+        user_dict['budget_info'] = self.budget_info or {}
+        for key, getter in _USER_DATETIME_FIELDS:
+            user_dict[key] = getter(self)
         
         if include_sensitive:
-            user_dict.update({
-                'email_verification_token': self.email_verification_token,
-                'google_id': self.google_id,
-                'apple_id': self.apple_id,
-            })
+            user_dict.update({key: getter(self) for key, getter in _USER_SENSITIVE_FIELDS})
         
         return user_dict
     
+    def to_dict(self, include_sensitive: bool = False) -> Dict[str, Any]:
+        """Convert user to dictionary for API responses"""
+        user_dict = self.to_payload(include_sensitive=include_sensitive)
+        user_dict['id'] = str(self.id)
+        for key, _ in _USER_DATETIME_FIELDS:
+            value = user_dict[key]
+            user_dict[key] = value.isoformat() if value else None
+        return user_dict
+    
     def __repr__(self) -> str:
         return f'<User {self.username} ({self.email})>' 
\ No newline at end of file
@@ -3,16 +3,36 @@ User Recipe Domain Model
 Represents a recipe in a user's personal collection (favorited or custom)
 """
 
+import re
 import uuid
 from datetime import datetime
+from operator import attrgetter
 from typing import Optional, List, Dict, Any
 from sqlalchemy.dialects.postgresql import UUID
-from sqlalchemy import Column, String, DateTime, Integer, Text, Boolean, ForeignKey
+from sqlalchemy import Column, String, DateTime, Integer, Text, Boolean, ForeignKey, Computed, Index
 from sqlalchemy.types import JSON
 from sqlalchemy.orm import relationship
 
 from data_access.database import db
 
+# Numeric portion of an ingredient quantity string, e.g. "1.5" in "1.5 cups"
+_QUANTITY_NUMBER_RE = re.compile(r'(\d+(?:\.\d+)?)')
+
+# Columns copied as-is by UserRecipe.to_dict, fetched in one attrgetter call
+_USER_RECIPE_FIELDS = (
+    'id', 'user_id', 'recipe_id', 'title', 'description', 'ingredients', 'instructions',
+    'cuisine_type', 'prep_time_minutes', 'cook_time_minutes', 'difficulty_level',
+    'servings', 'nutritional_info', 'image_url', 'is_custom',
+)
+_get_user_recipe_fields = attrgetter(*_USER_RECIPE_FIELDS)
+
+# Columns UserRecipe.update_fields may set; all are mapped, so no hasattr check is needed
+_UPDATABLE_FIELDS = frozenset({
+    'title', 'description', 'ingredients', 'instructions',
+    'cuisine_type', 'prep_time_minutes', 'cook_time_minutes', 'difficulty_level',
+    'servings', 'nutritional_info', 'image_url',
+})
+
 class UserRecipe(db.Model):
     """User Recipe model for storing user's personal recipe collection"""
     
@@ -37,6 +57,7 @@ class UserRecipe(db.Model):
     # Timing Information
     prep_time_minutes = Column(Integer, nullable=True)
     cook_time_minutes = Column(Integer, nullable=True)
+    total_time_minutes = Column(Integer, Computed('prep_time_minutes + cook_time_minutes', persisted=True))  # Generated; NULL unless both times are set
     
     # Recipe Details
     difficulty_level = Column(String(20), nullable=True)  # easy, medium, hard
@@ -59,6 +80,10 @@ class UserRecipe(db.Model):
     original_recipe = relationship("Recipe", foreign_keys=[recipe_id])
     category_assignments = relationship("UserRecipeCategoryAssignment", back_populates="user_recipe", cascade="all, delete-orphan")
     
+    __table_args__ = (
+        Index('idx_user_recipes_total_time', 'total_time_minutes'),
+    )
+    
     def __init__(self, user_id: str, title: str, ingredients: List[Dict[str, Any]], 
                  instructions: str, recipe_id: Optional[int] = None,
                  description: Optional[str] = None, cuisine_type: Optional[str] = None,
@@ -82,13 +107,6 @@ class UserRecipe(db.Model):
         self.image_url = image_url
         self.is_custom = is_custom
     
-    @property
-    def total_time_minutes(self) -> Optional[int]:
-        """Calculate total time (prep + cook)"""
-        if self.prep_time_minutes is not None and self.cook_time_minutes is not None:
-            return self.prep_time_minutes + self.cook_time_minutes
-        return None
-    
     @property
     def calories_per_serving(self) -> Optional[float]:
         """Get calories per serving"""
@@ -123,26 +141,16 @@ class UserRecipe(db.Model):
     
     def update_fields(self, **kwargs) -> None:
         """Update recipe fields from keyword arguments"""
-        allowed_fields = {
-            'title', 'description', 'ingredients', 'instructions',
-            'cuisine_type', 'prep_time_minutes', 'cook_time_minutes', 'difficulty_level', 
-            'servings', 'nutritional_info', 'image_url'
-        }
-        
         for field, value in kwargs.items():
-            if field in allowed_fields and hasattr(self, field):
+            if field in _UPDATABLE_FIELDS:
                 setattr(self, field, value)
         
         self.updated_at = datetime.utcnow()
     
     def get_instructions_list(self) -> List[str]:
         """Get step-by-step instructions as a list"""
-        # Convert text instructions to steps
-        if self.instructions:
-            lines = [line.strip() for line in self.instructions.split('\n') if line.strip()]
-            return lines
-        
-        return []
+        # Convert text instructions to steps; splitlines also handles \r\n
+        return [line for line in (raw.strip() for raw in (self.instructions or '').splitlines()) if line]
     
     def scale_recipe(self, scale_factor: float) -> Dict[str, Any]:
         """Scale recipe ingredients and portions"""
@@ -151,15 +159,11 @@ class UserRecipe(db.Model):
         
         scaled_ingredients = []
         for ingredient in self.ingredients:
-            scaled_ingredient = ingredient.copy()
-            
             # Try to scale quantities that are numeric
             quantity = ingredient.get('quantity', '')
-            try:
-                # Extract numeric portion from quantity string
-                import re
-                numeric_match = re.search(r'(\d+(?:\.\d+)?)', str(quantity))
-                if numeric_match:
+            numeric_match = _QUANTITY_NUMBER_RE.search(str(quantity))
+            if numeric_match:
+                try:
                     original_num = float(numeric_match.group(1))
                     scaled_num = original_num * scale_factor
                     
@@ -169,15 +173,16 @@ class UserRecipe(db.Model):
                     else:
                         scaled_num_str = f"{scaled_num:.2f}".rstrip('0').rstrip('.')
                     
-                    scaled_ingredient['quantity'] = quantity.replace(
-                        numeric_match.group(1), 
-                        scaled_num_str
-                    )
-            except (ValueError, AttributeError):
-                # If we can't scale it, keep original
-                pass
+                    # Only ingredients whose quantity changes are copied
+                    ingredient = {
+                        **ingredient,
+                        'quantity': quantity.replace(numeric_match.group(1), scaled_num_str)
+                    }
+                except (ValueError, AttributeError):
+                    # If we can't scale it, keep original
+                    pass
             
-            scaled_ingredients.append(scaled_ingredient)
+            scaled_ingredients.append(ingredient)
         
         # Scale nutritional info
         scaled_nutrition = {}
@@ -195,31 +200,19 @@ class UserRecipe(db.Model):
         }
     
     def get_categories(self) -> List['UserRecipeCategory']:
-        """Get all categories assigned to this recipe"""
-        from .user_recipe_category import UserRecipeCategory
+        """Get all categories assigned to this recipe
+        
+        Repository list queries eager-load category_assignments and their
+        categories, so this does not query per recipe.
+        """
         return [assignment.category for assignment in self.category_assignments]
     
     def to_dict(self) -> Dict[str, Any]:
         """Convert to dictionary for JSON serialization"""
-        return {
-            'id': self.id,
-            'user_id': self.user_id,
-            'recipe_id': self.recipe_id,
-            'title': self.title,
-            'description': self.description,
-            'ingredients': self.ingredients,
-            'instructions': self.instructions,
-            'cuisine_type': self.cuisine_type,
-            'prep_time_minutes': self.prep_time_minutes,
-            'cook_time_minutes': self.cook_time_minutes,
-            'difficulty_level': self.difficulty_level,
-            'servings': self.servings,
-            'nutritional_info': self.nutritional_info,
-            'image_url': self.image_url,
-            'is_custom': self.is_custom,
-            'created_at': self.created_at.isoformat() if self.created_at else None,
-            'updated_at': self.updated_at.isoformat() if self.updated_at else None
-        }
+        recipe_dict = dict(zip(_USER_RECIPE_FIELDS, _get_user_recipe_fields(self)))
+        recipe_dict['created_at'] = self.created_at.isoformat() if self.created_at else None
+        recipe_dict['updated_at'] = self.updated_at.isoformat() if self.updated_at else None
+        return recipe_dict
     
     def __repr__(self) -> str:
         return f"<UserRecipe(id={self.id}, user_id={self.user_id}, name='{self.title}', is_custom={self.is_custom})>" 
\ No newline at end of file
@@ -3,11 +3,17 @@ MealPlan Repository
 Data access layer for MealPlan model operations
 """
 
+import copy
 import logging
+import threading
+import time
+import uuid
 from datetime import date, datetime, timedelta
-from typing import Optional, List, Dict, Any
+from contextlib import contextmanager
+from typing import Optional, List, Dict, Any, Iterator, NotRequired, Tuple, TypedDict
+from flask import g, has_request_context
 from sqlalchemy.orm import Session
-from sqlalchemy import and_, desc
+from sqlalchemy import and_, bindparam, desc, func, select, text, tuple_, update
 
 from core.models.meal_plan import MealPlan
 from core.exceptions import ValidationError
@@ -15,30 +21,239 @@ from data_access.database import db
 
 logger = logging.getLogger(__name__)
 
-class MealPlanRepository:
-    """Repository for MealPlan data access operations"""
+# Aggregate reads (statistics, popular recipes, nutrition trends) are cached
+# per user for MEAL_PLAN_CACHE_TTL_SECONDS. Writes drop the writing user's
+# entries and the all-users ones; other processes see changes once the TTL
+# lapses. Both MealPlanRepository modules share this cache.
+MEAL_PLAN_CACHE_TTL_SECONDS = 120
+MEAL_PLAN_CACHE_MAX_ENTRIES = 4096
+_read_cache: Dict[Tuple[Any, ...], Tuple[float, Any]] = {}  # key -> (expires_at, value)
+_read_cache_lock = threading.Lock()
+
+def read_cache_key(user_id: Optional[Any], *parts: Any) -> Tuple[Any, ...]:
+    """Cache key for an aggregate read; user_id None means across all users"""
+    return (str(user_id) if user_id else None, *parts)
+
+def get_cached_read(key: Tuple[Any, ...]) -> Optional[Any]:
+    """Copy of a cached value, or None if absent or expired"""
+    with _read_cache_lock:
+        entry = _read_cache.get(key)
+    if entry is None or entry[0] <= time.monotonic():
+        return None
+    return copy.deepcopy(entry[1])
+
+def cache_read(key: Tuple[Any, ...], value: Any) -> None:
+    """Store a copy of an aggregate read result"""
+    now = time.monotonic()
+    with _read_cache_lock:
+        if len(_read_cache) >= MEAL_PLAN_CACHE_MAX_ENTRIES:
+            for stale_key in [k for k, (expires_at, _) in _read_cache.items() if expires_at <= now]:
+                del _read_cache[stale_key]
+        _read_cache[key] = (now + MEAL_PLAN_CACHE_TTL_SECONDS, copy.deepcopy(value))
+
+def invalidate_read_cache(user_id: Any) -> None:
+    """Drop cached reads a write by this user may have changed"""
+    user_key = str(user_id) if user_id else None
+    with _read_cache_lock:
+        for key in [k for k in _read_cache if k[0] in (user_key, None)]:
+            del _read_cache[key]
+
+# Rows per round trip when plan columns are iterated in Python
+MEAL_PLAN_STREAM_BATCH_SIZE = 500
+
+# Lookups by id are memoized on flask.g for the rest of the request, so the
+# API and service layers reading the same plan cost one SELECT. Mutations
+# drop the plan's entries; the memo dies with the request.
+REQUEST_MEMO_MAX_ENTRIES = 128
+
+def _request_memo() -> Optional[Dict[Tuple[str, Optional[str]], MealPlan]]:
+    if not has_request_context():
+        return None
+    return g.setdefault('meal_plan_memo', {})
+
+def _memo_key(plan_id: Any, user_id: Optional[Any]) -> Tuple[str, Optional[str]]:
+    return (str(plan_id), str(user_id) if user_id else None)
+
+def get_memoized_plan(plan_id: Any, user_id: Optional[Any]) -> Optional[MealPlan]:
+    """Plan already loaded by this request for the same (plan_id, user_id), if any"""
+    memo = _request_memo()
+    return memo.get(_memo_key(plan_id, user_id)) if memo is not None else None
+
+def memoize_plan(plan_id: Any, user_id: Optional[Any], meal_plan: MealPlan) -> None:
+    """Remember a loaded plan for the rest of the request"""
+    memo = _request_memo()
+    if memo is None:
+        return
+    if len(memo) >= REQUEST_MEMO_MAX_ENTRIES:
+        # Oldest first; a request touching this many plans gets little reuse anyway
+        del memo[next(iter(memo))]
+    memo[_memo_key(plan_id, user_id)] = meal_plan
+
+def forget_memoized_plan(plan_id: Any) -> None:
+    """Drop a plan's memoized lookups after it changes"""
+    memo = _request_memo()
+    if memo:
+        for key in [k for k in memo if k[0] == str(plan_id)]:
+            del memo[key]
+
+# PostgreSQL aggregation for get_popular_recipes; user_filter is either empty
+# or a fixed "AND user_id = :user_id" clause, never user input
+_POPULAR_RECIPES_SQL = """
+    SELECT meal->>'recipe_id' AS recipe_id,
+           coalesce(min(meal->>'recipe_name'), 'Unknown') AS recipe_name,
+           count(*) AS usage_count,
+           coalesce(array_agg(DISTINCT meal->>'meal_type')
+                    FILTER (WHERE meal->>'meal_type' IS NOT NULL), '{{}}') AS meal_types
+    FROM meal_plans CROSS JOIN LATERAL json_array_elements(meals) AS meal
+    WHERE is_active = true {user_filter}
+      AND coalesce(meal->>'recipe_id', '') <> ''
+    GROUP BY 1
+    ORDER BY usage_count DESC, recipe_id COLLATE "C"
+    LIMIT :limit
+"""
+
+def _primary_key(value: Any) -> Optional[uuid.UUID]:
+    """Coerce an id for Session.get(), or None if it is not a valid UUID"""
+    try:
+        return value if isinstance(value, uuid.UUID) else uuid.UUID(str(value))
+    except ValueError:
+        return None
+
+# Columns update_meal_plan may write; anything else in update_data is ignored.
+# updated_at is always set by the update itself, and is_active changes only
+# through delete_meal_plan
+_MEAL_PLAN_UPDATABLE_COLUMNS = frozenset(column.key for column in MealPlan.__table__.columns) - {
+    'id', 'user_id', 'created_at', 'updated_at', 'end_date', 'is_active',
+}
+
+# Updating either of these recomputes end_date in the model, which a bulk UPDATE would skip
+_END_DATE_SOURCE_COLUMNS = frozenset({'plan_date', 'duration_days'})
+
+# Result shapes of the aggregate reads. They stay plain dicts, so the read
+# cache and the API response models take them unchanged.
+class MacroNutrients(TypedDict):
+    calories: float
+    protein: float
+    carbs: float
+    fat: float
+
+class DailyNutrition(MacroNutrients):
+    date: str  # ISO date
+
+class NutritionTrends(TypedDict):
+    daily_nutrition: List[DailyNutrition]
+    averages: MacroNutrients
+    total_days: int
+
+class MealPlanStatistics(TypedDict):
+    total_meal_plans: int
+    average_rating: Optional[float]
+    budget_adherence_rate: float
+    average_variety_score: float
+    duration_distribution: Dict[int, int]
+    rated_plans_count: int
+    recent_plans_count: NotRequired[int]  # only for a single user's statistics
+
+# Session handling shared by both MealPlanRepository modules, so their write
+# paths (savepoints, commits, cache invalidation, ownership checks) stay identical
+class _MealPlanRepositoryBase:
+    """Session and commit handling for the MealPlan repositories"""
     
     def __init__(self, session: Optional[Session] = None):
         """Initialize repository with optional session"""
         self.session = session or db.session
+        # Module-level instances serve concurrent requests; batching state is per thread
+        self._local = threading.local()
+    
+    @property
+    def _defer_commit(self) -> bool:
+        return getattr(self._local, 'defer_commit', False)
+    
+    @contextmanager
+    def _savepoint(self) -> Iterator[None]:
+        """Scope one write; inside deferred_commit a failure undoes only that write"""
+        if self._defer_commit:
+            with self.session.begin_nested():
+                yield
+        else:
+            yield
+    
+    def _rollback(self) -> None:
+        """Roll back a failed write, keeping earlier writes of a deferred_commit block"""
+        if not self._defer_commit:
+            self.session.rollback()
+    
+    def _commit(self, user_id: Any) -> None:
+        """Commit a write (flush only inside deferred_commit) and drop the user's cached reads"""
+        if self._defer_commit:
+            self.session.flush()
+            self._local.touched_users.add(user_id)
+        else:
+            self.session.commit()
+        invalidate_read_cache(user_id)
+    
+    def _load_for_mutation(self, plan_id: Any, user_id: Any) -> Optional[MealPlan]:
+        """Load an active plan owned by user_id, from the identity map when already present"""
+        pk = _primary_key(plan_id)
+        meal_plan = self.session.get(MealPlan, pk) if pk else None
+        if meal_plan and meal_plan.is_active and str(meal_plan.user_id) == str(user_id):
+            return meal_plan
+        return None
+
+class MealPlanRepository(_MealPlanRepositoryBase):
+    """Repository for MealPlan data access operations"""
+    
+    @contextmanager
+    def deferred_commit(self) -> Iterator[None]:
+        """Group create/update/feedback/delete calls into a single transaction
+        
+        Inside the block those methods only flush; everything is committed once
+        on exit, or rolled back if the block raises. Each write runs in its own
+        savepoint, so one that fails (and is caught by the caller) leaves the
+        batch's earlier writes intact
+        """
+        if self._defer_commit:
+            # Nested block: the outermost one owns the commit
+            yield
+            return
+        
+        self._local.defer_commit = True
+        self._local.touched_users = set()
+        try:
+            yield
+            self.session.commit()
+        except Exception:
+            self.session.rollback()
+            raise
+        finally:
+            # Readers may have cached flushed-but-uncommitted state meanwhile
+            for user_id in self._local.touched_users:
+                invalidate_read_cache(user_id)
+            self._local.defer_commit = False
+            self._local.touched_users = set()
     
     def create_meal_plan(self, meal_plan: MealPlan) -> MealPlan:
         """Create a new meal plan"""
         try:
-            self.session.add(meal_plan)
-            self.session.commit()
-            
-            logger.info(f"Meal plan created successfully: {meal_plan.id}")
-            return meal_plan
+            with self._savepoint():
+                self.session.add(meal_plan)
+                self._commit(meal_plan.user_id)
+                
+                logger.info("Meal plan created successfully: %s", meal_plan.id)
+                return meal_plan
             
         except Exception as e:
-            self.session.rollback()
-            logger.error(f"Error creating meal plan: {str(e)}")
+            self._rollback()
+            logger.error("Error creating meal plan: %s", e)
             raise ValidationError(f"Failed to create meal plan: {str(e)}")
     
     def get_meal_plan_by_id(self, plan_id: str, user_id: Optional[str] = None) -> Optional[MealPlan]:
         """Get meal plan by ID, optionally filtered by user"""
         try:
+            meal_plan = get_memoized_plan(plan_id, user_id)
+            if meal_plan is not None:
+                return meal_plan
+            
             query = self.session.query(MealPlan).filter(
                 and_(MealPlan.id == plan_id, MealPlan.is_active == True)
             )
@@ -49,39 +264,47 @@ class MealPlanRepository:
             meal_plan = query.first()
             
             if meal_plan:
-                logger.debug(f"Meal plan found: {plan_id}")
+                memoize_plan(plan_id, user_id, meal_plan)
+                logger.debug("Meal plan found: %s", plan_id)
             else:
-                logger.debug(f"Meal plan not found: {plan_id}")
+                logger.debug("Meal plan not found: %s", plan_id)
             
             return meal_plan
             
         except Exception as e:
-            logger.error(f"Error getting meal plan {plan_id}: {str(e)}")
+            logger.error("Error getting meal plan %s: %s", plan_id, e)
             raise ValidationError(f"Failed to get meal plan: {str(e)}")
     
-    def get_user_meal_plans(self, user_id: str, limit: Optional[int] = None, offset: Optional[int] = None, include_inactive: bool = False) -> List[MealPlan]:
-        """Get all meal plans for a user"""
+    def get_user_meal_plans(self, user_id: str, limit: Optional[int] = None, offset: Optional[int] = None, include_inactive: bool = False,
+                            cursor: Optional[Tuple[datetime, Any]] = None) -> List[MealPlan]:
+        """Get all meal plans for a user
+        
+        Pass cursor=(created_at, id) of the last plan on the previous page to
+        fetch the next page by keyset instead of skipping offset rows.
+        """
         try:
             query = self.session.query(MealPlan).filter(MealPlan.user_id == user_id)
             
             if not include_inactive:
                 query = query.filter(MealPlan.is_active == True)
             
-            # Order by creation date (newest first)
-            query = query.order_by(desc(MealPlan.created_at))
+            # Order by creation date (newest first); id breaks ties so the keyset is unique
+            query = query.order_by(desc(MealPlan.created_at), desc(MealPlan.id))
             
-            if offset:
+            if cursor:
+                query = query.filter(tuple_(MealPlan.created_at, MealPlan.id) < tuple_(*cursor))
+            elif offset:
                 query = query.offset(offset)
             
             if limit:
                 query = query.limit(limit)
             
             meal_plans = query.all()
-            logger.debug(f"Found {len(meal_plans)} meal plans for user: {user_id}")
+            logger.debug("Found %s meal plans for user: %s", len(meal_plans), user_id)
             return meal_plans
             
         except Exception as e:
-            logger.error(f"Error getting meal plans for user {user_id}: {str(e)}")
+            logger.error("Error getting meal plans for user %s: %s", user_id, e)
             raise ValidationError(f"Failed to get meal plans: {str(e)}")
     
     def get_meal_plans_by_date_range(self, user_id: str, start_date: date, 
@@ -97,11 +320,37 @@ class MealPlanRepository:
                 )
             ).order_by(MealPlan.plan_date).all()
             
-            logger.debug(f"Found {len(meal_plans)} meal plans for user {user_id} between {start_date} and {end_date}")
+            logger.debug("Found %s meal plans for user %s between %s and %s", len(meal_plans), user_id, start_date, end_date)
             return meal_plans
             
         except Exception as e:
-            logger.error(f"Error getting meal plans by date range: {str(e)}")
+            logger.error("Error getting meal plans by date range: %s", e)
+            raise ValidationError(f"Failed to get meal plans: {str(e)}")
+    
+    def get_nutrition_rows_by_date_range(self, user_id: str, start_date: date,
+                                         end_date: date) -> List[Any]:
+        """Get (plan_date, estimated_total_cost_usd, daily_nutrition_breakdown) rows within a date range
+        
+        Read-only counterpart of get_meal_plans_by_date_range for aggregate
+        callers; returns lightweight Row tuples instead of MealPlan objects
+        """
+        try:
+            rows = self.session.execute(
+                select(MealPlan.plan_date, MealPlan.estimated_total_cost_usd, MealPlan.daily_nutrition_breakdown)
+                .where(
+                    MealPlan.user_id == user_id,
+                    MealPlan.plan_date >= start_date,
+                    MealPlan.plan_date <= end_date,
+                    MealPlan.is_active == True
+                )
+                .order_by(MealPlan.plan_date)
+            ).all()
+            
+            logger.debug("Found %s meal plan rows for user %s between %s and %s", len(rows), user_id, start_date, end_date)
+            return rows
+            
+        except Exception as e:
+            logger.error("Error getting meal plan nutrition rows by date range: %s", e)
             raise ValidationError(f"Failed to get meal plans: {str(e)}")
     
     def get_current_meal_plan(self, user_id: str, target_date: Optional[date] = None) -> Optional[MealPlan]:
@@ -110,24 +359,23 @@ class MealPlanRepository:
             target_date = date.today()
         
         try:
+            # Newest active plan whose [plan_date, end_date] window covers the target date
             meal_plan = self.session.query(MealPlan).filter(
-                and_(
-                    MealPlan.user_id == user_id,
-                    MealPlan.plan_date <= target_date,
-                    MealPlan.is_active == True
-                )
+                MealPlan.user_id == user_id,
+                MealPlan.is_active == True,
+                MealPlan.plan_date <= target_date,
+                MealPlan.end_date >= target_date
             ).order_by(desc(MealPlan.plan_date)).first()
             
-            # Check if the meal plan covers the target date
-            if meal_plan and target_date <= meal_plan.end_date:
-                logger.debug(f"Current meal plan found for user {user_id}: {meal_plan.id}")
+            if meal_plan:
+                logger.debug("Current meal plan found for user %s: %s", user_id, meal_plan.id)
                 return meal_plan
             
-            logger.debug(f"No current meal plan found for user {user_id} on {target_date}")
+            logger.debug("No current meal plan found for user %s on %s", user_id, target_date)
             return None
             
         except Exception as e:
-            logger.error(f"Error getting current meal plan for user {user_id}: {str(e)}")
+            logger.error("Error getting current meal plan for user %s: %s", user_id, e)
             raise ValidationError(f"Failed to get current meal plan: {str(e)}")
     
     def get_recent_meal_plans(self, user_id: str, days: int = 30) -> List[MealPlan]:
@@ -143,140 +391,189 @@ class MealPlanRepository:
                 )
             ).order_by(desc(MealPlan.plan_date)).all()
             
-            logger.debug(f"Found {len(meal_plans)} recent meal plans for user {user_id}")
+            logger.debug("Found %s recent meal plans for user %s", len(meal_plans), user_id)
             return meal_plans
             
         except Exception as e:
-            logger.error(f"Error getting recent meal plans for user {user_id}: {str(e)}")
+            logger.error("Error getting recent meal plans for user %s: %s", user_id, e)
             raise ValidationError(f"Failed to get recent meal plans: {str(e)}")
     
     def update_meal_plan(self, plan_id: str, user_id: str, update_data: Dict[str, Any]) -> MealPlan:
         """Update an existing meal plan"""
         try:
-            meal_plan = self.get_meal_plan_by_id(plan_id, user_id)
-            if not meal_plan:
-                raise ValidationError(f"Meal plan not found: {plan_id}")
-            
-            # Update fields
-            for field, value in update_data.items():
-                if hasattr(meal_plan, field):
-                    setattr(meal_plan, field, value)
-            
-            meal_plan.updated_at = datetime.utcnow()
-            self.session.commit()
-            
-            logger.info(f"Meal plan updated successfully: {plan_id}")
-            return meal_plan
+            with self._savepoint():
+                values = {field: value for field, value in update_data.items() if field in _MEAL_PLAN_UPDATABLE_COLUMNS}
+                
+                if values.keys() & _END_DATE_SOURCE_COLUMNS:
+                    # end_date is derived by the model, so date changes go through the ORM
+                    meal_plan = self._load_for_mutation(plan_id, user_id)
+                    if not meal_plan:
+                        raise ValidationError(f"Meal plan not found: {plan_id}")
+                    for field, value in values.items():
+                        setattr(meal_plan, field, value)
+                    meal_plan.updated_at = datetime.utcnow()
+                else:
+                    # Single UPDATE ... RETURNING instead of a SELECT followed by an UPDATE
+                    meal_plan = self.session.execute(
+                        update(MealPlan)
+                        .where(MealPlan.id == plan_id, MealPlan.user_id == user_id, MealPlan.is_active == True)
+                        .values(**values, updated_at=datetime.utcnow())
+                        .returning(MealPlan)
+                    ).scalar_one_or_none()
+                    if not meal_plan:
+                        raise ValidationError(f"Meal plan not found: {plan_id}")
+                
+                forget_memoized_plan(plan_id)
+                self._commit(user_id)
+                
+                logger.info("Meal plan updated successfully: %s", plan_id)
+                return meal_plan
             
         except Exception as e:
-            self.session.rollback()
-            logger.error(f"Error updating meal plan {plan_id}: {str(e)}")
+            self._rollback()
+            logger.error("Error updating meal plan %s: %s", plan_id, e)
             raise ValidationError(f"Failed to update meal plan: {str(e)}")
     
     def add_user_feedback(self, plan_id: str, user_id: str, rating: int, 
                          feedback: Optional[str] = None) -> MealPlan:
         """Add user feedback to a meal plan"""
         try:
-            meal_plan = self.get_meal_plan_by_id(plan_id, user_id)
-            if not meal_plan:
-                raise ValidationError(f"Meal plan not found: {plan_id}")
-            
-            meal_plan.add_user_feedback(rating, feedback)
-            self.session.commit()
-            
-            logger.info(f"User feedback added to meal plan {plan_id}: rating={rating}")
-            return meal_plan
+            with self._savepoint():
+                meal_plan = self._load_for_mutation(plan_id, user_id)
+                if not meal_plan:
+                    raise ValidationError(f"Meal plan not found: {plan_id}")
+                
+                meal_plan.add_user_feedback(rating, feedback)
+                forget_memoized_plan(plan_id)
+                self._commit(user_id)
+                
+                logger.info("User feedback added to meal plan %s: rating=%s", plan_id, rating)
+                return meal_plan
             
         except Exception as e:
-            self.session.rollback()
-            logger.error(f"Error adding feedback to meal plan {plan_id}: {str(e)}")
+            self._rollback()
+            logger.error("Error adding feedback to meal plan %s: %s", plan_id, e)
             raise ValidationError(f"Failed to add feedback: {str(e)}")
     
     def delete_meal_plan(self, plan_id: str, user_id: str) -> bool:
         """Soft delete a meal plan (mark as inactive)"""
         try:
-            meal_plan = self.get_meal_plan_by_id(plan_id, user_id)
-            if not meal_plan:
-                raise ValidationError(f"Meal plan not found: {plan_id}")
-            
-            meal_plan.is_active = False
-            meal_plan.updated_at = datetime.utcnow()
-            self.session.commit()
-            
-            logger.info(f"Meal plan deleted successfully: {plan_id}")
-            return True
+            with self._savepoint():
+                deleted_id = self.session.execute(
+                    update(MealPlan)
+                    .where(MealPlan.id == plan_id, MealPlan.user_id == user_id, MealPlan.is_active == True)
+                    .values(is_active=False, updated_at=datetime.utcnow())
+                    .returning(MealPlan.id)
+                ).scalar_one_or_none()
+                if deleted_id is None:
+                    raise ValidationError(f"Meal plan not found: {plan_id}")
+                
+                forget_memoized_plan(plan_id)
+                self._commit(user_id)
+                
+                logger.info("Meal plan deleted successfully: %s", plan_id)
+                return True
             
         except Exception as e:
-            self.session.rollback()
-            logger.error(f"Error deleting meal plan {plan_id}: {str(e)}")
+            self._rollback()
+            logger.error("Error deleting meal plan %s: %s", plan_id, e)
             raise ValidationError(f"Failed to delete meal plan: {str(e)}")
     
-    def get_meal_plan_statistics(self, user_id: Optional[str] = None) -> Dict[str, Any]:
+    def get_meal_plan_statistics(self, user_id: Optional[str] = None) -> MealPlanStatistics:
         """Get meal plan statistics"""
+        cache_key = read_cache_key(user_id, __name__, 'statistics')
+        cached = get_cached_read(cache_key)
+        if cached is not None:
+            return cached
+        
         try:
-            query = self.session.query(MealPlan).filter(MealPlan.is_active == True)
-            
+            conditions = [MealPlan.is_active == True]
             if user_id:
-                query = query.filter(MealPlan.user_id == user_id)
-            
-            meal_plans = query.all()
-            
-            total_count = len(meal_plans)
-            
-            # Calculate average ratings
-            rated_plans = [mp for mp in meal_plans if mp.user_rating is not None]
-            avg_rating = sum(mp.user_rating for mp in rated_plans) / len(rated_plans) if rated_plans else None
-            
-            # Calculate budget adherence
-            budget_compliant = [mp for mp in meal_plans if mp.is_within_budget]
-            budget_adherence_rate = len(budget_compliant) / total_count if total_count > 0 else 0
-            
-            # Calculate duration distribution
-            duration_distribution = {}
-            for mp in meal_plans:
-                duration = mp.duration_days
-                duration_distribution[duration] = duration_distribution.get(duration, 0) + 1
-            
-            # Calculate variety scores
-            variety_scores = [mp.calculate_variety_score() for mp in meal_plans]
-            avg_variety_score = sum(variety_scores) / len(variety_scores) if variety_scores else 0
+                conditions.append(MealPlan.user_id == user_id)
+            
+            # Counts, rating average and budget adherence in one aggregate row
+            total_count, avg_rating, rated_count, budget_compliant, recent_count = self.session.execute(
+                select(
+                    func.count(MealPlan.id),
+                    func.avg(MealPlan.user_rating),
+                    func.count(MealPlan.user_rating),
+                    func.count().filter(MealPlan.within_budget_clause()),
+                    func.count().filter(MealPlan.plan_date >= date.today() - timedelta(days=30)),
+                ).where(*conditions)
+            ).one()
+            budget_adherence_rate = budget_compliant / total_count if total_count > 0 else 0
+            
+            duration_distribution = dict(self.session.execute(
+                select(MealPlan.duration_days, func.count())
+                .where(*conditions)
+                .group_by(MealPlan.duration_days)
+            ).all())
+            
+            # Variety needs each plan's meals list; fetch only that column and
+            # divide by the plan count from the aggregate row
+            meals_stmt = select(MealPlan.meals).where(*conditions).execution_options(yield_per=MEAL_PLAN_STREAM_BATCH_SIZE)
+            variety_total = sum(
+                MealPlan.variety_score(meals) for meals in self.session.execute(meals_stmt).scalars()
+            )
+            avg_variety_score = variety_total / total_count if total_count > 0 else 0
             
-            stats = {
+            stats: MealPlanStatistics = {
                 'total_meal_plans': total_count,
-                'average_rating': avg_rating,
+                'average_rating': float(avg_rating) if avg_rating is not None else None,
                 'budget_adherence_rate': budget_adherence_rate,
                 'average_variety_score': avg_variety_score,
                 'duration_distribution': duration_distribution,
-                'rated_plans_count': len(rated_plans)
+                'rated_plans_count': rated_count
             }
             
             if user_id:
                 # User-specific stats
-                recent_plans = [mp for mp in meal_plans 
-                               if mp.plan_date >= date.today() - timedelta(days=30)]
-                stats['recent_plans_count'] = len(recent_plans)
+                stats['recent_plans_count'] = recent_count
             
-            logger.debug(f"Meal plan statistics: {stats}")
+            logger.debug("Meal plan statistics: %s", stats)
+            cache_read(cache_key, stats)
             return stats
             
         except Exception as e:
-            logger.error(f"Error getting meal plan statistics: {str(e)}")
+            logger.error("Error getting meal plan statistics: %s", e)
             raise ValidationError(f"Failed to get meal plan statistics: {str(e)}")
     
     def get_popular_recipes(self, user_id: Optional[str] = None, limit: int = 10) -> List[Dict[str, Any]]:
         """Get most popular recipes from meal plans"""
+        cache_key = read_cache_key(user_id, __name__, 'popular_recipes', limit)
+        cached = get_cached_read(cache_key)
+        if cached is not None:
+            return cached
+        
         try:
-            query = self.session.query(MealPlan).filter(MealPlan.is_active == True)
-            
+            if self.session.get_bind().dialect.name == 'postgresql':
+                # Unnest and count server-side; only the top rows come back
+                params = {'limit': limit}
+                user_filter = ''
+                if user_id:
+                    user_filter = 'AND user_id = :user_id'
+                    params['user_id'] = user_id
+                statement = text(_POPULAR_RECIPES_SQL.format(user_filter=user_filter))
+                if user_id:
+                    statement = statement.bindparams(bindparam('user_id', type_=MealPlan.__table__.c.user_id.type))
+                popular_recipes = [dict(row) for row in self.session.execute(statement, params).mappings()]
+                logger.debug("Found %s popular recipes", len(popular_recipes))
+                cache_read(cache_key, popular_recipes)
+                return popular_recipes
+            
+            conditions = [MealPlan.is_active == True]
             if user_id:
-                query = query.filter(MealPlan.user_id == user_id)
+                conditions.append(MealPlan.user_id == user_id)
             
-            meal_plans = query.all()
+            # Only the meals column is needed; skip building MealPlan objects
+            meals_per_plan = self.session.execute(
+                select(MealPlan.meals).where(*conditions).execution_options(yield_per=MEAL_PLAN_STREAM_BATCH_SIZE)
+            ).scalars()
             
             # Count recipe usage
             recipe_counts = {}
-            for meal_plan in meal_plans:
-                for meal in meal_plan.meals:
+            for meals in meals_per_plan:
+                for meal in meals:
                     recipe_id = meal.get('recipe_id')
                     recipe_name = meal.get('recipe_name', 'Unknown')
                     if recipe_id:
@@ -288,89 +585,98 @@ class MealPlanRepository:
                                 'meal_types': set()
                             }
                         recipe_counts[recipe_id]['usage_count'] += 1
-                        recipe_counts[recipe_id]['meal_types'].add(meal.get('meal_type'))
+                        if meal.get('meal_type') is not None:
+                            recipe_counts[recipe_id]['meal_types'].add(meal['meal_type'])
             
-            # Convert sets to lists and sort by usage
+            # Convert sets to sorted lists, as array_agg(DISTINCT ...) returns them
             popular_recipes = []
             for recipe_data in recipe_counts.values():
-                recipe_data['meal_types'] = list(recipe_data['meal_types'])
+                recipe_data['meal_types'] = sorted(recipe_data['meal_types'])
                 popular_recipes.append(recipe_data)
             
-            # Sort by usage count and limit
-            popular_recipes.sort(key=lambda x: x['usage_count'], reverse=True)
+            # Sort by usage count, ties by recipe_id like the SQL path, and limit
+            popular_recipes.sort(key=lambda x: (-x['usage_count'], str(x['recipe_id'])))
             popular_recipes = popular_recipes[:limit]
             
-            logger.debug(f"Found {len(popular_recipes)} popular recipes")
+            logger.debug("Found %s popular recipes", len(popular_recipes))
+            cache_read(cache_key, popular_recipes)
             return popular_recipes
             
         except Exception as e:
-            logger.error(f"Error getting popular recipes: {str(e)}")
+            logger.error("Error getting popular recipes: %s", e)
             raise ValidationError(f"Failed to get popular recipes: {str(e)}")
     
-    def check_for_existing_plan(self, user_id: str, plan_date: date, duration_days: int) -> Optional[MealPlan]:
-        """Check if there's an existing meal plan that overlaps with the requested period"""
+    def check_for_existing_plan(self, user_id: str, plan_date: date, duration_days: int) -> bool:
+        """Check if an active meal plan overlaps with the requested period"""
         try:
             end_date = plan_date + timedelta(days=duration_days - 1)
             
-            # Find any meal plans that overlap with the requested period
-            existing_plans = self.session.query(MealPlan).filter(
-                and_(
-                    MealPlan.user_id == user_id,
-                    MealPlan.is_active == True,
-                    # Check for overlap: plan starts before our end date and ends after our start date
-                    MealPlan.plan_date <= end_date,
-                    # Use SQL expression for end date calculation
-                    MealPlan.plan_date + MealPlan.duration_days - 1 >= plan_date
+            # Overlap: existing plan starts on/before our end and ends on/after our start
+            exists = self.session.execute(
+                select(
+                    select(MealPlan.id).where(
+                        MealPlan.user_id == user_id,
+                        MealPlan.is_active == True,
+                        MealPlan.plan_date <= end_date,
+                        MealPlan.end_date >= plan_date
+                    ).exists()
                 )
-            ).all()
+            ).scalar()
             
-            if existing_plans:
-                logger.debug(f"Found {len(existing_plans)} overlapping meal plans for user {user_id}")
-                return existing_plans[0]  # Return the first overlapping plan
+            if exists:
+                logger.debug("Existing meal plan found for user %s overlapping with %s", user_id, plan_date)
             
-            return None
+            return bool(exists)
             
         except Exception as e:
-            logger.error(f"Error checking for existing plans: {str(e)}")
-            raise ValidationError(f"Failed to check for existing plans: {str(e)}")
+            logger.error("Error checking for existing meal plan: %s", e)
+            raise ValidationError(f"Failed to check for existing plan: {str(e)}")
     
-    def get_nutrition_trends(self, user_id: str, days: int = 30) -> Dict[str, Any]:
+    def get_nutrition_trends(self, user_id: str, days: int = 30) -> NutritionTrends:
         """Get nutrition trends for a user over time"""
+        cache_key = read_cache_key(user_id, __name__, 'nutrition_trends', days)
+        cached = get_cached_read(cache_key)
+        if cached is not None:
+            return cached
+        
         try:
             cutoff_date = date.today() - timedelta(days=days)
             
-            meal_plans = self.session.query(MealPlan).filter(
-                and_(
+            # Only the columns the trends need, as plain rows rather than MealPlan objects
+            rows = self.session.execute(
+                select(MealPlan.plan_date, MealPlan.daily_nutrition_breakdown)
+                .where(
                     MealPlan.user_id == user_id,
                     MealPlan.plan_date >= cutoff_date,
                     MealPlan.is_active == True
                 )
-            ).order_by(MealPlan.plan_date).all()
+                .order_by(MealPlan.plan_date)
+                .execution_options(yield_per=MEAL_PLAN_STREAM_BATCH_SIZE)
+            )
             
-            # Extract daily nutrition data
-            daily_nutrition = []
-            for meal_plan in meal_plans:
-                if meal_plan.daily_nutrition_breakdown:
-                    for day, nutrition in meal_plan.daily_nutrition_breakdown.items():
-                        if isinstance(nutrition, dict) and 'calories' in nutrition:
-                            daily_nutrition.append({
-                                'date': (meal_plan.plan_date + timedelta(days=int(day)-1)).isoformat(),
-                                'calories': nutrition.get('calories', 0),
-                                'protein': nutrition.get('protein', 0),
-                                'carbs': nutrition.get('carbs', 0),
-                                'fat': nutrition.get('fat', 0)
-                            })
+            # Extract daily nutrition data, accumulating totals in the same pass
+            daily_nutrition: List[DailyNutrition] = []
+            totals = {'calories': 0, 'protein': 0, 'carbs': 0, 'fat': 0}
+            for plan_date, breakdown in rows:
+                if not breakdown:
+                    continue
+                for day, nutrition in breakdown.items():
+                    if isinstance(nutrition, dict) and 'calories' in nutrition:
+                        entry = {'date': (plan_date + timedelta(days=int(day)-1)).isoformat()}
+                        for key in totals:
+                            entry[key] = nutrition.get(key, 0)
+                            totals[key] += entry[key]
+                        daily_nutrition.append(entry)
             
             # Calculate averages
             if daily_nutrition:
-                avg_calories = sum(day['calories'] for day in daily_nutrition) / len(daily_nutrition)
-                avg_protein = sum(day['protein'] for day in daily_nutrition) / len(daily_nutrition)
-                avg_carbs = sum(day['carbs'] for day in daily_nutrition) / len(daily_nutrition)
-                avg_fat = sum(day['fat'] for day in daily_nutrition) / len(daily_nutrition)
+                avg_calories, avg_protein, avg_carbs, avg_fat = (
+                    total / len(daily_nutrition) for total in totals.values()
+                )
             else:
                 avg_calories = avg_protein = avg_carbs = avg_fat = 0
             
-            trends = {
+            trends: NutritionTrends = {
                 'daily_nutrition': daily_nutrition,
                 'averages': {
                     'calories': avg_calories,
@@ -381,9 +687,10 @@ class MealPlanRepository:
                 'total_days': len(daily_nutrition)
             }
             
-            logger.debug(f"Nutrition trends calculated for user {user_id}: {len(daily_nutrition)} days")
+            logger.debug("Nutrition trends calculated for user %s: %s days", user_id, len(daily_nutrition))
+            cache_read(cache_key, trends)
             return trends
             
         except Exception as e:
-            logger.error(f"Error getting nutrition trends for user {user_id}: {str(e)}")
+            logger.error("Error getting nutrition trends for user %s: %s", user_id, e)
             raise ValidationError(f"Failed to get nutrition trends: {str(e)}") 
\ No newline at end of file
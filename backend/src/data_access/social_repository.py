@@ -7,7 +7,7 @@ import logging
 from typing import Optional, List, Tuple
 from sqlalchemy.exc import IntegrityError
 from sqlalchemy import or_, and_, func, desc
-from sqlalchemy.orm import joinedload
+from sqlalchemy.orm import joinedload, selectinload, raiseload
 
 from core.models.user import User
 from core.models.user_social_profile import UserSocialProfile
@@ -405,50 +405,29 @@ class SocialRepository:
             # Calculate offset
             offset = (page - 1) * per_page
             
-            # Get connected user IDs
-            connected_users_subquery = db.session.query(UserConnection).filter(
-                or_(
-                    UserConnection.user_id_1 == user_id,
-                    UserConnection.user_id_2 == user_id
-                )
-            ).subquery()
-            
-            # Build list of user IDs to include in feed (user + connected users)
-            connected_user_ids = []
-            connections = db.session.query(UserConnection).filter(
-                or_(
-                    UserConnection.user_id_1 == user_id,
+            # Connected user IDs, resolved inside the feed query
+            connected_user_ids = db.session.query(UserConnection.user_id_2).filter(
+                UserConnection.user_id_1 == user_id
+            ).union(
+                db.session.query(UserConnection.user_id_1).filter(
                     UserConnection.user_id_2 == user_id
                 )
-            ).all()
-            
-            for connection in connections:
-                if str(connection.user_id_1) == str(user_id):
-                    connected_user_ids.append(connection.user_id_2)
-                else:
-                    connected_user_ids.append(connection.user_id_1)
-            
-            # Include the user's own ID
-            all_user_ids = [user_id] + connected_user_ids
+            )
             
-            # Query activities from user and connected users
+            # Query activities from user and connected users that the user may see
+            # Users and profiles are fetched with one IN query each for the whole page;
+            # any other User relationship that would lazy-load during serialization raises
             base_query = db.session.query(UserActivity).options(
-                joinedload(UserActivity.user).joinedload(User.social_profile)
-            ).filter(
-                and_(
-                    UserActivity.user_id.in_(all_user_ids),
-                    or_(
-                        UserActivity.privacy_level == 'public',
-                        and_(
-                            UserActivity.privacy_level == 'friends',
-                            UserActivity.user_id.in_(all_user_ids)
-                        ),
-                        and_(
-                            UserActivity.privacy_level == 'private',
-                            UserActivity.user_id == user_id
-                        )
-                    )
+                selectinload(UserActivity.user).options(
+                    selectinload(User.social_profile),
+                    raiseload('*', sql_only=True)
                 )
+            ).filter(
+                or_(
+                    UserActivity.user_id == user_id,
+                    UserActivity.user_id.in_(connected_user_ids)
+                ),
+                UserActivity.visible_to_user_filter(user_id, connected_user_ids)
             ).order_by(desc(UserActivity.created_at))
             
             # Get total count
@@ -6,14 +6,17 @@ Data access layer for Tutorial and TutorialProgress model operations
 import logging
 from typing import Optional, List, Dict, Any, Tuple
 from sqlalchemy.orm import Session
-from sqlalchemy import and_, or_, desc, func
+from sqlalchemy import and_, or_, desc, func, insert, tuple_
 
-from core.models.tutorial import Tutorial, TutorialProgress
+from core.models.tutorial import Tutorial, TutorialProgress, TutorialTag
 from core.exceptions import ValidationError, NotFoundError
 from data_access.database import db
 
 logger = logging.getLogger(__name__)
 
+# Columns update_tutorial may write; anything else in update_data is ignored
+_TUTORIAL_UPDATABLE_COLUMNS = frozenset(column.key for column in Tutorial.__table__.columns) - {'id', 'created_at'}
+
 class TutorialRepository:
     """Repository for Tutorial data access operations"""
     
@@ -45,6 +48,8 @@ class TutorialRepository:
             )
             
             self.session.add(tutorial)
+            self.session.flush()
+            self._sync_tags(tutorial)
             self.session.commit()
             
             logger.info(f"Tutorial created successfully: {tutorial.id}")
@@ -77,7 +82,7 @@ class TutorialRepository:
         """Get tutorials by category"""
         try:
             query = self.session.query(Tutorial).filter(
-                and_(Tutorial.category == category, Tutorial.is_active == True)
+                *Tutorial.filter_criteria(category=category)
             ).order_by(desc(Tutorial.is_featured), Tutorial.title)
             
             if offset:
@@ -97,7 +102,7 @@ class TutorialRepository:
         """Get tutorials by difficulty level"""
         try:
             query = self.session.query(Tutorial).filter(
-                and_(Tutorial.difficulty_level == difficulty_level, Tutorial.is_active == True)
+                *Tutorial.filter_criteria(difficulty=difficulty_level)
             ).order_by(desc(Tutorial.is_featured), Tutorial.title)
             
             if limit:
@@ -152,33 +157,28 @@ class TutorialRepository:
                         limit: Optional[int] = None, offset: Optional[int] = None) -> Tuple[List[Tutorial], int]:
         """Search tutorials by title, description, or keywords"""
         try:
-            # Base query with search term
-            query = self.session.query(Tutorial).filter(Tutorial.is_active == True)
+            # Base query with the filter criteria pushed into SQL
+            filters = filters or {}
+            query = self.session.query(Tutorial).filter(*Tutorial.filter_criteria(
+                category=filters.get('category'),
+                difficulty=filters.get('difficulty'),
+                duration_max_minutes=filters.get('duration_max_minutes'),
+                beginner_friendly=filters.get('beginner_friendly')
+            ))
             
             if search_term:
                 # Text search in title, description, and tags
+                tag_matches = self.session.query(TutorialTag.tutorial_id).filter(
+                    TutorialTag.kind.in_((TutorialTag.TAG, TutorialTag.KEYWORD)),
+                    TutorialTag.tag.like(f"%{search_term.lower()}%")
+                )
                 search_filter = or_(
                     Tutorial.title.ilike(f"%{search_term}%"),
                     Tutorial.description.ilike(f"%{search_term}%"),
-                    Tutorial.keywords.astext.ilike(f"%{search_term}%"),
-                    Tutorial.tags.astext.ilike(f"%{search_term}%")
+                    Tutorial.id.in_(tag_matches)
                 )
                 query = query.filter(search_filter)
             
-            # Apply additional filters if provided
-            if filters:
-                if 'category' in filters and filters['category']:
-                    query = query.filter(Tutorial.category == filters['category'])
-                
-                if 'difficulty' in filters and filters['difficulty']:
-                    query = query.filter(Tutorial.difficulty_level == filters['difficulty'])
-                
-                if 'duration_max_minutes' in filters and filters['duration_max_minutes']:
-                    query = query.filter(Tutorial.estimated_duration_minutes <= filters['duration_max_minutes'])
-                
-                if 'beginner_friendly' in filters and filters['beginner_friendly'] is not None:
-                    query = query.filter(Tutorial.is_beginner_friendly == filters['beginner_friendly'])
-            
             # Get total count before pagination
             total_count = query.count()
             
@@ -252,9 +252,12 @@ class TutorialRepository:
             
             # Update fields
             for field, value in update_data.items():
-                if hasattr(tutorial, field):
+                if field in _TUTORIAL_UPDATABLE_COLUMNS:
                     setattr(tutorial, field, value)
             
+            if update_data.keys() & {'tags', 'keywords', 'equipment_needed'}:
+                self._sync_tags(tutorial)
+            
             self.session.commit()
             logger.info(f"Tutorial updated successfully: {tutorial_id}")
             return tutorial
@@ -281,6 +284,33 @@ class TutorialRepository:
             self.session.rollback()
             logger.error(f"Error deleting tutorial {tutorial_id}: {str(e)}")
             raise ValidationError(f"Failed to delete tutorial: {str(e)}")
+    
+    def _sync_tags(self, tutorial: Tutorial) -> None:
+        """Bring tutorial_tags rows in line with the tutorial's JSON tag columns
+        
+        On PostgreSQL the trigger_sync_tutorial_tags trigger has usually done
+        this already when the tutorial was flushed, leaving nothing to change
+        """
+        desired = tutorial.tag_terms()
+        existing = {
+            (kind, tag) for kind, tag in
+            self.session.query(TutorialTag.kind, TutorialTag.tag)
+            .filter(TutorialTag.tutorial_id == tutorial.id)
+        }
+        
+        stale = existing - desired
+        if stale:
+            self.session.query(TutorialTag).filter(
+                TutorialTag.tutorial_id == tutorial.id,
+                tuple_(TutorialTag.kind, TutorialTag.tag).in_(list(stale))
+            ).delete(synchronize_session=False)
+        
+        missing = desired - existing
+        if missing:
+            self.session.execute(insert(TutorialTag), [
+                {'tutorial_id': tutorial.id, 'kind': kind, 'tag': tag}
+                for kind, tag in missing
+            ])
 
 
 class TutorialProgressRepository:
@@ -22,7 +22,7 @@ print(f"DEBUG: MONGODB_URI = {os.getenv('MONGODB_URI', 'NOT SET')}")
 print(f"DEBUG: DATABASE_URL = {os.getenv('DATABASE_URL', 'NOT SET')}")
 
 from config.app_config import Config
-from data_access.database import db, init_mongo
+from data_access.database import db, init_mongo, configure_engine_options
 from api.users import users_bp
 from api.meal_plans import meal_plans_bp
 from api.preferences import preferences_bp
@@ -34,6 +34,7 @@ from api.user_recipes import user_recipes_bp
 from api.tutorials import tutorial_bp
 from api.pantry import pantry_bp
 from core.exceptions import register_error_handlers
+from core.serialization import OrjsonJSONProvider
 
 # Import models to register them with SQLAlchemy
 from core.models.user import User
@@ -53,6 +54,7 @@ def create_app(config_class=Config):
     """Create and configure the Flask application"""
     app = Flask(__name__)
     app.config.from_object(config_class)
+    app.json = OrjsonJSONProvider(app)
     
     # Configure logging
     logging.basicConfig(
@@ -61,9 +63,18 @@ def create_app(config_class=Config):
     )
     
     # Initialize extensions
+    configure_engine_options(app)
     db.init_app(app)
     init_mongo(app)
     
+    # Surface N+1 query regressions as log warnings in development
+    if app.config.get('NPLUSONE_ENABLED'):
+        try:
+            from nplusone.ext.flask_sqlalchemy import NPlusOne
+            NPlusOne(app)
+        except ImportError:
+            app.logger.warning("NPLUSONE_ENABLED is set but nplusone is not installed")
+    
     # Initialize JWT
     jwt = JWTManager(app)
     app.config['JWT_ACCESS_TOKEN_EXPIRES'] = timedelta(
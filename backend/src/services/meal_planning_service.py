@@ -15,6 +15,7 @@ from core.models.recipe import Recipe
 from core.models.meal_plan import MealPlan
 from core.exceptions import ValidationError, AppError
 from data_access.database import db
+from data_access.meal_plan_repository import invalidate_read_cache
 from services.preference_learning_service import PreferenceLearningService
 
 logger = logging.getLogger(__name__)
@@ -626,5 +627,6 @@ class MealPlanningService:
         # Save to database
         db.session.add(meal_plan)
         db.session.commit()
+        invalidate_read_cache(meal_plan.user_id)
         
         return meal_plan 
\ No newline at end of file
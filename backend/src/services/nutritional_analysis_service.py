@@ -131,7 +131,8 @@ class NutritionalAnalysisService:
             end_date = datetime.utcnow().date()
             start_date = end_date - timedelta(weeks=weeks)
             
-            meal_plans = self.meal_plan_repository.get_meal_plans_by_date_range(
+            # Only the columns the weekly aggregation reads, as Row tuples
+            meal_plans = self.meal_plan_repository.get_nutrition_rows_by_date_range(
                 user_id, start_date, end_date
             )
             
@@ -0,0 +1,61 @@
+"""
+Shared fixtures for repository tests
+Runs the data access layer against an in-memory SQLite database
+"""
+
+import importlib
+import pkgutil
+import sys
+from pathlib import Path
+
+import pytest
+from flask import Flask
+from sqlalchemy import event
+
+# Source modules import each other as top-level packages (core, data_access, ...)
+_SRC_PATH = str(Path(__file__).resolve().parents[1] / 'src')
+if _SRC_PATH not in sys.path:
+    sys.path.insert(0, _SRC_PATH)
+
+from data_access.database import configure_engine_options, db  # noqa: E402
+import core.models  # noqa: E402
+
+
+def _import_models():
+    """Register every model's table with db.metadata"""
+    for module in pkgutil.iter_modules(core.models.__path__):
+        if module.name != 'generate_sql':
+            importlib.import_module(f'core.models.{module.name}')
+
+
+def _emulate_transactions(engine):
+    """Make pysqlite begin transactions like PostgreSQL does, so SAVEPOINTs nest
+    
+    pysqlite otherwise skips BEGIN before a SAVEPOINT, and releasing it commits
+    https://docs.sqlalchemy.org/en/20/dialects/sqlite.html#serializable-isolation-savepoints-transactional-ddl
+    """
+    @event.listens_for(engine, 'connect')
+    def _disable_pysqlite_transactions(dbapi_connection, connection_record):
+        dbapi_connection.isolation_level = None
+    
+    @event.listens_for(engine, 'begin')
+    def _begin(connection):
+        connection.exec_driver_sql('BEGIN')
+
+
+@pytest.fixture
+def app():
+    """Flask app bound to a fresh in-memory SQLite database"""
+    _import_models()
+    app = Flask(__name__)
+    app.config['TESTING'] = True
+    app.config['SQLALCHEMY_DATABASE_URI'] = 'sqlite://'
+    configure_engine_options(app)
+    db.init_app(app)
+    
+    with app.app_context():
+        _emulate_transactions(db.engine)
+        db.create_all()
+        yield app
+        db.session.remove()
+        db.drop_all()
@@ -0,0 +1,142 @@
+"""
+Tests for GroceryListRepository against SQLite
+"""
+
+import csv
+import uuid
+
+import pytest
+
+from core.models.grocery_list import GroceryList, GroceryListItem
+from data_access.database import COPY_NULL, copy_csv_buffer, db
+from data_access.repositories.grocery_list_repository import (
+    COPY_THRESHOLD, GroceryListRepository,
+)
+
+
+@pytest.fixture
+def repository(app):
+    return GroceryListRepository()
+
+
+@pytest.fixture
+def grocery_list(repository):
+    return repository.create(GroceryList(user_id=uuid.uuid4(), name='Weekly shop'))
+
+
+def _units_by_name(repository, list_id):
+    db.session.expire_all()
+    return {item.ingredient_name: item.unit for item in repository.get_items_by_list_id(list_id)}
+
+
+class TestBulkAddItems:
+    def test_insert_path_keeps_empty_and_null_units(self, repository, grocery_list):
+        """Items below COPY_THRESHOLD go through INSERT and keep '' distinct from None"""
+        items = [
+            GroceryListItem(grocery_list.id, 'salt', '1', unit=''),
+            GroceryListItem(grocery_list.id, 'eggs', '6', unit=None),
+            GroceryListItem(grocery_list.id, 'milk', '2', unit='cups'),
+        ]
+        
+        assert repository.bulk_add_items(items) == 3
+        assert _units_by_name(repository, grocery_list.id) == {'salt': '', 'eggs': None, 'milk': 'cups'}
+    
+    def test_copy_path_encodes_empty_and_null_units_distinctly(self, repository, grocery_list):
+        """The COPY stream quotes '' and writes None as the NULL marker, matching INSERT"""
+        values = [['salt', ''], ['eggs', None], ['marker', COPY_NULL], ['say "hi"', 'a\tb']]
+        
+        lines = copy_csv_buffer(values).read().splitlines()
+        
+        assert lines == ['"salt"\t""', f'"eggs"\t{COPY_NULL}', f'"marker"\t"{COPY_NULL}"', '"say ""hi"""\t"a\tb"']
+        # Quoted fields still parse back to the original text
+        parsed = list(csv.reader(lines, delimiter='\t'))
+        assert parsed[0] == ['salt', ''] and parsed[3] == ['say "hi"', 'a\tb']
+    
+    def test_copy_threshold_batch_inserts_every_item(self, repository, grocery_list):
+        """Non-PostgreSQL databases insert large batches through the INSERT path"""
+        items = [
+            GroceryListItem(grocery_list.id, f'item {i}', '1', unit='' if i % 2 else None)
+            for i in range(COPY_THRESHOLD)
+        ]
+        
+        assert repository.bulk_add_items(items) == COPY_THRESHOLD
+        units = _units_by_name(repository, grocery_list.id)
+        assert units['item 1'] == '' and units['item 0'] is None
+
+
+class TestUpsertItem:
+    def _upsert(self, repository, grocery_list, quantity, unit=None, estimated_cost=None, name='Flour'):
+        return repository.upsert_item(GroceryListItem(
+            grocery_list.id, name, quantity, unit=unit, estimated_cost=estimated_cost, is_custom=True,
+        ))
+    
+    def _items(self, repository, grocery_list):
+        db.session.expire_all()
+        return repository.get_items_by_list_id(grocery_list.id)
+    
+    def test_numeric_quantities_are_summed(self, repository, grocery_list):
+        self._upsert(repository, grocery_list, '2', unit='cups')
+        merged = self._upsert(repository, grocery_list, '1.5', unit='cups', name='flour')
+        
+        items = self._items(repository, grocery_list)
+        assert len(items) == 1 and items[0].id == merged.id
+        assert float(items[0].quantity) == 3.5
+    
+    def test_text_quantities_are_listed(self, repository, grocery_list):
+        self._upsert(repository, grocery_list, 'a pinch', unit='cups')
+        self._upsert(repository, grocery_list, '2', unit='cups')
+        
+        items = self._items(repository, grocery_list)
+        assert [item.quantity for item in items] == ['a pinch, 2']
+    
+    def test_missing_and_empty_units_share_a_row(self, repository, grocery_list):
+        self._upsert(repository, grocery_list, '1', unit=None)
+        self._upsert(repository, grocery_list, '2', unit='')
+        self._upsert(repository, grocery_list, '3', unit='cups')
+        
+        items = sorted(self._items(repository, grocery_list), key=lambda item: item.unit or '')
+        assert [(item.unit, float(item.quantity)) for item in items] == [(None, 3.0), ('cups', 3.0)]
+    
+    def test_estimated_costs_are_summed(self, repository, grocery_list):
+        self._upsert(repository, grocery_list, '1', estimated_cost=250)
+        self._upsert(repository, grocery_list, '1')
+        self._upsert(repository, grocery_list, '1', estimated_cost=100)
+        
+        items = self._items(repository, grocery_list)
+        assert [item.estimated_cost for item in items] == [350]
+
+
+class TestOwnershipScoping:
+    @pytest.fixture
+    def item(self, repository, grocery_list):
+        return repository.add_item(GroceryListItem(grocery_list.id, 'eggs', '6', estimated_cost=300))
+    
+    def test_other_users_item_writes_match_nothing(self, repository, grocery_list, item):
+        stranger = uuid.uuid4()
+        
+        assert repository.get_item_by_id(item.id, user_id=stranger) is None
+        assert repository.update_item(item.id, {'quantity': '12'}, user_id=stranger) is None
+        assert repository.toggle_item_checked(item.id, user_id=stranger) is None
+        assert repository.delete_item(item.id, user_id=stranger) is None
+        
+        db.session.expire_all()
+        unchanged = repository.get_item_by_id(item.id)
+        assert (unchanged.quantity, unchanged.is_checked) == ('6', False)
+    
+    def test_other_users_list_writes_match_nothing(self, repository, grocery_list):
+        stranger = uuid.uuid4()
+        
+        assert repository.update(grocery_list.id, {'name': 'Mine now'}, user_id=stranger) is None
+        assert repository.delete(grocery_list.id, user_id=stranger) is False
+        
+        db.session.expire_all()
+        unchanged = repository.get_by_id(grocery_list.id)
+        assert (unchanged.name, unchanged.is_active) == ('Weekly shop', True)
+    
+    def test_owner_writes_apply(self, repository, grocery_list, item):
+        owner = grocery_list.user_id
+        
+        assert repository.update_item(item.id, {'quantity': '12'}, user_id=owner).quantity == '12'
+        assert repository.toggle_item_checked(item.id, user_id=owner).is_checked is True
+        assert repository.delete_item(item.id, user_id=owner) == grocery_list.id
+        assert repository.delete(grocery_list.id, user_id=owner) is True
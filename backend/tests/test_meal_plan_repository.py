@@ -0,0 +1,161 @@
+"""
+Tests for the meal plan repositories against SQLite
+"""
+
+import uuid
+from datetime import date, datetime, timedelta
+
+import pytest
+
+from core.exceptions import ValidationError
+from core.models.meal_plan import MealPlan
+from data_access import meal_plan_repository
+from data_access.database import db
+from data_access.repositories import meal_plan_repository as list_meal_plan_repository
+
+
+@pytest.fixture(params=[
+    meal_plan_repository.MealPlanRepository,
+    list_meal_plan_repository.MealPlanRepository,
+], ids=['data_access', 'repositories'])
+def repository(request, app):
+    return request.param()
+
+
+@pytest.fixture
+def user_id():
+    return uuid.uuid4()
+
+
+def _create_plan(repository, user_id, plan_date=date(2026, 1, 5), **kwargs):
+    meals = [{'meal_type': 'dinner', 'recipe_id': 'r1', 'day': 1}]
+    return repository.create_meal_plan(MealPlan(user_id=user_id, plan_date=plan_date, meals=meals, **kwargs))
+
+
+class TestUpdateMealPlan:
+    def test_ignores_updated_at_and_is_active(self, repository, user_id):
+        """Server-managed columns in update_data are dropped instead of breaking the UPDATE"""
+        plan = _create_plan(repository, user_id)
+        
+        updated = repository.update_meal_plan(plan.id, user_id, {
+            'algorithm_version': 'v2',
+            'updated_at': datetime(2000, 1, 1),
+            'is_active': False,
+        })
+        
+        assert updated.algorithm_version == 'v2'
+        assert updated.is_active is True
+        assert updated.updated_at > datetime(2000, 1, 1)
+    
+    def test_ignores_is_active_on_date_change(self, repository, user_id):
+        """The ORM path used for date changes applies the same whitelist"""
+        plan = _create_plan(repository, user_id)
+        
+        updated = repository.update_meal_plan(plan.id, user_id, {'duration_days': 3, 'is_active': False})
+        
+        assert updated.end_date == date(2026, 1, 7)
+        assert updated.is_active is True
+
+
+class TestDeferredCommit:
+    @pytest.fixture
+    def repository(self, app):
+        return meal_plan_repository.MealPlanRepository()
+    
+    def _plan_dates(self, user_id):
+        db.session.expire_all()
+        return sorted(plan.plan_date for plan in MealPlan.query.filter_by(user_id=user_id))
+    
+    def test_failed_write_keeps_earlier_writes(self, repository, user_id):
+        """A caught failure mid-batch discards only that write"""
+        with repository.deferred_commit():
+            _create_plan(repository, user_id, plan_date=date(2026, 1, 1))
+            with pytest.raises(ValidationError):
+                repository.update_meal_plan(uuid.uuid4(), user_id, {'algorithm_version': 'v2'})
+            _create_plan(repository, user_id, plan_date=date(2026, 1, 3))
+        
+        assert self._plan_dates(user_id) == [date(2026, 1, 1), date(2026, 1, 3)]
+    
+    def test_failed_flush_keeps_earlier_writes(self, repository, user_id):
+        """A write rejected by the database rolls back to its own savepoint"""
+        with repository.deferred_commit():
+            _create_plan(repository, user_id, plan_date=date(2026, 1, 1))
+            with pytest.raises(ValidationError):
+                _create_plan(repository, None, plan_date=date(2026, 1, 2))
+            _create_plan(repository, user_id, plan_date=date(2026, 1, 3))
+        
+        assert self._plan_dates(user_id) == [date(2026, 1, 1), date(2026, 1, 3)]
+    
+    def test_block_error_rolls_back_everything(self, repository, user_id):
+        """An exception escaping the block still discards the whole batch"""
+        with pytest.raises(RuntimeError):
+            with repository.deferred_commit():
+                _create_plan(repository, user_id)
+                raise RuntimeError('abort')
+        
+        assert self._plan_dates(user_id) == []
+
+
+class TestNutritionTrends:
+    def test_counts_every_plan_with_a_summary(self, app, user_id):
+        """Summaries without the tracked macros count as zero days; empty ones are skipped"""
+        repository = list_meal_plan_repository.MealPlanRepository()
+        today = date.today()
+        for offset, summary in enumerate([{'calories': 600, 'protein': 30}, {'fiber': 5}, {}]):
+            _create_plan(repository, user_id, plan_date=today - timedelta(days=offset),
+                         total_nutrition_summary=summary)
+        
+        trends = repository.get_nutrition_trends(user_id)
+        
+        assert trends['total_days'] == 2
+        assert trends['daily_nutrition'][1] == {
+            'date': today.isoformat(), 'calories': 600, 'protein': 30, 'carbs': 0, 'fat': 0,
+        }
+        assert isinstance(trends['daily_nutrition'][1]['calories'], int)
+        assert trends['averages'] == {'calories': 300.0, 'protein': 15.0, 'carbs': 0.0, 'fat': 0.0}
+        assert isinstance(trends['averages']['fat'], float)
+
+
+class TestKeysetPagination:
+    def test_cursor_pages_neither_overlap_nor_skip(self, repository, user_id):
+        """Plans sharing a created_at are split across pages by id"""
+        created_at = datetime(2026, 1, 1, 12, 0)
+        for day in range(7):
+            plan = MealPlan(user_id=user_id, plan_date=date(2026, 1, 1) + timedelta(days=day),
+                            meals=[{'meal_type': 'dinner', 'recipe_id': 'r1', 'day': 1}])
+            plan.created_at = created_at if day < 5 else created_at - timedelta(days=1)
+            repository.create_meal_plan(plan)
+        
+        expected = [plan.id for plan in repository.get_user_meal_plans(user_id)]
+        paged, cursor = [], None
+        while True:
+            page = repository.get_user_meal_plans(user_id, limit=2, cursor=cursor)
+            paged.extend(plan.id for plan in page)
+            if len(page) < 2:
+                break
+            cursor = (page[-1].created_at, page[-1].id)
+        
+        assert len(expected) == 7
+        assert paged == expected
+
+
+class TestPopularRecipes:
+    def test_ties_ordered_by_recipe_id(self, repository, user_id):
+        """Equal usage counts come back in recipe_id order, as the PostgreSQL query sorts them"""
+        meals = [{'meal_type': 'dinner', 'recipe_id': recipe_id, 'day': 1} for recipe_id in ('r3', 'r1', 'r2')]
+        repository.create_meal_plan(MealPlan(user_id=user_id, plan_date=date(2026, 1, 5), meals=meals))
+        
+        popular = repository.get_popular_recipes(user_id)
+        
+        assert [recipe['recipe_id'] for recipe in popular] == ['r1', 'r2', 'r3']
+    
+    def test_meal_types_skip_missing_values(self, app, user_id):
+        """Meals without a meal_type add nothing to meal_types"""
+        repository = meal_plan_repository.MealPlanRepository()
+        meals = [{'meal_type': 'lunch', 'recipe_id': 'r1'}, {'recipe_id': 'r1'}, {'meal_type': 'dinner', 'recipe_id': 'r1'}]
+        repository.create_meal_plan(MealPlan(user_id=user_id, plan_date=date(2026, 1, 5), meals=meals))
+        
+        popular = repository.get_popular_recipes(user_id)
+        
+        assert popular[0]['usage_count'] == 3
+        assert popular[0]['meal_types'] == ['dinner', 'lunch']
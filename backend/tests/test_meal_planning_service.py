@@ -0,0 +1,45 @@
+"""
+Tests for MealPlanningService against SQLite
+"""
+
+import pytest
+
+from core.models.user import User
+from data_access.database import db
+from data_access.meal_plan_repository import MealPlanRepository
+from data_access.seed_data import seed_recipes
+from services.meal_planning_service import MealPlanGenerationRequest, MealPlanningService
+
+
+@pytest.fixture
+def service(app):
+    service = MealPlanningService()
+    # No MongoDB here; generation works from the User row and recipes alone
+    service.user_preferences_model = None
+    service.preference_service = None
+    return service
+
+
+@pytest.fixture
+def user(app):
+    user = User(username='planner', email='planner@example.com', password='secret-password')
+    db.session.add(user)
+    db.session.commit()
+    assert seed_recipes()
+    return user
+
+
+class TestGenerateMealPlan:
+    def test_generated_plan_refreshes_cached_statistics(self, service, user):
+        """Aggregate reads cached before generation see the new plan straight away"""
+        repository = MealPlanRepository()
+        assert repository.get_meal_plan_statistics(user.id)['total_meal_plans'] == 0
+        assert repository.get_popular_recipes(user.id) == []
+        
+        plan = service.generate_meal_plan(MealPlanGenerationRequest(user_id=user.id, duration_days=2))
+        
+        statistics = repository.get_meal_plan_statistics(user.id)
+        assert statistics['total_meal_plans'] == 1
+        assert statistics['duration_distribution'] == {2: 1}
+        popular_ids = {entry['recipe_id'] for entry in repository.get_popular_recipes(user.id)}
+        assert popular_ids == {meal['recipe_id'] for meal in plan.meals}
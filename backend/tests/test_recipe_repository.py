@@ -0,0 +1,54 @@
+"""
+Tests for the recipe repositories against SQLite
+"""
+
+import pytest
+from sqlalchemy import insert
+
+from core.models.recipe import Recipe
+from data_access import recipe_repository
+from data_access.database import db
+from data_access.repositories import recipe_repository as list_recipe_repository
+
+
+@pytest.fixture(params=[
+    recipe_repository.RecipeRepository,
+    list_recipe_repository.RecipeRepository,
+], ids=['data_access', 'repositories'])
+def repository(request, app):
+    return request.param()
+
+
+def _insert_untagged(name, ingredient):
+    """Insert a recipe the way the raw-SQL seeds do, leaving dietary_tags NULL"""
+    db.session.execute(insert(Recipe.__table__).values(
+        name=name, description='Seeded', instructions='Cook',
+        ingredients=[{'name': ingredient, 'quantity': '1'}], is_active=True,
+    ))
+    db.session.commit()
+
+
+class TestDietaryRestrictionFilter:
+    @pytest.fixture(autouse=True)
+    def recipes(self, repository):
+        repository.create_recipe({
+            'name': 'Tofu Bowl', 'instructions': 'Cook', 'ingredients': [{'name': 'tofu', 'quantity': '1'}],
+        })
+        repository.create_recipe({
+            'name': 'Beef Tacos', 'instructions': 'Cook', 'ingredients': [{'name': 'beef', 'quantity': '1'}],
+        })
+        _insert_untagged('Lentil Soup', 'lentils')
+        _insert_untagged('Chicken Curry', 'chicken')
+    
+    def test_untagged_rows_fall_back_to_keyword_match(self, repository):
+        names = {recipe.name for recipe in repository.get_recipes_by_dietary_restrictions(['vegetarian'])}
+        
+        assert names == {'Tofu Bowl', 'Lentil Soup'}
+    
+    def test_search_applies_the_same_fallback(self, repository):
+        names = {recipe.name for recipe in repository.search_recipes('', {'dietary_restrictions': ['vegan']})}
+        
+        assert names == {'Tofu Bowl', 'Lentil Soup'}
+    
+    def test_unrestricted_reads_include_untagged_rows(self, repository):
+        assert len(repository.get_recipes_by_dietary_restrictions([])) == 4
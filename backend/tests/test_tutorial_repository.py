@@ -0,0 +1,34 @@
+"""
+Tests for TutorialRepository against SQLite
+"""
+
+import pytest
+
+from data_access.tutorial_repository import TutorialRepository
+
+
+@pytest.fixture
+def repository(app):
+    return TutorialRepository()
+
+
+def _titles(repository, search_term):
+    tutorials, total_count = repository.search_tutorials(search_term)
+    assert total_count == len(tutorials)
+    return {tutorial.title for tutorial in tutorials}
+
+
+class TestTutorialTagSearch:
+    def test_search_follows_tag_changes(self, repository):
+        tutorial = repository.create_tutorial({
+            'title': 'Holding a Knife', 'description': 'Grip basics', 'steps': [],
+            'category': 'knife_skills', 'difficulty_level': 'beginner',
+            'estimated_duration_minutes': 5, 'tags': ['Safety'], 'keywords': ['grip'],
+        })
+        assert _titles(repository, 'safety') == {'Holding a Knife'}
+        
+        repository.update_tutorial(tutorial.id, {'tags': ['precision']})
+        
+        assert _titles(repository, 'safety') == set()
+        assert _titles(repository, 'precision') == {'Holding a Knife'}
+        assert _titles(repository, 'grip') == {'Holding a Knife'}
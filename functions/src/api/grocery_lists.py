@@ -428,22 +428,15 @@ def delete_grocery_list(list_id: str):
     try:
         user_id = get_jwt_identity()
         
-        # Verify user owns the list and soft delete
-        grocery_list_data = grocery_list_service.get_grocery_list(list_id, user_id)
-        if not grocery_list_data:
+        # Soft delete; ownership is checked in the UPDATE's WHERE clause
+        success = grocery_list_repo.delete(list_id, user_id=user_id)
+        
+        if not success:
             return jsonify({
                 'error': 'Not found',
                 'message': 'Grocery list not found or access denied'
             }), 404
         
-        success = grocery_list_repo.delete(list_id)
-        
-        if not success:
-            return jsonify({
-                'error': 'Internal server error',
-                'message': 'Failed to delete grocery list'
-            }), 500
-        
         return jsonify({
             'success': True,
             'message': 'Grocery list deleted successfully'
@@ -4,6 +4,8 @@ Handles meal plan generation, retrieval, and management
 """
 
 import logging
+import uuid
+from datetime import datetime
 from flask import Blueprint, request, jsonify
 from flask_jwt_extended import jwt_required, get_jwt_identity
 from flask_limiter import Limiter
@@ -32,6 +34,15 @@ nutritional_analysis_service = NutritionalAnalysisService()
 meal_plan_repository = MealPlanRepository()
 recipe_repository = RecipeRepository()
 
+def _encode_cursor(meal_plan) -> str:
+    """Opaque page cursor for the plan a page ended on"""
+    return f"{meal_plan.created_at.isoformat()}|{meal_plan.id}"
+
+def _decode_cursor(cursor: str):
+    """Parse a cursor from _encode_cursor into (created_at, id); raises ValueError if malformed"""
+    created_at, _, plan_id = cursor.partition('|')
+    return datetime.fromisoformat(created_at), uuid.UUID(plan_id)
+
 # Rate limiting decorator
 limiter = Limiter(
     key_func=get_remote_address,
@@ -198,12 +209,26 @@ def get_user_meal_plans():
         # Get query parameters
         limit = request.args.get('limit', 10, type=int)
         offset = request.args.get('offset', 0, type=int)
+        cursor = request.args.get('cursor')
+        
+        # A cursor (next_cursor from the previous page) takes precedence over offset
+        try:
+            cursor = _decode_cursor(cursor) if cursor else None
+        except ValueError:
+            return jsonify({
+                'success': False,
+                'error': {
+                    'code': 'ValidationError',
+                    'message': 'Invalid cursor'
+                }
+            }), 400
         
         # Get meal plans
         meal_plans = meal_plan_repository.get_user_meal_plans(
             user_id=user_id,
             limit=limit,
-            offset=offset
+            offset=offset,
+            cursor=cursor
         )
         
         # Convert to response format
@@ -227,7 +252,8 @@ def get_user_meal_plans():
             meal_plans=meal_plans_data,
             total_count=len(meal_plans_data),
             limit=limit,
-            offset=offset
+            offset=offset,
+            next_cursor=_encode_cursor(meal_plans[-1]) if limit and len(meal_plans) == limit else None
         )
         
         logger.debug(f"Retrieved {len(meal_plans_data)} meal plans for user {user_id}")
@@ -34,6 +34,7 @@ class MealPlanListResponse(BaseModel):
     total_count: int
     limit: int
     offset: int
+    next_cursor: Optional[str] = None
 
 class MealPlanStatsResponse(BaseModel):
     """Response schema for meal plan statistics"""
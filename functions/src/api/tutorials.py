@@ -83,7 +83,7 @@ def get_tutorials():
         # Convert tutorials to dict format with progress info
         tutorials_data = []
         for tutorial in result.tutorials:
-            tutorial_dict = tutorial.to_dict(include_steps=False)  # Don't include full steps in list view
+            tutorial_dict = tutorial.to_payload(include_steps=False)  # Don't include full steps in list view
             
             # Add user progress if available
             if hasattr(tutorial, '_user_progress'):
@@ -133,7 +133,7 @@ def get_tutorial_details(tutorial_id: int):
             return jsonify({'error': 'Tutorial not found'}), 404
         
         # Convert to dict with full steps
-        tutorial_dict = tutorial.to_dict(include_steps=True)
+        tutorial_dict = tutorial.to_payload(include_steps=True)
         
         # Add user progress if available
         if hasattr(tutorial, '_user_progress'):
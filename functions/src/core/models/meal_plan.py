@@ -4,13 +4,18 @@ Represents a generated meal plan for a user
 """
 
 import uuid
-from datetime import datetime, date
+from datetime import datetime, date, timedelta
 from typing import Optional, List, Dict, Any
 from sqlalchemy.dialects.postgresql import UUID
-from sqlalchemy import Column, String, DateTime, Date, Boolean, ForeignKey
+from sqlalchemy import Column, String, DateTime, Date, Boolean, ForeignKey, Index, and_, text
+from sqlalchemy.orm import validates
 from sqlalchemy.types import JSON
 
 from data_access.database import db
+from core.models.recipe import MEAL_TYPES
+
+# Fractional deviation from budget_target_usd still counted as within budget
+BUDGET_TOLERANCE = 0.10
 
 class MealPlan(db.Model):
     """MealPlan model for storing generated meal plans"""
@@ -24,6 +29,7 @@ class MealPlan(db.Model):
     # Plan Configuration
     plan_date = Column(Date, nullable=False)  # Start date of the plan
     duration_days = Column(db.Integer, default=1)  # Number of days (1-7)
+    end_date = Column(Date, nullable=True)  # Last day of the plan, derived from plan_date and duration_days
     
     # Meal Data - stored as JSON for flexibility
     meals = Column(JSON, nullable=False)  # [{"meal_type": "breakfast", "recipe_id": "xyz", "day": 1}]
@@ -51,6 +57,15 @@ class MealPlan(db.Model):
     created_at = Column(DateTime, default=datetime.utcnow)
     updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
     
+    __table_args__ = (
+        # Keyset pagination of a user's plans, newest first; soft-deleted rows stay out of the index
+        Index('idx_meal_plans_user_created_active', user_id, created_at.desc(), id.desc(),
+              postgresql_where=text('is_active')),
+        # Current/recent/date-range lookups and overlap checks, index-only on PostgreSQL
+        Index('idx_meal_plans_user_active_date', user_id, plan_date.desc(),
+              postgresql_include=['end_date', 'id'], postgresql_where=text('is_active')),
+    )
+    
     def __init__(self, user_id: str, plan_date: date, meals: List[Dict[str, Any]],
                  duration_days: int = 1, total_nutrition_summary: Optional[Dict[str, Any]] = None,
                  daily_nutrition_breakdown: Optional[Dict[str, Any]] = None,
@@ -71,11 +86,14 @@ class MealPlan(db.Model):
         self.budget_target_usd = budget_target_usd
         self.dietary_restrictions_used = dietary_restrictions_used or []
     
-    @property
-    def end_date(self) -> date:
-        """Calculate the end date of the meal plan"""
-        from datetime import timedelta
-        return self.plan_date + timedelta(days=self.duration_days - 1)
+    @validates('plan_date', 'duration_days')
+    def _sync_end_date(self, key: str, value: Any) -> Any:
+        """Keep the persisted end_date in step with plan_date and duration_days"""
+        plan_date = value if key == 'plan_date' else self.plan_date
+        duration_days = value if key == 'duration_days' else self.duration_days
+        if plan_date is not None and duration_days:
+            self.end_date = plan_date + timedelta(days=duration_days - 1)
+        return value
     
     @property
     def cost_per_day_usd(self) -> Optional[float]:
@@ -97,12 +115,21 @@ class MealPlan(db.Model):
         if not self.estimated_total_cost_usd or not self.budget_target_usd:
             return None
         
-        tolerance = 0.10
-        budget_min = self.budget_target_usd * (1 - tolerance)
-        budget_max = self.budget_target_usd * (1 + tolerance)
+        budget_min = self.budget_target_usd * (1 - BUDGET_TOLERANCE)
+        budget_max = self.budget_target_usd * (1 + BUDGET_TOLERANCE)
         
         return budget_min <= self.estimated_total_cost_usd <= budget_max
     
+    @classmethod
+    def within_budget_clause(cls):
+        """SQL clause matching plans for which is_within_budget is True"""
+        return and_(
+            cls.estimated_total_cost_usd != 0,
+            cls.budget_target_usd != 0,
+            cls.estimated_total_cost_usd >= cls.budget_target_usd * (1 - BUDGET_TOLERANCE),
+            cls.estimated_total_cost_usd <= cls.budget_target_usd * (1 + BUDGET_TOLERANCE),
+        )
+    
     def get_meals_by_day(self, day: int) -> List[Dict[str, Any]]:
         """Get all meals for a specific day"""
         return [meal for meal in self.meals if meal.get('day') == day]
@@ -117,13 +144,16 @@ class MealPlan(db.Model):
     
     def calculate_variety_score(self) -> float:
         """Calculate variety score based on unique recipes vs total meals"""
-        if not self.meals:
+        return self.variety_score(self.meals)
+    
+    @staticmethod
+    def variety_score(meals: Optional[List[Dict[str, Any]]]) -> float:
+        """Unique recipes over total meals for a meals list, without a loaded MealPlan"""
+        if not meals:
             return 0.0
         
-        unique_recipes = len(self.get_unique_recipes())
-        total_meals = len(self.meals)
-        
-        return unique_recipes / total_meals if total_meals > 0 else 0.0
+        unique_recipes = len({meal.get('recipe_id') for meal in meals if meal.get('recipe_id')})
+        return unique_recipes / len(meals)
     
     def add_user_feedback(self, rating: int, feedback: Optional[str] = None) -> None:
         """Add user rating and feedback"""
@@ -140,7 +170,6 @@ class MealPlan(db.Model):
             return False
         
         required_meal_fields = ['meal_type', 'recipe_id', 'day']
-        valid_meal_types = ['breakfast', 'lunch', 'dinner', 'snack']
         
         for meal in self.meals:
             # Check required fields
@@ -148,7 +177,7 @@ class MealPlan(db.Model):
                 return False
             
             # Check valid meal type
-            if meal['meal_type'] not in valid_meal_types:
+            if meal['meal_type'] not in MEAL_TYPES:
                 return False
             
             # Check valid day range
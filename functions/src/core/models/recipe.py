@@ -3,15 +3,43 @@ Recipe Domain Model
 Represents a food recipe with nutritional information
 """
 
+import re
 import uuid
 from datetime import datetime
 from typing import Optional, List, Dict, Any
-from sqlalchemy.dialects.postgresql import UUID
-from sqlalchemy import Column, String, DateTime, Integer, Text
+from sqlalchemy.dialects.postgresql import UUID, JSONB
+from sqlalchemy import Column, String, DateTime, Integer, Text, Index, and_, cast, func, or_, text, true
 from sqlalchemy.types import JSON
 
 from data_access.database import db
 
+# Numeric portion of an ingredient quantity string, e.g. "1.5" in "1.5 cups"
+_QUANTITY_NUMBER_RE = re.compile(r'(\d+(?:\.\d+)?)')
+
+# Canonical values for the meal_type and difficulty_level columns; shared
+# by validators so membership checks reuse one set instead of a literal per call
+MEAL_TYPES = frozenset(('breakfast', 'lunch', 'dinner', 'snack'))
+DIFFICULTY_LEVELS = frozenset(('easy', 'medium', 'hard'))
+
+# Ingredients/words that rule a recipe out of each supported dietary restriction.
+# This is a simple implementation - in a real system you'd have more
+# sophisticated ingredient analysis
+DIETARY_RESTRICTION_KEYWORDS = {
+    'vegan': ['meat', 'chicken', 'beef', 'pork', 'fish', 'dairy', 'milk', 'cheese', 'egg'],
+    'vegetarian': ['meat', 'chicken', 'beef', 'pork', 'fish'],
+    'gluten-free': ['wheat', 'flour', 'bread', 'pasta', 'gluten'],
+    'dairy-free': ['milk', 'cheese', 'butter', 'cream', 'dairy'],
+    'nut-free': ['nuts', 'almond', 'peanut', 'walnut', 'cashew'],
+}
+
+def dietary_tags_for(name: str, description: Optional[str], ingredients: Any) -> List[str]:
+    """Return the sorted dietary restrictions a recipe with this content satisfies"""
+    recipe_text = f"{name} {description or ''} {str(ingredients)}".lower()
+    return sorted(
+        restriction for restriction, forbidden_words in DIETARY_RESTRICTION_KEYWORDS.items()
+        if not any(word in recipe_text for word in forbidden_words)
+    )
+
 class Recipe(db.Model):
     """Recipe model for storing recipe data"""
     
@@ -30,6 +58,7 @@ class Recipe(db.Model):
     # Enhanced Recipe Information
     cooking_tips = Column(JSON, nullable=True)  # [{"tip": "For best results...", "category": "technique"}]
     equipment_needed = Column(JSON, nullable=True)  # ["large pot", "whisk", "measuring cups"]
+    dietary_tags = Column(JSON().with_variant(JSONB, 'postgresql'), nullable=True)  # ["dairy-free", "vegan"] - derived from name/description/ingredients
     
     # Classification
     cuisine_type = Column(String(50), nullable=True)  # Italian, Mexican, etc.
@@ -58,6 +87,14 @@ class Recipe(db.Model):
     created_at = Column(DateTime, default=datetime.utcnow)
     updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
     
+    __table_args__ = (
+        Index('idx_recipes_active_meal', 'meal_type', postgresql_where=text('is_active')),
+        Index('idx_recipes_active_difficulty', 'difficulty_level', postgresql_where=text('is_active')),
+        Index('idx_recipes_cost_active', 'estimated_cost_usd', postgresql_where=text('is_active')),
+        Index('idx_recipes_active_id', 'id', postgresql_where=text('is_active')),
+        Index('idx_recipes_meal_diff_active', 'meal_type', 'difficulty_level', postgresql_where=text('is_active')),
+    )
+    
     def __init__(self, name: str, ingredients: List[Dict[str, Any]], instructions: str,
                  description: Optional[str] = None, cuisine_type: Optional[str] = None,
                  meal_type: Optional[str] = None, prep_time_minutes: Optional[int] = None,
@@ -85,6 +122,7 @@ class Recipe(db.Model):
         self.source_url = source_url
         self.image_url = image_url
         self.servings = servings
+        self.refresh_dietary_tags()
     
     @property
     def total_time_minutes(self) -> Optional[int]:
@@ -114,7 +152,7 @@ class Recipe(db.Model):
         
         # Fallback: convert legacy text instructions to steps
         if self.instructions:
-            lines = [line.strip() for line in self.instructions.split('\n') if line.strip()]
+            lines = [line for line in (raw.strip() for raw in self.instructions.splitlines()) if line]
             return [
                 {
                     "step": i + 1,
@@ -134,15 +172,11 @@ class Recipe(db.Model):
         
         scaled_ingredients = []
         for ingredient in self.ingredients:
-            scaled_ingredient = ingredient.copy()
-            
             # Try to scale quantities that are numeric
             quantity = ingredient.get('quantity', '')
-            try:
-                # Extract numeric portion from quantity string
-                import re
-                numeric_match = re.search(r'(\d+(?:\.\d+)?)', str(quantity))
-                if numeric_match:
+            numeric_match = _QUANTITY_NUMBER_RE.search(str(quantity))
+            if numeric_match:
+                try:
                     original_num = float(numeric_match.group(1))
                     scaled_num = original_num * scale_factor
                     
@@ -152,15 +186,16 @@ class Recipe(db.Model):
                     else:
                         scaled_num_str = f"{scaled_num:.2f}".rstrip('0').rstrip('.')
                     
-                    scaled_ingredient['quantity'] = quantity.replace(
-                        numeric_match.group(1), 
-                        scaled_num_str
-                    )
-            except (ValueError, AttributeError):
-                # If we can't scale it, keep original
-                pass
+                    # Only ingredients whose quantity changes are copied
+                    ingredient = {
+                        **ingredient,
+                        'quantity': quantity.replace(numeric_match.group(1), scaled_num_str)
+                    }
+                except (ValueError, AttributeError):
+                    # If we can't scale it, keep original
+                    pass
             
-            scaled_ingredients.append(scaled_ingredient)
+            scaled_ingredients.append(ingredient)
         
         # Scale nutritional info
         scaled_nutrition = {}
@@ -178,31 +213,51 @@ class Recipe(db.Model):
             'estimated_cost_usd': int(self.estimated_cost_usd * scale_factor) if self.estimated_cost_usd else None
         }
     
+    def refresh_dietary_tags(self) -> None:
+        """Recompute dietary_tags after name, description or ingredients change"""
+        self.dietary_tags = dietary_tags_for(self.name, self.description, self.ingredients)
+    
     def matches_dietary_restrictions(self, restrictions: List[str]) -> bool:
         """Check if recipe matches dietary restrictions"""
         if not restrictions:
             return True
         
-        # This is a simple implementation - in a real system you'd have 
-        # more sophisticated ingredient analysis
-        recipe_text = f"{self.name} {self.description or ''} {str(self.ingredients)}".lower()
-        
-        restriction_keywords = {
-            'vegan': ['meat', 'chicken', 'beef', 'pork', 'fish', 'dairy', 'milk', 'cheese', 'egg'],
-            'vegetarian': ['meat', 'chicken', 'beef', 'pork', 'fish'],
-            'gluten-free': ['wheat', 'flour', 'bread', 'pasta', 'gluten'],
-            'dairy-free': ['milk', 'cheese', 'butter', 'cream', 'dairy'],
-            'nut-free': ['nuts', 'almond', 'peanut', 'walnut', 'cashew'],
-        }
+        tags = set(dietary_tags_for(self.name, self.description, self.ingredients))
+        return all(
+            restriction.lower() in tags
+            for restriction in restrictions
+            if restriction.lower() in DIETARY_RESTRICTION_KEYWORDS
+        )
+    
+    @classmethod
+    def dietary_restrictions_filter(cls, restrictions: List[str], dialect_name: str):
+        """SQL clause matching recipes whose dietary_tags cover the given restrictions
         
-        for restriction in restrictions:
-            restriction_lower = restriction.lower()
-            if restriction_lower in restriction_keywords:
-                forbidden_words = restriction_keywords[restriction_lower]
-                if any(word in recipe_text for word in forbidden_words):
-                    return False
+        Unknown restrictions are ignored, as in matches_dietary_restrictions.
+        On PostgreSQL this is a JSONB containment test served by the GIN index.
+        Rows written without tags (dietary_tags IS NULL) fall back to matching
+        the forbidden keywords against the recipe text.
+        """
+        known = sorted({r.lower() for r in restrictions or []} & DIETARY_RESTRICTION_KEYWORDS.keys())
+        if not known:
+            return true()
+        if dialect_name == 'postgresql':
+            tagged = cls.dietary_tags.op('@>')(cast(known, JSONB))
+        else:
+            # Tags are a fixed vocabulary, so a quoted substring match is exact
+            tagged = and_(*(cast(cls.dietary_tags, String).like(f'%"{tag}"%') for tag in known))
         
-        return True
+        recipe_text = func.lower(
+            cls.name + ' ' + func.coalesce(cls.description, '') + ' ' + cast(cls.ingredients, String)
+        )
+        untagged = and_(*(
+            recipe_text.not_like(f'%{word}%')
+            for tag in known for word in DIETARY_RESTRICTION_KEYWORDS[tag]
+        ))
+        return or_(
+            and_(cls.dietary_tags.isnot(None), tagged),
+            and_(cls.dietary_tags.is_(None), untagged),
+        )
     
     def calculate_nutrition_score(self, target_calories: Optional[int] = None,
                                 target_protein_pct: Optional[float] = None,
@@ -4,11 +4,10 @@ Represents user activities for the social activity feed
 """
 
 import uuid
-import json
 from datetime import datetime
 from typing import Dict, Any
-from sqlalchemy.dialects.postgresql import UUID
-from sqlalchemy import Column, String, DateTime, ForeignKey, Text
+from sqlalchemy.dialects.postgresql import UUID, JSONB
+from sqlalchemy import Column, String, DateTime, ForeignKey, Index, text, or_, and_
 from sqlalchemy.types import JSON
 from sqlalchemy.orm import relationship
 
@@ -25,7 +24,7 @@ class UserActivity(db.Model):
     
     # Activity Information
     activity_type = Column(String(50), nullable=False)  # recipe_created, meal_plan_generated, recipe_shared, etc.
-    activity_data = Column(Text, nullable=False)  # JSON data stored as text for compatibility
+    activity_data = Column(JSON().with_variant(JSONB, 'postgresql'), nullable=False, default=dict)  # JSONB on PostgreSQL, JSON text elsewhere
     privacy_level = Column(String(20), default='friends')  # public, friends, private
     
     # Timestamps
@@ -34,31 +33,29 @@ class UserActivity(db.Model):
     # Relationships
     user = relationship("User", backref="activities")
     
+    # Indexes backing the activity feed ordering and public visibility filter
+    __table_args__ = (
+        Index('idx_act_user_created', user_id, created_at.desc()),
+        Index('idx_act_public', created_at.desc(), postgresql_where=text("privacy_level = 'public'")),
+    )
+    
     def __init__(self, user_id: str, activity_type: str, activity_data: Dict[str, Any], 
                  privacy_level: str = 'friends'):
         """Initialize a new user activity"""
         self.user_id = user_id
         self.activity_type = activity_type
-        self.activity_data = json.dumps(activity_data)
+        self.activity_data = activity_data if activity_data is not None else {}
         self.privacy_level = privacy_level
     
     @property
     def activity_data_dict(self) -> Dict[str, Any]:
-        """Get activity data as a dictionary"""
-        if not self.activity_data:
-            return {}
-        try:
-            return json.loads(self.activity_data)
-        except (json.JSONDecodeError, TypeError):
-            return {}
+        """Get activity data as a dictionary (the column is already decoded by the driver)"""
+        return self.activity_data or {}
     
     @activity_data_dict.setter
     def activity_data_dict(self, value: Dict[str, Any]) -> None:
         """Set activity data from a dictionary"""
-        if value is None:
-            self.activity_data = '{}'
-        else:
-            self.activity_data = json.dumps(value)
+        self.activity_data = value if value is not None else {}
     
     def is_visible_to_user(self, viewing_user_id: str, is_connected: bool = False) -> bool:
         """Check if this activity is visible to the viewing user"""
@@ -72,6 +69,21 @@ class UserActivity(db.Model):
         else:  # private
             return False
     
+    @classmethod
+    def visible_to_user_filter(cls, viewing_user_id: str, connected_user_ids: Any):
+        """Build the SQL equivalent of is_visible_to_user
+        
+        connected_user_ids is a query selecting the IDs of users connected to the viewer.
+        """
+        return or_(
+            cls.user_id == viewing_user_id,
+            cls.privacy_level == 'public',
+            and_(
+                cls.privacy_level == 'friends',
+                cls.user_id.in_(connected_user_ids)
+            )
+        )
+    
     def to_dict(self, include_user: bool = False) -> Dict[str, Any]:
         """Convert activity to dictionary for API responses"""
         activity_dict = {
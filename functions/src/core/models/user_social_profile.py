@@ -10,7 +10,7 @@ from typing import Optional, List, Dict, Any
 from sqlalchemy.dialects.postgresql import UUID
 from sqlalchemy import Column, String, DateTime, Boolean, Text, ForeignKey
 from sqlalchemy.types import JSON
-from sqlalchemy.orm import relationship
+from sqlalchemy.orm import relationship, backref
 
 from data_access.database import db
 
@@ -48,7 +48,7 @@ class UserSocialProfile(db.Model):
     updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
     
     # Relationships
-    user = relationship("User", backref="social_profile")
+    user = relationship("User", backref=backref("social_profile", uselist=False))  # One profile per user
     
     def __init__(self, user_id: str, display_name: Optional[str] = None):
         """Initialize a new user social profile"""
@@ -0,0 +1,87 @@
+"""
+JSON Serialization Helpers
+Fast JSON encoding/decoding backed by orjson, with a stdlib fallback
+"""
+
+from datetime import date
+from typing import Any, Union
+
+from flask.json.provider import DefaultJSONProvider
+
+try:
+    import orjson as _orjson
+except ImportError:  # pragma: no cover - exercised only without orjson installed
+    _orjson = None
+
+import json as _stdlib_json
+
+# Raised by loads() on malformed input; orjson.JSONDecodeError subclasses it
+JSONDecodeError = _stdlib_json.JSONDecodeError
+
+# orjson options for API responses: numpy arrays and non-string dict keys are
+# accepted like the stdlib encoder; datetimes and UUIDs are handled natively
+_RESPONSE_OPTIONS = (
+    (_orjson.OPT_SERIALIZE_NUMPY | _orjson.OPT_NON_STR_KEYS) if _orjson is not None else 0
+)
+
+# orjson options for JSON column values; int dict keys (e.g. day numbers)
+# become strings, as the stdlib encoder does
+_COLUMN_OPTIONS = _orjson.OPT_NON_STR_KEYS if _orjson is not None else 0
+
+
+def dumps(obj: Any) -> str:
+    """Serialize an object to a JSON string"""
+    if _orjson is not None:
+        return _orjson.dumps(obj).decode('utf-8')
+    return _stdlib_json.dumps(obj)
+
+
+def loads(data: Union[str, bytes, bytearray]) -> Any:
+    """Deserialize a JSON string or bytes into Python objects"""
+    if _orjson is not None:
+        return _orjson.loads(data)
+    return _stdlib_json.loads(data)
+
+
+def dumps_column(obj: Any) -> str:
+    """Serialize a JSON column value; used as the engine's json_serializer"""
+    if _orjson is not None:
+        return _orjson.dumps(obj, option=_COLUMN_OPTIONS).decode('utf-8')
+    return _stdlib_json.dumps(obj)
+
+
+def _default(obj: Any) -> Any:
+    """Fallback encoder for types neither orjson nor the stdlib handle natively"""
+    if isinstance(obj, date):
+        # Match orjson's ISO 8601 output so both code paths agree
+        return obj.isoformat()
+    return DefaultJSONProvider.default(obj)
+
+
+class OrjsonJSONProvider(DefaultJSONProvider):
+    """Flask JSON provider that serializes responses with orjson when available
+
+    Models can hand raw datetimes and UUIDs (see ``to_payload``) straight to
+    ``jsonify``; they are formatted in C instead of per-field in Python.
+    """
+
+    default = staticmethod(_default)
+
+    def dumps(self, obj: Any, **kwargs: Any) -> str:
+        # response() passes compact separators or indent=2; both map onto orjson
+        # output, anything else goes through the stdlib encoder
+        orjson_kwargs = {k: v for k, v in kwargs.items() if k not in ('separators', 'indent')}
+        if _orjson is None or orjson_kwargs or kwargs.get('indent') not in (None, 2):
+            return super().dumps(obj, **kwargs)
+
+        option = _RESPONSE_OPTIONS
+        if self.sort_keys:
+            option |= _orjson.OPT_SORT_KEYS
+        if kwargs.get('indent') == 2:
+            option |= _orjson.OPT_INDENT_2
+        return _orjson.dumps(obj, default=self.default, option=option).decode('utf-8')
+
+    def loads(self, s: Union[str, bytes], **kwargs: Any) -> Any:
+        if _orjson is None or kwargs:
+            return super().loads(s, **kwargs)
+        return _orjson.loads(s)
@@ -6,59 +6,142 @@ Handles PostgreSQL and MongoDB connections
 from flask_sqlalchemy import SQLAlchemy
 from pymongo import MongoClient
 from pymongo.errors import ConnectionFailure, ServerSelectionTimeoutError
+from sqlalchemy.engine import make_url
+from sqlalchemy.pool import NullPool
+
+from core import serialization
+import io
+import logging
 import os
 
+logger = logging.getLogger(__name__)
+
 # Initialize SQLAlchemy for PostgreSQL
+# configure_engine_options() turns on psycopg2's fast-execution helpers, so
+# executemany paths (session.add_all, ORM flushes of many rows) send one
+# multi-row INSERT per page instead of one round-trip per row
 db = SQLAlchemy()
 
+# psycopg2 dialect options merged into SQLALCHEMY_ENGINE_OPTIONS
+PSYCOPG2_ENGINE_OPTIONS = {
+    'executemany_mode': 'values_plus_batch',
+    'insertmanyvalues_page_size': 1000,
+    'executemany_batch_page_size': 500,
+}
+
+# QueuePool sizing for PostgreSQL; warm instances reuse these connections
+# instead of paying TCP+TLS+auth per request, and the cap protects the server
+POSTGRES_POOL_OPTIONS = {
+    'pool_size': 5,
+    'max_overflow': 10,
+    'pool_timeout': 3,
+}
+
+# JSON column (de)serialization through orjson when it is installed
+JSON_ENGINE_OPTIONS = {
+    'json_serializer': serialization.dumps_column,
+    'json_deserializer': serialization.loads,
+}
+
+def configure_engine_options(app):
+    """Apply JSON codec options, plus pooling and psycopg2 batching for PostgreSQL"""
+    uri = app.config.get('SQLALCHEMY_DATABASE_URI')
+    if not uri:
+        return
+    url = make_url(uri)
+    
+    defaults = dict(JSON_ENGINE_OPTIONS)
+    if url.get_backend_name() == 'postgresql':
+        if app.config.get('SQLALCHEMY_USE_NULLPOOL'):
+            # Behind PgBouncer transaction pooling, hold no connections in-process
+            defaults['poolclass'] = NullPool
+        else:
+            defaults.update(POSTGRES_POOL_OPTIONS)
+        if url.get_driver_name() == 'psycopg2':
+            defaults.update(PSYCOPG2_ENGINE_OPTIONS)
+    
+    # Explicit config values win over the defaults
+    options = {**defaults, **app.config.get('SQLALCHEMY_ENGINE_OPTIONS', {})}
+    if options.get('poolclass') is NullPool:
+        # NullPool rejects sizing arguments
+        for key in ('pool_size', 'max_overflow', 'pool_timeout', 'pool_recycle'):
+            options.pop(key, None)
+    app.config['SQLALCHEMY_ENGINE_OPTIONS'] = options
+
+# WITH options for the bulk loaders' COPY ... FROM STDIN statements. NULL is an
+# explicit marker, so an empty string loads as '' instead of NULL
+COPY_CSV_OPTIONS = "FORMAT csv, DELIMITER E'\\t', NULL '\\N'"
+COPY_NULL = '\\N'
+
+def copy_csv_buffer(rows) -> io.StringIO:
+    """Encode rows of column values as a COPY stream for COPY_CSV_OPTIONS
+    
+    None is written as the bare NULL marker and every other value is quoted,
+    so empty strings round-trip exactly as they do through INSERT.
+    """
+    buffer = io.StringIO()
+    for row in rows:
+        buffer.write('\t'.join(
+            COPY_NULL if value is None else '"' + str(value).replace('"', '""') + '"'
+            for value in row
+        ))
+        buffer.write('\n')
+    buffer.seek(0)
+    return buffer
+
 # MongoDB client - will be initialized in app factory
 mongo_client = None
 mongo_db = None
+_mongo_uri = None
+
+# Pool settings for MongoClient; warm serverless instances reuse these
+# connections (and their TLS sessions) across invocations
+MONGO_CLIENT_OPTIONS = {
+    'serverSelectionTimeoutMS': 5000,
+    'maxPoolSize': 10,
+    'minPoolSize': 1,
+    'maxIdleTimeMS': 30000,
+    'retryWrites': True,
+    'appname': 'foodi-backend',
+}
 
 def init_mongo(app):
     """Initialize MongoDB connection"""
-    global mongo_client, mongo_db
+    global mongo_client, mongo_db, _mongo_uri
     
     mongodb_uri = app.config.get('MONGODB_URI')
-    print(f"DEBUG: MongoDB URI from config: {mongodb_uri}")
+    # Reuse the existing client when the app is created again in the same process
+    if mongo_client is not None and mongodb_uri == _mongo_uri:
+        return mongo_db
     
     if mongodb_uri:
         try:
-            # Create client with timeout
-            mongo_client = MongoClient(mongodb_uri, serverSelectionTimeoutMS=5000)
-            
-            # Test the connection
-            mongo_client.admin.command('ping')
-            print("DEBUG: MongoDB connection successful!")
-            
-            # Extract database name from URI or use default
-            # For MongoDB Atlas URIs, the database name might not be in the path
-            if '/' in mongodb_uri and not mongodb_uri.endswith('/'):
-                # Check if there's a database name after the last /
-                path_part = mongodb_uri.split('/')[-1]
-                # If it starts with ?, it's query parameters, not a database name
-                if path_part and not path_part.startswith('?'):
-                    db_name = path_part.split('?')[0]  # Remove query parameters
-                else:
-                    db_name = 'foodi_demo'  # Default for Atlas
-            else:
-                db_name = 'foodi_demo'  # Default for Atlas
+            mongo_client = MongoClient(mongodb_uri, **MONGO_CLIENT_OPTIONS)
+            _mongo_uri = mongodb_uri
             
-            print(f"DEBUG: Using MongoDB database: {db_name}")
+            # Test the connection in debug only; in production the first
+            # operation connects, keeping a round-trip off cold starts
+            if app.debug:
+                mongo_client.admin.command('ping')
+                logger.debug("MongoDB connection successful")
             
-            mongo_db = mongo_client[db_name]
+            # Database name comes from the URI path as parsed by MongoClient;
+            # Atlas URIs often omit it, so fall back to the default
+            mongo_db = mongo_client.get_default_database(default='foodi_demo')
+            logger.debug("Using MongoDB database: %s", mongo_db.name)
             
         except (ConnectionFailure, ServerSelectionTimeoutError) as e:
-            print(f"ERROR: Failed to connect to MongoDB: {e}")
-            print("INFO: MongoDB connection failed, will use in-memory fallback")
+            logger.error("Failed to connect to MongoDB, will use in-memory fallback: %s", e)
             mongo_client = None
             mongo_db = None
-        except Exception as e:
-            print(f"ERROR: Unexpected error connecting to MongoDB: {e}")
+            _mongo_uri = None
+        except Exception:
+            logger.exception("Unexpected error connecting to MongoDB")
             mongo_client = None
             mongo_db = None
+            _mongo_uri = None
     else:
-        print("WARNING: No MONGODB_URI configured")
+        logger.warning("No MONGODB_URI configured")
     
     return mongo_db
 
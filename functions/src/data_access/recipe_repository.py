@@ -3,17 +3,90 @@ Recipe Repository
 Data access layer for Recipe model operations
 """
 
+import copy
 import logging
-from typing import Optional, List, Dict, Any
+import time
+from datetime import datetime
+from typing import Optional, List, Dict, Any, Iterable, Sequence, Tuple
 from sqlalchemy.orm import Session
-from sqlalchemy import and_, or_
+from sqlalchemy import and_, or_, func, update
 
-from core.models.recipe import Recipe
+from core import serialization
+from core.models.recipe import Recipe, dietary_tags_for
 from core.exceptions import ValidationError
-from data_access.database import db
+from data_access.database import COPY_CSV_OPTIONS, copy_csv_buffer, db
 
 logger = logging.getLogger(__name__)
 
+# Columns update_recipe may write; anything else in update_data is ignored.
+# dietary_tags is derived from the recipe content, never set directly
+_UPDATABLE_COLUMNS = frozenset(column.key for column in Recipe.__table__.columns) - {
+    'id', 'created_at', 'dietary_tags',
+}
+
+# get_recipe_statistics results are reused for this long within a process;
+# recipe writes through this repository invalidate them immediately
+RECIPE_STATISTICS_TTL_SECONDS = 60
+_statistics_cache: Optional[Tuple[float, Dict[str, Any]]] = None  # (expires_at, stats)
+
+def _invalidate_statistics() -> None:
+    """Drop cached recipe statistics after a write"""
+    global _statistics_cache
+    _statistics_cache = None
+
+# Rows inserted and committed per chunk by bulk_create_recipes; PostgreSQL
+# gains little from batches beyond a few thousand rows
+BULK_INSERT_BATCH_SIZE = 1000
+
+# Below this many rows COPY setup costs more than it saves; use the ORM path
+COPY_MIN_ROWS = 100
+
+# Column order of the TSV stream fed to COPY in bulk_copy_recipes
+_COPY_COLUMNS = (
+    'name', 'description', 'ingredients', 'instructions', 'detailed_instructions',
+    'cooking_tips', 'equipment_needed', 'cuisine_type', 'meal_type',
+    'prep_time_minutes', 'cook_time_minutes', 'nutritional_info',
+    'estimated_cost_usd', 'difficulty_level', 'source_url', 'image_url',
+    'servings', 'dietary_tags', 'is_active', 'created_at', 'updated_at',
+)
+_COPY_JSON_COLUMNS = frozenset({
+    'ingredients', 'detailed_instructions', 'cooking_tips', 'equipment_needed', 'nutritional_info',
+    'dietary_tags',
+})
+_COPY_SQL = (
+    f"COPY recipes ({', '.join(_COPY_COLUMNS)}) "
+    f"FROM STDIN WITH ({COPY_CSV_OPTIONS})"
+)
+
+def _recipe_row(recipe_data: Dict[str, Any]) -> Dict[str, Any]:
+    """Column values for a new recipe, with the same defaults as Recipe.__init__"""
+    return {
+        'name': recipe_data['name'],
+        'description': recipe_data.get('description'),
+        'ingredients': recipe_data['ingredients'],
+        'instructions': recipe_data['instructions'],
+        'detailed_instructions': recipe_data.get('detailed_instructions') or [],
+        'cooking_tips': recipe_data.get('cooking_tips') or [],
+        'equipment_needed': recipe_data.get('equipment_needed') or [],
+        'cuisine_type': recipe_data.get('cuisine_type'),
+        'meal_type': recipe_data.get('meal_type'),
+        'prep_time_minutes': recipe_data.get('prep_time_minutes'),
+        'cook_time_minutes': recipe_data.get('cook_time_minutes'),
+        'nutritional_info': recipe_data.get('nutritional_info') or {},
+        'estimated_cost_usd': recipe_data.get('estimated_cost_usd'),
+        'difficulty_level': recipe_data.get('difficulty_level'),
+        'source_url': recipe_data.get('source_url'),
+        'image_url': recipe_data.get('image_url'),
+        'servings': recipe_data.get('servings', 1),
+        'dietary_tags': dietary_tags_for(
+            recipe_data['name'], recipe_data.get('description'), recipe_data['ingredients']
+        ),
+    }
+
+def recipe_rows(recipes_data: Iterable[Dict[str, Any]]) -> Tuple[Dict[str, Any], ...]:
+    """Column values for many new recipes, for bulk_insert_recipe_rows"""
+    return tuple(_recipe_row(data) for data in recipes_data)
+
 class RecipeRepository:
     """Repository for Recipe data access operations"""
     
@@ -43,6 +116,7 @@ class RecipeRepository:
             
             self.session.add(recipe)
             self.session.commit()
+            _invalidate_statistics()
             
             logger.info(f"Recipe created successfully: {recipe.id}")
             return recipe
@@ -84,19 +158,21 @@ class RecipeRepository:
             logger.error(f"Error getting recipes by meal type {meal_type}: {str(e)}")
             raise ValidationError(f"Failed to get recipes: {str(e)}")
     
+    def _dietary_filter(self, dietary_restrictions: List[str]):
+        """Dietary restriction clause for the session's database dialect"""
+        return Recipe.dietary_restrictions_filter(
+            dietary_restrictions, self.session.get_bind().dialect.name
+        )
+    
     def get_recipes_by_dietary_restrictions(self, dietary_restrictions: List[str]) -> List[Recipe]:
         """Get recipes that match dietary restrictions"""
         try:
-            recipes = self.session.query(Recipe).filter(Recipe.is_active == True).all()
-            
-            # Filter in Python using the model's method
-            filtered_recipes = [
-                recipe for recipe in recipes 
-                if recipe.matches_dietary_restrictions(dietary_restrictions)
-            ]
+            recipes = self.session.query(Recipe).filter(
+                and_(Recipe.is_active == True, self._dietary_filter(dietary_restrictions))
+            ).all()
             
-            logger.debug(f"Found {len(filtered_recipes)} recipes matching dietary restrictions: {dietary_restrictions}")
-            return filtered_recipes
+            logger.debug(f"Found {len(recipes)} recipes matching dietary restrictions: {dietary_restrictions}")
+            return recipes
             
         except Exception as e:
             logger.error(f"Error filtering recipes by dietary restrictions: {str(e)}")
@@ -185,16 +261,12 @@ class RecipeRepository:
                 if 'max_cost_usd' in filters:
                     max_cost_cents = int(filters['max_cost_usd'] * 100)
                     query = query.filter(Recipe.estimated_cost_usd <= max_cost_cents)
+                
+                if 'dietary_restrictions' in filters:
+                    query = query.filter(self._dietary_filter(filters['dietary_restrictions']))
             
             recipes = query.all()
             
-            # Additional filtering for dietary restrictions (if specified)
-            if filters and 'dietary_restrictions' in filters:
-                recipes = [
-                    recipe for recipe in recipes 
-                    if recipe.matches_dietary_restrictions(filters['dietary_restrictions'])
-                ]
-            
             logger.debug(f"Found {len(recipes)} recipes matching search: {search_term}")
             return recipes
             
@@ -224,16 +296,25 @@ class RecipeRepository:
     def update_recipe(self, recipe_id: str, update_data: Dict[str, Any]) -> Recipe:
         """Update an existing recipe"""
         try:
-            recipe = self.get_recipe_by_id(recipe_id)
+            values = {field: value for field, value in update_data.items() if field in _UPDATABLE_COLUMNS}
+            if values:
+                # Single UPDATE ... RETURNING instead of SELECT then UPDATE
+                recipe = self.session.execute(
+                    update(Recipe)
+                    .where(Recipe.id == recipe_id, Recipe.is_active == True)
+                    .values(**values)
+                    .returning(Recipe)
+                ).scalar_one_or_none()
+            else:
+                recipe = self.get_recipe_by_id(recipe_id)
             if not recipe:
                 raise ValidationError(f"Recipe not found: {recipe_id}")
             
-            # Update fields
-            for field, value in update_data.items():
-                if hasattr(recipe, field):
-                    setattr(recipe, field, value)
+            if values.keys() & {'name', 'description', 'ingredients'}:
+                recipe.refresh_dietary_tags()
             
             self.session.commit()
+            _invalidate_statistics()
             
             logger.info(f"Recipe updated successfully: {recipe_id}")
             return recipe
@@ -246,12 +327,17 @@ class RecipeRepository:
     def delete_recipe(self, recipe_id: str) -> bool:
         """Soft delete a recipe (mark as inactive)"""
         try:
-            recipe = self.get_recipe_by_id(recipe_id)
-            if not recipe:
+            deleted_id = self.session.execute(
+                update(Recipe)
+                .where(Recipe.id == recipe_id, Recipe.is_active == True)
+                .values(is_active=False)
+                .returning(Recipe.id)
+            ).scalar_one_or_none()
+            if deleted_id is None:
                 raise ValidationError(f"Recipe not found: {recipe_id}")
             
-            recipe.is_active = False
             self.session.commit()
+            _invalidate_statistics()
             
             logger.info(f"Recipe deleted successfully: {recipe_id}")
             return True
@@ -264,7 +350,9 @@ class RecipeRepository:
     def get_recipe_count(self) -> int:
         """Get total count of active recipes"""
         try:
-            count = self.session.query(Recipe).filter(Recipe.is_active == True).count()
+            # Plain count(id) rather than Query.count()'s subquery wrap, so the
+            # partial index can answer it with an index-only scan
+            count = self.session.query(func.count(Recipe.id)).filter(Recipe.is_active == True).scalar()
             logger.debug(f"Total active recipes: {count}")
             return count
             
@@ -273,25 +361,30 @@ class RecipeRepository:
             raise ValidationError(f"Failed to get recipe count: {str(e)}")
     
     def get_recipe_statistics(self) -> Dict[str, Any]:
-        """Get recipe statistics"""
+        """Get recipe statistics, cached for RECIPE_STATISTICS_TTL_SECONDS"""
+        global _statistics_cache
+        cached = _statistics_cache
+        if cached is not None and cached[0] > time.monotonic():
+            return copy.deepcopy(cached[1])
+        
         try:
-            total_count = self.get_recipe_count()
-            
             # Count by meal type
-            meal_type_counts = {}
-            for meal_type in ['breakfast', 'lunch', 'dinner', 'snack']:
-                count = self.session.query(Recipe).filter(
-                    and_(Recipe.meal_type == meal_type, Recipe.is_active == True)
-                ).count()
-                meal_type_counts[meal_type] = count
+            meal_type_counts = dict.fromkeys(['breakfast', 'lunch', 'dinner', 'snack'], 0)
+            total_count = 0
+            for meal_type, count in self.session.query(Recipe.meal_type, func.count()).filter(
+                Recipe.is_active == True
+            ).group_by(Recipe.meal_type):
+                total_count += count
+                if meal_type in meal_type_counts:
+                    meal_type_counts[meal_type] = count
             
             # Count by difficulty
-            difficulty_counts = {}
-            for difficulty in ['easy', 'medium', 'hard']:
-                count = self.session.query(Recipe).filter(
-                    and_(Recipe.difficulty_level == difficulty, Recipe.is_active == True)
-                ).count()
-                difficulty_counts[difficulty] = count
+            difficulty_counts = dict.fromkeys(['easy', 'medium', 'hard'], 0)
+            for difficulty, count in self.session.query(Recipe.difficulty_level, func.count()).filter(
+                Recipe.is_active == True
+            ).group_by(Recipe.difficulty_level):
+                if difficulty in difficulty_counts:
+                    difficulty_counts[difficulty] = count
             
             stats = {
                 'total_recipes': total_count,
@@ -300,42 +393,83 @@ class RecipeRepository:
             }
             
             logger.debug(f"Recipe statistics: {stats}")
-            return stats
+            _statistics_cache = (time.monotonic() + RECIPE_STATISTICS_TTL_SECONDS, stats)
+            return copy.deepcopy(stats)
             
         except Exception as e:
             logger.error(f"Error getting recipe statistics: {str(e)}")
             raise ValidationError(f"Failed to get recipe statistics: {str(e)}")
     
-    def bulk_create_recipes(self, recipes_data: List[Dict[str, Any]]) -> List[Recipe]:
-        """Create multiple recipes in bulk"""
+    def bulk_create_recipes(self, recipes_data: List[Dict[str, Any]],
+                            batch_size: int = BULK_INSERT_BATCH_SIZE) -> int:
+        """Create multiple recipes in bulk, returning the number created
+        
+        Rows are inserted as plain mappings and committed every batch_size
+        rows, so no Recipe instances accumulate in the session. A failure
+        rolls back only the batch in progress.
+        """
+        return self.bulk_insert_recipe_rows([_recipe_row(data) for data in recipes_data], batch_size)
+    
+    def bulk_insert_recipe_rows(self, rows: Sequence[Dict[str, Any]],
+                                batch_size: int = BULK_INSERT_BATCH_SIZE) -> int:
+        """Insert column rows built by recipe_rows, returning the number created
+        
+        Lets callers with static data (e.g. the seed script) build the rows
+        once and reuse them; otherwise behaves like bulk_create_recipes.
+        """
+        created = 0
         try:
-            recipes = []
-            for recipe_data in recipes_data:
-                recipe = Recipe(
-                    name=recipe_data['name'],
-                    ingredients=recipe_data['ingredients'],
-                    instructions=recipe_data['instructions'],
-                    description=recipe_data.get('description'),
-                    cuisine_type=recipe_data.get('cuisine_type'),
-                    meal_type=recipe_data.get('meal_type'),
-                    prep_time_minutes=recipe_data.get('prep_time_minutes'),
-                    cook_time_minutes=recipe_data.get('cook_time_minutes'),
-                    nutritional_info=recipe_data.get('nutritional_info'),
-                    estimated_cost_usd=recipe_data.get('estimated_cost_usd'),
-                    difficulty_level=recipe_data.get('difficulty_level'),
-                    source_url=recipe_data.get('source_url'),
-                    image_url=recipe_data.get('image_url'),
-                    servings=recipe_data.get('servings', 1)
-                )
-                recipes.append(recipe)
-            
-            self.session.add_all(recipes)
+            for start in range(0, len(rows), batch_size):
+                batch = rows[start:start + batch_size]
+                self.session.bulk_insert_mappings(Recipe, batch)
+                self.session.commit()
+                _invalidate_statistics()
+                created += len(batch)
+            
+            logger.info(f"Created {created} recipes in bulk")
+            return created
+            
+        except Exception as e:
+            self.session.rollback()
+            logger.error(f"Error bulk creating recipes after {created} rows: {str(e)}")
+            raise ValidationError(f"Failed to bulk create recipes: {str(e)}")
+    
+    def bulk_copy_recipes(self, rows: List[Dict[str, Any]]) -> int:
+        """Insert many recipes with PostgreSQL COPY, returning the number of rows written
+        
+        Small batches and non-PostgreSQL databases go through bulk_create_recipes.
+        Rows are written directly, so no Recipe instances are returned.
+        """
+        if len(rows) < COPY_MIN_ROWS or self.session.get_bind().dialect.name != 'postgresql':
+            return self.bulk_create_recipes(rows)
+        
+        try:
+            now = datetime.utcnow()
+            records = (
+                {**_recipe_row(row), 'is_active': True, 'created_at': now, 'updated_at': now}
+                for row in rows
+            )
+            buffer = copy_csv_buffer(
+                [
+                    serialization.dumps(record[column]) if column in _COPY_JSON_COLUMNS
+                    else record[column]
+                    for column in _COPY_COLUMNS
+                ]
+                for record in records
+            )
+            
+            cursor = self.session.connection().connection.cursor()
+            try:
+                cursor.copy_expert(_COPY_SQL, buffer)
+            finally:
+                cursor.close()
             self.session.commit()
+            _invalidate_statistics()
             
-            logger.info(f"Created {len(recipes)} recipes in bulk")
-            return recipes
+            logger.info(f"Copied {len(rows)} recipes in bulk")
+            return len(rows)
             
         except Exception as e:
             self.session.rollback()
-            logger.error(f"Error bulk creating recipes: {str(e)}")
-            raise ValidationError(f"Failed to bulk create recipes: {str(e)}") 
\ No newline at end of file
+            logger.error(f"Error bulk copying recipes: {str(e)}")
+            raise ValidationError(f"Failed to bulk copy recipes: {str(e)}")
@@ -3,18 +3,132 @@ Grocery List Repository
 Data access layer for grocery lists and items
 """
 
+import copy
 import logging
-from typing import List, Optional, Dict, Any
+import threading
+import uuid
+from collections import OrderedDict
+from datetime import datetime
+from itertools import groupby
+from operator import attrgetter
+from typing import List, Optional, Dict, Any, Iterable, Tuple
+from sqlalchemy import (
+    Numeric, String, and_, bindparam, case, cast, delete, func, insert, literal_column, not_, select, update,
+)
+from sqlalchemy.dialects import postgresql, sqlite
 from sqlalchemy.exc import SQLAlchemyError
 
 from core.models.grocery_list import GroceryList, GroceryListItem
-from data_access.database import db
+from data_access.database import COPY_CSV_OPTIONS, copy_csv_buffer, db
 
 logger = logging.getLogger(__name__)
 
+# Columns update() may write on a list
+_LIST_UPDATABLE_COLUMNS = frozenset(attr.key for attr in GroceryList.__mapper__.column_attrs) - {'id'}
+
+# Item columns update_item and bulk_update_items may write; the primary key is the match key
+_ITEM_UPDATABLE_COLUMNS = frozenset(attr.key for attr in GroceryListItem.__mapper__.column_attrs) - {'id'}
+
+# Core UPDATE keyed on a bound id; the SET clause comes from each parameter
+# set's keys. Unlike ORM bulk UPDATE by primary key, ids that no longer
+# exist are skipped instead of failing the whole batch
+_ITEM_TABLE = GroceryListItem.__table__
+_BULK_ITEM_UPDATE = update(_ITEM_TABLE).where(_ITEM_TABLE.c.id == bindparam('item_pk'))
+
+# bulk_add_items switches from a batched INSERT to COPY at this many rows
+COPY_THRESHOLD = 100
+_ITEM_COPY_COLUMNS = (
+    'id', 'grocery_list_id', 'ingredient_name', 'category', 'quantity', 'unit',
+    'is_checked', 'is_custom', 'estimated_cost', 'created_at',
+)
+_ITEM_COPY_SQL = (
+    f"COPY grocery_list_items ({', '.join(_ITEM_COPY_COLUMNS)}) "
+    f"FROM STDIN WITH ({COPY_CSV_OPTIONS})"
+)
+
+# get_list_statistics results keyed by (list id, list version); item writes bump
+# the version, so stale entries are never hit and simply age out of the LRU
+LIST_STATISTICS_CACHE_SIZE = 1024
+_statistics_cache: 'OrderedDict[Tuple[str, int], Dict[str, Any]]' = OrderedDict()
+_statistics_cache_lock = threading.Lock()
+
+# Expressions of the ux_gli_list_ing_unit unique index, used as the upsert conflict target
+_ITEM_CONSOLIDATION_KEY = (
+    GroceryListItem.grocery_list_id,
+    func.lower(GroceryListItem.ingredient_name),
+    func.coalesce(GroceryListItem.unit, literal_column("''")),
+)
+
+# Dialect inserts that support ON CONFLICT DO UPDATE
+_UPSERT_INSERTS = {'postgresql': postgresql.insert, 'sqlite': sqlite.insert}
+
+def _is_plain_number(column: Any, dialect_name: str):
+    """Whether a quantity string is a bare number such as '2' or '1.5'"""
+    if dialect_name == 'postgresql':
+        return column.op('~')(r'^[0-9]+(\.[0-9]+)?$')
+    return and_(column != '', column.op('NOT GLOB', is_comparison=True)('*[^0-9.]*'))
+
+def _merged_quantity(existing: Any, added: Any, dialect_name: str):
+    """Sum two bare-number quantities, otherwise list both like the service's consolidation does"""
+    return case(
+        (
+            and_(_is_plain_number(existing, dialect_name), _is_plain_number(added, dialect_name)),
+            cast(cast(existing, Numeric) + cast(added, Numeric), String),
+        ),
+        else_=func.substr(existing + ', ' + added, 1, 100),
+    )
+
+def _as_uuid(value: Any) -> uuid.UUID:
+    """Coerce a UUID or its string form to uuid.UUID"""
+    return value if isinstance(value, uuid.UUID) else uuid.UUID(str(value))
+
+def _primary_key(value: Any) -> Optional[uuid.UUID]:
+    """Coerce an id for Session.get(), or None if it is not a valid UUID"""
+    try:
+        return _as_uuid(value)
+    except ValueError:
+        return None
+
+def _owned_list_ids(user_id: Any):
+    """Ids of a user's active lists, for scoping item statements to their owner"""
+    return select(GroceryList.id).where(GroceryList.user_id == user_id, GroceryList.is_active == True)
+
+def _item_row(item: GroceryListItem, created_at: datetime) -> Dict[str, Any]:
+    """Column values for inserting an unsaved item, applying model defaults"""
+    return {
+        'id': _as_uuid(item.id) if item.id else uuid.uuid4(),
+        'grocery_list_id': _as_uuid(item.grocery_list_id),
+        'ingredient_name': item.ingredient_name,
+        'category': item.category,
+        'quantity': item.quantity,
+        'unit': item.unit,
+        'is_checked': bool(item.is_checked),
+        'is_custom': bool(item.is_custom),
+        'estimated_cost': item.estimated_cost,
+        'created_at': item.created_at or created_at,
+    }
+
 class GroceryListRepository:
     """Repository for grocery list data access operations"""
     
+    def _item_conditions(self, item_id: str, user_id: Optional[str]) -> List[Any]:
+        """WHERE clauses matching one item, scoped to its owner when user_id is given"""
+        conditions = [GroceryListItem.id == item_id]
+        if user_id is not None:
+            conditions.append(GroceryListItem.grocery_list_id.in_(_owned_list_ids(user_id)))
+        return conditions
+    
+    def _bump_versions(self, list_ids: Iterable[Any]) -> None:
+        """Increment the version of each list whose items changed, in the caller's transaction"""
+        list_ids = {_as_uuid(list_id) for list_id in list_ids if list_id}
+        if list_ids:
+            db.session.execute(
+                update(GroceryList)
+                .where(GroceryList.id.in_(list_ids))
+                .values(version=GroceryList.version + 1)
+                .execution_options(synchronize_session=False)
+            )
+    
     def create(self, grocery_list: GroceryList) -> GroceryList:
         """
         Create a new grocery list
@@ -31,27 +145,38 @@ class GroceryListRepository:
         try:
             db.session.add(grocery_list)
             db.session.commit()
-            logger.info(f"Created grocery list {grocery_list.id} for user {grocery_list.user_id}")
+            logger.info("Created grocery list %s for user %s", grocery_list.id, grocery_list.user_id)
             return grocery_list
         except SQLAlchemyError as e:
             db.session.rollback()
-            logger.error(f"Failed to create grocery list: {e}")
+            logger.error("Failed to create grocery list: %s", e)
             raise
     
-    def get_by_id(self, list_id: str) -> Optional[GroceryList]:
+    def get_by_id(self, list_id: str, user_id: Optional[str] = None) -> Optional[GroceryList]:
         """
         Get a grocery list by ID
         
         Args:
             list_id: ID of the grocery list
+            user_id: Only match the list if this user owns it
             
         Returns:
             GroceryList object or None if not found
         """
+        primary_key = _primary_key(list_id)
+        if primary_key is None:
+            return None
+        
         try:
-            return db.session.query(GroceryList).filter_by(id=list_id, is_active=True).first()
+            # Session.get() answers repeat lookups from the identity map
+            grocery_list = db.session.get(GroceryList, primary_key)
+            if not grocery_list or not grocery_list.is_active:
+                return None
+            if user_id is not None and str(grocery_list.user_id) != str(user_id):
+                return None
+            return grocery_list
         except SQLAlchemyError as e:
-            logger.error(f"Failed to get grocery list {list_id}: {e}")
+            logger.error("Failed to get grocery list %s: %s", list_id, e)
             return None
     
     def get_by_user_id(self, user_id: str) -> List[GroceryList]:
@@ -69,7 +194,7 @@ class GroceryListRepository:
                 user_id=user_id, is_active=True
             ).order_by(GroceryList.created_at.desc()).all()
         except SQLAlchemyError as e:
-            logger.error(f"Failed to get grocery lists for user {user_id}: {e}")
+            logger.error("Failed to get grocery lists for user %s: %s", user_id, e)
             return []
     
     def get_by_meal_plan_id(self, meal_plan_id: str) -> List[GroceryList]:
@@ -87,59 +212,76 @@ class GroceryListRepository:
                 meal_plan_id=meal_plan_id, is_active=True
             ).order_by(GroceryList.created_at.desc()).all()
         except SQLAlchemyError as e:
-            logger.error(f"Failed to get grocery lists for meal plan {meal_plan_id}: {e}")
+            logger.error("Failed to get grocery lists for meal plan %s: %s", meal_plan_id, e)
             return []
     
-    def update(self, list_id: str, updates: Dict[str, Any]) -> Optional[GroceryList]:
+    def update(self, list_id: str, updates: Dict[str, Any],
+               user_id: Optional[str] = None) -> Optional[GroceryList]:
         """
         Update a grocery list
         
         Args:
             list_id: ID of the grocery list
             updates: Dictionary of fields to update
+            user_id: Only update the list if this user owns it
             
         Returns:
             Updated GroceryList object or None if not found
         """
         try:
-            grocery_list = self.get_by_id(list_id)
+            values = {key: value for key, value in updates.items() if key in _LIST_UPDATABLE_COLUMNS}
+            if not values:
+                return self.get_by_id(list_id, user_id=user_id)
+            
+            conditions = [GroceryList.id == list_id, GroceryList.is_active == True]
+            if user_id is not None:
+                conditions.append(GroceryList.user_id == user_id)
+            grocery_list = db.session.execute(
+                update(GroceryList)
+                .where(*conditions)
+                .values(**values)
+                .returning(GroceryList)
+            ).scalar_one_or_none()
             if not grocery_list:
+                db.session.rollback()
                 return None
             
-            for key, value in updates.items():
-                if hasattr(grocery_list, key):
-                    setattr(grocery_list, key, value)
-            
             db.session.commit()
-            logger.info(f"Updated grocery list {list_id}")
+            logger.info("Updated grocery list %s", list_id)
             return grocery_list
         except SQLAlchemyError as e:
             db.session.rollback()
-            logger.error(f"Failed to update grocery list {list_id}: {e}")
+            logger.error("Failed to update grocery list %s: %s", list_id, e)
             return None
     
-    def delete(self, list_id: str) -> bool:
+    def delete(self, list_id: str, user_id: Optional[str] = None) -> bool:
         """
         Soft delete a grocery list (mark as inactive)
         
         Args:
             list_id: ID of the grocery list to delete
+            user_id: Only delete the list if this user owns it
             
         Returns:
             True if successful, False otherwise
         """
         try:
-            grocery_list = self.get_by_id(list_id)
-            if not grocery_list:
-                return False
-            
-            grocery_list.is_active = False
+            conditions = [GroceryList.id == list_id, GroceryList.is_active == True]
+            if user_id is not None:
+                conditions.append(GroceryList.user_id == user_id)
+            result = db.session.execute(
+                update(GroceryList)
+                .where(*conditions)
+                .values(is_active=False)
+            )
             db.session.commit()
-            logger.info(f"Soft deleted grocery list {list_id}")
+            if result.rowcount != 1:
+                return False
+            logger.info("Soft deleted grocery list %s", list_id)
             return True
         except SQLAlchemyError as e:
             db.session.rollback()
-            logger.error(f"Failed to delete grocery list {list_id}: {e}")
+            logger.error("Failed to delete grocery list %s: %s", list_id, e)
             return False
     
     # Grocery List Item Operations
@@ -159,28 +301,127 @@ class GroceryListRepository:
         """
         try:
             db.session.add(item)
+            self._bump_versions([item.grocery_list_id])
             db.session.commit()
-            logger.info(f"Added item {item.id} to grocery list {item.grocery_list_id}")
+            logger.info("Added item %s to grocery list %s", item.id, item.grocery_list_id)
             return item
         except SQLAlchemyError as e:
             db.session.rollback()
-            logger.error(f"Failed to add item to grocery list: {e}")
+            logger.error("Failed to add item to grocery list: %s", e)
+            raise
+    
+    def bulk_add_items(self, items: List[GroceryListItem]) -> int:
+        """
+        Add many items to grocery lists in one round-trip
+        
+        Uses PostgreSQL COPY for COPY_THRESHOLD or more items and a single
+        batched INSERT otherwise. Items are not attached to the session;
+        their ids are filled in.
+        
+        Args:
+            items: Unsaved GroceryListItem objects
+            
+        Returns:
+            Number of items inserted
+            
+        Raises:
+            Exception: If the insert fails
+        """
+        if not items:
+            return 0
+        
+        now = datetime.utcnow()
+        rows = [_item_row(item, now) for item in items]
+        try:
+            if len(rows) >= COPY_THRESHOLD and db.session.get_bind().dialect.name == 'postgresql':
+                buffer = copy_csv_buffer([row[column] for column in _ITEM_COPY_COLUMNS] for row in rows)
+                cursor = db.session.connection().connection.cursor()
+                try:
+                    cursor.copy_expert(_ITEM_COPY_SQL, buffer)
+                finally:
+                    cursor.close()
+            else:
+                db.session.execute(insert(GroceryListItem), rows)
+            self._bump_versions({row['grocery_list_id'] for row in rows})
+            db.session.commit()
+        except Exception as e:
+            # COPY raises driver errors that SQLAlchemy does not wrap
+            db.session.rollback()
+            logger.error("Failed to bulk add grocery list items: %s", e)
+            raise
+        
+        for item, row in zip(items, rows):
+            item.id = row['id']
+        logger.info("Bulk added %s items to grocery lists", len(rows))
+        return len(rows)
+    
+    def upsert_item(self, item: GroceryListItem) -> GroceryListItem:
+        """
+        Add an item, merging it into an existing row for the same ingredient and unit
+        
+        The merge happens in a single INSERT ... ON CONFLICT DO UPDATE: bare
+        number quantities are summed, anything else is listed, and estimated
+        costs are added. Dialects without ON CONFLICT fall back to add_item.
+        
+        Args:
+            item: Unsaved GroceryListItem object
+            
+        Returns:
+            The inserted or merged GroceryListItem object
+            
+        Raises:
+            SQLAlchemyError: If database operation fails
+        """
+        dialect_name = db.session.get_bind().dialect.name
+        upsert_insert = _UPSERT_INSERTS.get(dialect_name)
+        if upsert_insert is None:
+            return self.add_item(item)
+        
+        try:
+            stmt = upsert_insert(GroceryListItem).values(**_item_row(item, datetime.utcnow()))
+            stmt = stmt.on_conflict_do_update(
+                index_elements=list(_ITEM_CONSOLIDATION_KEY),
+                set_={
+                    'quantity': _merged_quantity(GroceryListItem.quantity, stmt.excluded.quantity, dialect_name),
+                    'estimated_cost': (
+                        func.coalesce(GroceryListItem.estimated_cost, 0)
+                        + func.coalesce(stmt.excluded.estimated_cost, 0)
+                    ),
+                },
+            ).returning(GroceryListItem)
+            merged = db.session.execute(stmt).scalar_one()
+            
+            self._bump_versions([merged.grocery_list_id])
+            db.session.commit()
+            logger.info("Upserted item %s on grocery list %s", merged.id, merged.grocery_list_id)
+            return merged
+        except SQLAlchemyError as e:
+            db.session.rollback()
+            logger.error("Failed to upsert item on grocery list: %s", e)
             raise
     
-    def get_item_by_id(self, item_id: str) -> Optional[GroceryListItem]:
+    def get_item_by_id(self, item_id: str, user_id: Optional[str] = None) -> Optional[GroceryListItem]:
         """
         Get a grocery list item by ID
         
         Args:
             item_id: ID of the grocery list item
+            user_id: Only match the item if it is on an active list this user owns
             
         Returns:
             GroceryListItem object or None if not found
         """
         try:
-            return db.session.query(GroceryListItem).filter_by(id=item_id).first()
+            if user_id is None:
+                primary_key = _primary_key(item_id)
+                return db.session.get(GroceryListItem, primary_key) if primary_key else None
+            
+            return db.session.query(GroceryListItem).filter(
+                GroceryListItem.id == item_id,
+                GroceryListItem.grocery_list_id.in_(_owned_list_ids(user_id)),
+            ).first()
         except SQLAlchemyError as e:
-            logger.error(f"Failed to get grocery list item {item_id}: {e}")
+            logger.error("Failed to get grocery list item %s: %s", item_id, e)
             return None
     
     def get_items_by_list_id(self, list_id: str) -> List[GroceryListItem]:
@@ -198,9 +439,30 @@ class GroceryListRepository:
                 grocery_list_id=list_id
             ).order_by(GroceryListItem.category, GroceryListItem.ingredient_name).all()
         except SQLAlchemyError as e:
-            logger.error(f"Failed to get items for grocery list {list_id}: {e}")
+            logger.error("Failed to get items for grocery list %s: %s", list_id, e)
             return []
     
+    def get_items_grouped_by_category(self, list_id: str) -> Dict[str, List[GroceryListItem]]:
+        """
+        Get a grocery list's items grouped by category
+        
+        Rows arrive in (category, ingredient_name) order from the
+        idx_gli_list_cat_name index, so groups are split on category changes
+        without any sorting in Python
+        
+        Args:
+            list_id: ID of the grocery list
+            
+        Returns:
+            Dictionary mapping category ('other' for uncategorized items) to
+            its items ordered by name
+        """
+        grouped: Dict[str, List[GroceryListItem]] = {}
+        for category, items in groupby(self.get_items_by_list_id(list_id), key=attrgetter('category')):
+            # Uncategorized items share the 'other' group with items filed under it
+            grouped.setdefault(category or 'other', []).extend(items)
+        return grouped
+    
     def get_items_by_category(self, list_id: str, category: str) -> List[GroceryListItem]:
         """
         Get all items in a specific category for a grocery list
@@ -217,103 +479,193 @@ class GroceryListRepository:
                 grocery_list_id=list_id, category=category
             ).order_by(GroceryListItem.ingredient_name).all()
         except SQLAlchemyError as e:
-            logger.error(f"Failed to get items by category for grocery list {list_id}: {e}")
+            logger.error("Failed to get items by category for grocery list %s: %s", list_id, e)
             return []
     
-    def update_item(self, item_id: str, updates: Dict[str, Any]) -> Optional[GroceryListItem]:
+    def update_item(self, item_id: str, updates: Dict[str, Any],
+                    user_id: Optional[str] = None) -> Optional[GroceryListItem]:
         """
         Update a grocery list item
         
         Args:
             item_id: ID of the grocery list item
             updates: Dictionary of fields to update
+            user_id: Only update the item if it is on an active list this user owns
             
         Returns:
             Updated GroceryListItem object or None if not found
         """
         try:
-            item = self.get_item_by_id(item_id)
+            values = {key: value for key, value in updates.items() if key in _ITEM_UPDATABLE_COLUMNS}
+            if not values:
+                return self.get_item_by_id(item_id, user_id=user_id)
+            
+            item = db.session.execute(
+                update(GroceryListItem)
+                .where(*self._item_conditions(item_id, user_id))
+                .values(**values)
+                .returning(GroceryListItem)
+            ).scalar_one_or_none()
             if not item:
+                db.session.rollback()
                 return None
             
-            for key, value in updates.items():
-                if hasattr(item, key):
-                    setattr(item, key, value)
-            
+            self._bump_versions([item.grocery_list_id])
             db.session.commit()
-            logger.info(f"Updated grocery list item {item_id}")
+            logger.info("Updated grocery list item %s", item_id)
             return item
         except SQLAlchemyError as e:
             db.session.rollback()
-            logger.error(f"Failed to update grocery list item {item_id}: {e}")
+            logger.error("Failed to update grocery list item %s: %s", item_id, e)
             return None
     
-    def toggle_item_checked(self, item_id: str) -> Optional[GroceryListItem]:
+    def toggle_item_checked(self, item_id: str, user_id: Optional[str] = None) -> Optional[GroceryListItem]:
         """
         Toggle the checked status of a grocery list item
         
         Args:
             item_id: ID of the grocery list item
+            user_id: Only toggle the item if it is on an active list this user owns
             
         Returns:
             Updated GroceryListItem object or None if not found
         """
         try:
-            item = self.get_item_by_id(item_id)
+            # Flip in SQL so concurrent toggles cannot lose an update
+            item = db.session.execute(
+                update(GroceryListItem)
+                .where(*self._item_conditions(item_id, user_id))
+                .values(is_checked=not_(func.coalesce(GroceryListItem.is_checked, False)))
+                .returning(GroceryListItem)
+            ).scalar_one_or_none()
             if not item:
+                db.session.rollback()
                 return None
             
-            item.is_checked = not item.is_checked
+            self._bump_versions([item.grocery_list_id])
             db.session.commit()
-            logger.info(f"Toggled checked status for item {item_id} to {item.is_checked}")
+            logger.info("Toggled checked status for item %s to %s", item_id, item.is_checked)
             return item
         except SQLAlchemyError as e:
             db.session.rollback()
-            logger.error(f"Failed to toggle item checked status {item_id}: {e}")
+            logger.error("Failed to toggle item checked status %s: %s", item_id, e)
             return None
     
-    def delete_item(self, item_id: str) -> bool:
+    def delete_item(self, item_id: str, user_id: Optional[str] = None) -> Optional[uuid.UUID]:
         """
         Delete a grocery list item
         
         Args:
             item_id: ID of the grocery list item to delete
+            user_id: Only delete the item if it is on an active list this user owns
             
         Returns:
-            True if successful, False otherwise
+            ID of the grocery list the item belonged to, or None if nothing was deleted
         """
         try:
-            item = self.get_item_by_id(item_id)
-            if not item:
-                return False
+            list_id = db.session.execute(
+                delete(GroceryListItem)
+                .where(*self._item_conditions(item_id, user_id))
+                .returning(GroceryListItem.grocery_list_id)
+            ).scalar_one_or_none()
+            if list_id is None:
+                db.session.rollback()
+                return None
             
-            db.session.delete(item)
+            self._bump_versions([list_id])
             db.session.commit()
-            logger.info(f"Deleted grocery list item {item_id}")
-            return True
+            logger.info("Deleted grocery list item %s", item_id)
+            return list_id
         except SQLAlchemyError as e:
             db.session.rollback()
-            logger.error(f"Failed to delete grocery list item {item_id}: {e}")
-            return False
+            logger.error("Failed to delete grocery list item %s: %s", item_id, e)
+            return None
     
-    def get_checked_items_count(self, list_id: str) -> int:
+    def get_checked_counts(self, list_id: str) -> Tuple[int, int]:
         """
-        Get count of checked items in a grocery list
+        Get checked and unchecked item counts in one query
         
         Args:
             list_id: ID of the grocery list
             
         Returns:
-            Number of checked items
+            Tuple of (checked, unchecked) counts
         """
         try:
-            return db.session.query(GroceryListItem).filter_by(
-                grocery_list_id=list_id, is_checked=True
-            ).count()
+            checked, unchecked = db.session.execute(
+                select(
+                    func.count().filter(GroceryListItem.is_checked == True),
+                    func.count().filter(GroceryListItem.is_checked == False),
+                ).where(GroceryListItem.grocery_list_id == list_id)
+            ).one()
+            return checked, unchecked
         except SQLAlchemyError as e:
-            logger.error(f"Failed to get checked items count for list {list_id}: {e}")
+            logger.error("Failed to get checked counts for list %s: %s", list_id, e)
+            return 0, 0
+    
+    def get_items_total_cost(self, list_id: str) -> int:
+        """
+        Get the summed estimated cost of a grocery list's items
+        
+        Args:
+            list_id: ID of the grocery list
+            
+        Returns:
+            Total estimated cost in cents
+        """
+        try:
+            return db.session.execute(
+                select(func.coalesce(func.sum(GroceryListItem.estimated_cost), 0))
+                .where(GroceryListItem.grocery_list_id == list_id)
+            ).scalar_one()
+        except SQLAlchemyError as e:
+            logger.error("Failed to get total cost for list %s: %s", list_id, e)
             return 0
     
+    def get_counts_for_lists(self, list_ids: List[Any]) -> Dict[str, Tuple[int, int]]:
+        """
+        Get checked and unchecked item counts for several lists in one query
+        
+        Args:
+            list_ids: IDs of the grocery lists
+            
+        Returns:
+            Dictionary mapping each list ID (as a string) to (checked, unchecked);
+            lists without items map to (0, 0)
+        """
+        counts = {str(list_id): (0, 0) for list_id in list_ids}
+        if not counts:
+            return counts
+        
+        try:
+            rows = db.session.execute(
+                select(
+                    GroceryListItem.grocery_list_id,
+                    func.count().filter(GroceryListItem.is_checked == True),
+                    func.count().filter(GroceryListItem.is_checked.isnot(True)),
+                )
+                .where(GroceryListItem.grocery_list_id.in_(list_ids))
+                .group_by(GroceryListItem.grocery_list_id)
+            ).all()
+            for list_id, checked, unchecked in rows:
+                counts[str(list_id)] = (checked, unchecked)
+            return counts
+        except SQLAlchemyError as e:
+            logger.error("Failed to get checked counts for %s lists: %s", len(list_ids), e)
+            return counts
+    
+    def get_checked_items_count(self, list_id: str) -> int:
+        """
+        Get count of checked items in a grocery list
+        
+        Args:
+            list_id: ID of the grocery list
+            
+        Returns:
+            Number of checked items
+        """
+        return self.get_checked_counts(list_id)[0]
+    
     def get_unchecked_items_count(self, list_id: str) -> int:
         """
         Get count of unchecked items in a grocery list
@@ -324,13 +676,7 @@ class GroceryListRepository:
         Returns:
             Number of unchecked items
         """
-        try:
-            return db.session.query(GroceryListItem).filter_by(
-                grocery_list_id=list_id, is_checked=False
-            ).count()
-        except SQLAlchemyError as e:
-            logger.error(f"Failed to get unchecked items count for list {list_id}: {e}")
-            return 0
+        return self.get_checked_counts(list_id)[1]
     
     def get_items_by_custom_status(self, list_id: str, is_custom: bool) -> List[GroceryListItem]:
         """
@@ -348,13 +694,16 @@ class GroceryListRepository:
                 grocery_list_id=list_id, is_custom=is_custom
             ).order_by(GroceryListItem.ingredient_name).all()
         except SQLAlchemyError as e:
-            logger.error(f"Failed to get custom items for list {list_id}: {e}")
+            logger.error("Failed to get custom items for list %s: %s", list_id, e)
             return []
     
     def get_list_statistics(self, list_id: str) -> Dict[str, Any]:
         """
         Get comprehensive statistics for a grocery list
         
+        Results are cached per list version, so repeat calls for an unchanged
+        list cost a single primary key lookup
+        
         Args:
             list_id: ID of the grocery list
             
@@ -362,25 +711,39 @@ class GroceryListRepository:
             Dictionary with list statistics
         """
         try:
-            items = self.get_items_by_list_id(list_id)
-            
-            total_items = len(items)
-            checked_items = len([item for item in items if item.is_checked])
+            version = db.session.execute(
+                select(GroceryList.version).where(GroceryList.id == list_id)
+            ).scalar_one_or_none()
+            cache_key = (str(list_id), version)
+            if version is not None:
+                with _statistics_cache_lock:
+                    cached = _statistics_cache.get(cache_key)
+                    if cached is not None:
+                        _statistics_cache.move_to_end(cache_key)
+                        return copy.deepcopy(cached)
+            
+            total_items, checked_items, custom_items, total_cost = db.session.execute(
+                select(
+                    func.count(),
+                    func.count().filter(GroceryListItem.is_checked == True),
+                    func.count().filter(GroceryListItem.is_custom == True),
+                    func.coalesce(func.sum(GroceryListItem.estimated_cost), 0),
+                ).where(GroceryListItem.grocery_list_id == list_id)
+            ).one()
             unchecked_items = total_items - checked_items
-            custom_items = len([item for item in items if item.is_custom])
             recipe_items = total_items - custom_items
             
             # Group by category
-            categories = {}
-            for item in items:
-                category = item.category or 'other'
-                if category not in categories:
-                    categories[category] = 0
-                categories[category] += 1
-            
-            total_cost = sum(item.estimated_cost or 0 for item in items)
-            
-            return {
+            category = func.coalesce(GroceryListItem.category, 'other')
+            categories = dict(
+                db.session.execute(
+                    select(category, func.count())
+                    .where(GroceryListItem.grocery_list_id == list_id)
+                    .group_by(category)
+                ).all()
+            )
+            
+            stats = {
                 'total_items': total_items,
                 'checked_items': checked_items,
                 'unchecked_items': unchecked_items,
@@ -391,8 +754,15 @@ class GroceryListRepository:
                 'total_estimated_cost_cents': total_cost,
                 'total_estimated_cost_usd': total_cost / 100.0 if total_cost else 0
             }
+            
+            if version is not None:
+                with _statistics_cache_lock:
+                    _statistics_cache[cache_key] = stats
+                    if len(_statistics_cache) > LIST_STATISTICS_CACHE_SIZE:
+                        _statistics_cache.popitem(last=False)
+            return copy.deepcopy(stats)
         except SQLAlchemyError as e:
-            logger.error(f"Failed to get statistics for list {list_id}: {e}")
+            logger.error("Failed to get statistics for list %s: %s", list_id, e)
             return {}
     
     def bulk_update_items(self, item_updates: List[Dict[str, Any]]) -> bool:
@@ -406,21 +776,43 @@ class GroceryListRepository:
             True if successful, False otherwise
         """
         try:
+            # Group rows by the set of columns they change; each group is one
+            # executemany UPDATE keyed on the primary key
+            batches: Dict[frozenset, List[Dict[str, Any]]] = {}
             for update_data in item_updates:
                 item_id = update_data.get('item_id')
                 updates = update_data.get('updates', {})
+                if not item_id or not updates:
+                    continue
                 
-                if item_id and updates:
-                    item = self.get_item_by_id(item_id)
-                    if item:
-                        for key, value in updates.items():
-                            if hasattr(item, key):
-                                setattr(item, key, value)
+                values = {key: value for key, value in updates.items() if key in _ITEM_UPDATABLE_COLUMNS}
+                if not values:
+                    continue
+                try:
+                    values['item_pk'] = item_id if isinstance(item_id, uuid.UUID) else uuid.UUID(str(item_id))
+                except ValueError:
+                    logger.warning("Skipping bulk update for invalid item id %s", item_id)
+                    continue
+                batches.setdefault(frozenset(values), []).append(values)
+            
+            for mappings in batches.values():
+                db.session.execute(_BULK_ITEM_UPDATE, mappings)
+            
+            item_ids = {mapping['item_pk'] for mappings in batches.values() for mapping in mappings}
+            if item_ids:
+                db.session.execute(
+                    update(GroceryList)
+                    .where(GroceryList.id.in_(
+                        select(GroceryListItem.grocery_list_id).where(GroceryListItem.id.in_(item_ids))
+                    ))
+                    .values(version=GroceryList.version + 1)
+                    .execution_options(synchronize_session=False)
+                )
             
             db.session.commit()
-            logger.info(f"Bulk updated {len(item_updates)} grocery list items")
+            logger.info("Bulk updated %s grocery list items", len(item_updates))
             return True
         except SQLAlchemyError as e:
             db.session.rollback()
-            logger.error(f"Failed to bulk update items: {e}")
-            return False 
\ No newline at end of file
+            logger.error("Failed to bulk update items: %s", e)
+            return False
@@ -5,40 +5,84 @@ Data access layer for MealPlan model operations
 
 import logging
 from datetime import date, datetime, timedelta
-from typing import Optional, List, Dict, Any
-from sqlalchemy.orm import Session
-from sqlalchemy import and_, desc
+from typing import Optional, List, Dict, Any, Tuple, TypedDict
+from sqlalchemy import Text, and_, bindparam, cast, desc, func, select, text, tuple_, update
 
 from core.models.meal_plan import MealPlan
 from core.exceptions import ValidationError
-from data_access.database import db
+from data_access.meal_plan_repository import (
+    MEAL_PLAN_STREAM_BATCH_SIZE, _END_DATE_SOURCE_COLUMNS, _MEAL_PLAN_UPDATABLE_COLUMNS,
+    _MealPlanRepositoryBase, cache_read, forget_memoized_plan, get_cached_read, DailyNutrition,
+    MacroNutrients, get_memoized_plan, memoize_plan, read_cache_key,
+)
 
 logger = logging.getLogger(__name__)
 
-class MealPlanRepository:
+# PostgreSQL aggregation for get_popular_recipes; user_filter is either empty
+# or a fixed "AND user_id = :user_id" clause, never user input. The plan count
+# for popularity_score is a single scalar subquery over the same plans.
+_POPULAR_RECIPES_SQL = """
+    SELECT meal->>'recipe_id' AS recipe_id,
+           count(*) AS usage_count,
+           count(*)::float / (
+               SELECT count(*) FROM meal_plans WHERE is_active = true {user_filter}
+           ) AS popularity_score
+    FROM meal_plans CROSS JOIN LATERAL json_array_elements(meals) AS meal
+    WHERE is_active = true {user_filter}
+      AND coalesce(meal->>'recipe_id', '') <> ''
+    GROUP BY 1
+    ORDER BY usage_count DESC, recipe_id COLLATE "C"
+    LIMIT :limit
+"""
+
+# Serialized forms of an empty JSON value; get_nutrition_trends skips these like falsy summaries
+_EMPTY_JSON_TEXTS = ('{}', 'null')
+
+# Result shapes of the aggregate reads; plain dicts for the read cache and API
+class DateRange(TypedDict):
+    start: str  # ISO date
+    end: str
+
+class NutritionTrends(TypedDict):
+    daily_nutrition: List[DailyNutrition]
+    averages: MacroNutrients
+    total_days: int
+    date_range: DateRange
+
+class MealPlanStatistics(TypedDict):
+    total_meal_plans: int
+    total_cost_usd: int  # sum of estimated_total_cost_usd
+    average_cost_per_plan: float
+    budget_compliance_percentage: float
+    average_calories_per_plan: float
+    average_user_rating: float
+    total_rated_plans: int
+
+class MealPlanRepository(_MealPlanRepositoryBase):
     """Repository for MealPlan data access operations"""
     
-    def __init__(self, session: Optional[Session] = None):
-        """Initialize repository with optional session"""
-        self.session = session or db.session
-    
     def create_meal_plan(self, meal_plan: MealPlan) -> MealPlan:
         """Create a new meal plan"""
         try:
-            self.session.add(meal_plan)
-            self.session.commit()
-            
-            logger.info(f"Meal plan created successfully: {meal_plan.id}")
-            return meal_plan
+            with self._savepoint():
+                self.session.add(meal_plan)
+                self._commit(meal_plan.user_id)
+                
+                logger.info("Meal plan created successfully: %s", meal_plan.id)
+                return meal_plan
             
         except Exception as e:
-            self.session.rollback()
-            logger.error(f"Error creating meal plan: {str(e)}")
+            self._rollback()
+            logger.error("Error creating meal plan: %s", e)
             raise ValidationError(f"Failed to create meal plan: {str(e)}")
     
     def get_by_id(self, plan_id: str, user_id: Optional[str] = None) -> Optional[MealPlan]:
         """Get meal plan by ID, optionally filtered by user"""
         try:
+            meal_plan = get_memoized_plan(plan_id, user_id)
+            if meal_plan is not None:
+                return meal_plan
+            
             query = self.session.query(MealPlan).filter(
                 and_(MealPlan.id == plan_id, MealPlan.is_active == True)
             )
@@ -49,14 +93,15 @@ class MealPlanRepository:
             meal_plan = query.first()
             
             if meal_plan:
-                logger.debug(f"Meal plan found: {plan_id}")
+                memoize_plan(plan_id, user_id, meal_plan)
+                logger.debug("Meal plan found: %s", plan_id)
             else:
-                logger.debug(f"Meal plan not found: {plan_id}")
+                logger.debug("Meal plan not found: %s", plan_id)
             
             return meal_plan
             
         except Exception as e:
-            logger.error(f"Error getting meal plan {plan_id}: {str(e)}")
+            logger.error("Error getting meal plan %s: %s", plan_id, e)
             raise ValidationError(f"Failed to get meal plan: {str(e)}")
     
     def get_meal_plan_by_id(self, plan_id: str, user_id: Optional[str] = None) -> Optional[MealPlan]:
@@ -64,29 +109,36 @@ class MealPlanRepository:
         return self.get_by_id(plan_id, user_id)
     
     def get_user_meal_plans(self, user_id: str, limit: Optional[int] = None, 
-                           offset: Optional[int] = None, include_inactive: bool = False) -> List[MealPlan]:
-        """Get all meal plans for a user"""
+                           offset: Optional[int] = None, include_inactive: bool = False,
+                           cursor: Optional[Tuple[datetime, Any]] = None) -> List[MealPlan]:
+        """Get all meal plans for a user
+        
+        Pass cursor=(created_at, id) of the last plan on the previous page to
+        fetch the next page by keyset instead of skipping offset rows.
+        """
         try:
             query = self.session.query(MealPlan).filter(MealPlan.user_id == user_id)
             
             if not include_inactive:
                 query = query.filter(MealPlan.is_active == True)
             
-            # Order by creation date (newest first)
-            query = query.order_by(desc(MealPlan.created_at))
+            # Order by creation date (newest first); id breaks ties so the keyset is unique
+            query = query.order_by(desc(MealPlan.created_at), desc(MealPlan.id))
             
-            if offset:
+            if cursor:
+                query = query.filter(tuple_(MealPlan.created_at, MealPlan.id) < tuple_(*cursor))
+            elif offset:
                 query = query.offset(offset)
             
             if limit:
                 query = query.limit(limit)
             
             meal_plans = query.all()
-            logger.debug(f"Found {len(meal_plans)} meal plans for user: {user_id}")
+            logger.debug("Found %s meal plans for user: %s", len(meal_plans), user_id)
             return meal_plans
             
         except Exception as e:
-            logger.error(f"Error getting meal plans for user {user_id}: {str(e)}")
+            logger.error("Error getting meal plans for user %s: %s", user_id, e)
             raise ValidationError(f"Failed to get meal plans: {str(e)}")
     
     def get_meal_plans_by_date_range(self, user_id: str, start_date: date, 
@@ -102,11 +154,11 @@ class MealPlanRepository:
                 )
             ).order_by(MealPlan.plan_date).all()
             
-            logger.debug(f"Found {len(meal_plans)} meal plans for user {user_id} between {start_date} and {end_date}")
+            logger.debug("Found %s meal plans for user %s between %s and %s", len(meal_plans), user_id, start_date, end_date)
             return meal_plans
             
         except Exception as e:
-            logger.error(f"Error getting meal plans by date range: {str(e)}")
+            logger.error("Error getting meal plans by date range: %s", e)
             raise ValidationError(f"Failed to get meal plans: {str(e)}")
     
     def get_current_meal_plan(self, user_id: str, target_date: Optional[date] = None) -> Optional[MealPlan]:
@@ -115,24 +167,23 @@ class MealPlanRepository:
             target_date = date.today()
         
         try:
+            # Newest active plan whose [plan_date, end_date] window covers the target date
             meal_plan = self.session.query(MealPlan).filter(
-                and_(
-                    MealPlan.user_id == user_id,
-                    MealPlan.plan_date <= target_date,
-                    MealPlan.is_active == True
-                )
+                MealPlan.user_id == user_id,
+                MealPlan.is_active == True,
+                MealPlan.plan_date <= target_date,
+                MealPlan.end_date >= target_date
             ).order_by(desc(MealPlan.plan_date)).first()
             
-            # Check if the meal plan covers the target date
-            if meal_plan and target_date <= meal_plan.end_date:
-                logger.debug(f"Current meal plan found for user {user_id}: {meal_plan.id}")
+            if meal_plan:
+                logger.debug("Current meal plan found for user %s: %s", user_id, meal_plan.id)
                 return meal_plan
             
-            logger.debug(f"No current meal plan found for user {user_id} on {target_date}")
+            logger.debug("No current meal plan found for user %s on %s", user_id, target_date)
             return None
             
         except Exception as e:
-            logger.error(f"Error getting current meal plan for user {user_id}: {str(e)}")
+            logger.error("Error getting current meal plan for user %s: %s", user_id, e)
             raise ValidationError(f"Failed to get current meal plan: {str(e)}")
     
     def get_recent_meal_plans(self, user_id: str, days: int = 30) -> List[MealPlan]:
@@ -148,222 +199,285 @@ class MealPlanRepository:
                 )
             ).order_by(desc(MealPlan.plan_date)).all()
             
-            logger.debug(f"Found {len(meal_plans)} recent meal plans for user {user_id}")
+            logger.debug("Found %s recent meal plans for user %s", len(meal_plans), user_id)
             return meal_plans
             
         except Exception as e:
-            logger.error(f"Error getting recent meal plans for user {user_id}: {str(e)}")
+            logger.error("Error getting recent meal plans for user %s: %s", user_id, e)
             raise ValidationError(f"Failed to get recent meal plans: {str(e)}")
     
     def update_meal_plan(self, plan_id: str, user_id: str, update_data: Dict[str, Any]) -> MealPlan:
         """Update an existing meal plan"""
         try:
-            meal_plan = self.get_meal_plan_by_id(plan_id, user_id)
-            if not meal_plan:
-                raise ValidationError(f"Meal plan not found: {plan_id}")
-            
-            # Update fields
-            for field, value in update_data.items():
-                if hasattr(meal_plan, field):
-                    setattr(meal_plan, field, value)
-            
-            meal_plan.updated_at = datetime.utcnow()
-            self.session.commit()
-            
-            logger.info(f"Meal plan updated successfully: {plan_id}")
-            return meal_plan
+            with self._savepoint():
+                values = {field: value for field, value in update_data.items() if field in _MEAL_PLAN_UPDATABLE_COLUMNS}
+                
+                if values.keys() & _END_DATE_SOURCE_COLUMNS:
+                    # end_date is derived by the model, so date changes go through the ORM
+                    meal_plan = self._load_for_mutation(plan_id, user_id)
+                    if not meal_plan:
+                        raise ValidationError(f"Meal plan not found: {plan_id}")
+                    for field, value in values.items():
+                        setattr(meal_plan, field, value)
+                    meal_plan.updated_at = datetime.utcnow()
+                else:
+                    # Single UPDATE ... RETURNING instead of a SELECT followed by an UPDATE
+                    meal_plan = self.session.execute(
+                        update(MealPlan)
+                        .where(MealPlan.id == plan_id, MealPlan.user_id == user_id, MealPlan.is_active == True)
+                        .values(**values, updated_at=datetime.utcnow())
+                        .returning(MealPlan)
+                    ).scalar_one_or_none()
+                    if not meal_plan:
+                        raise ValidationError(f"Meal plan not found: {plan_id}")
+                
+                forget_memoized_plan(plan_id)
+                self._commit(user_id)
+                
+                logger.info("Meal plan updated successfully: %s", plan_id)
+                return meal_plan
             
         except Exception as e:
-            self.session.rollback()
-            logger.error(f"Error updating meal plan {plan_id}: {str(e)}")
+            self._rollback()
+            logger.error("Error updating meal plan %s: %s", plan_id, e)
             raise ValidationError(f"Failed to update meal plan: {str(e)}")
     
     def add_user_feedback(self, plan_id: str, user_id: str, rating: int, 
                          feedback: Optional[str] = None) -> MealPlan:
         """Add user feedback to a meal plan"""
         try:
-            meal_plan = self.get_meal_plan_by_id(plan_id, user_id)
-            if not meal_plan:
-                raise ValidationError(f"Meal plan not found: {plan_id}")
-            
-            meal_plan.add_user_feedback(rating, feedback)
-            self.session.commit()
-            
-            logger.info(f"User feedback added to meal plan {plan_id}: rating={rating}")
-            return meal_plan
+            with self._savepoint():
+                meal_plan = self._load_for_mutation(plan_id, user_id)
+                if not meal_plan:
+                    raise ValidationError(f"Meal plan not found: {plan_id}")
+                
+                meal_plan.add_user_feedback(rating, feedback)
+                forget_memoized_plan(plan_id)
+                self._commit(user_id)
+                
+                logger.info("User feedback added to meal plan %s: rating=%s", plan_id, rating)
+                return meal_plan
             
         except Exception as e:
-            self.session.rollback()
-            logger.error(f"Error adding feedback to meal plan {plan_id}: {str(e)}")
+            self._rollback()
+            logger.error("Error adding feedback to meal plan %s: %s", plan_id, e)
             raise ValidationError(f"Failed to add feedback: {str(e)}")
     
     def delete_meal_plan(self, plan_id: str, user_id: str) -> bool:
         """Soft delete a meal plan (mark as inactive)"""
         try:
-            meal_plan = self.get_meal_plan_by_id(plan_id, user_id)
-            if not meal_plan:
-                logger.warning(f"Meal plan not found for deletion: {plan_id}")
-                return False
-            
-            meal_plan.is_active = False
-            meal_plan.updated_at = datetime.utcnow()
-            self.session.commit()
-            
-            logger.info(f"Meal plan soft deleted successfully: {plan_id}")
-            return True
+            with self._savepoint():
+                deleted_id = self.session.execute(
+                    update(MealPlan)
+                    .where(MealPlan.id == plan_id, MealPlan.user_id == user_id, MealPlan.is_active == True)
+                    .values(is_active=False, updated_at=datetime.utcnow())
+                    .returning(MealPlan.id)
+                ).scalar_one_or_none()
+                if deleted_id is None:
+                    logger.warning("Meal plan not found for deletion: %s", plan_id)
+                    return False
+                
+                forget_memoized_plan(plan_id)
+                self._commit(user_id)
+                
+                logger.info("Meal plan soft deleted successfully: %s", plan_id)
+                return True
             
         except Exception as e:
-            self.session.rollback()
-            logger.error(f"Error deleting meal plan {plan_id}: {str(e)}")
+            self._rollback()
+            logger.error("Error deleting meal plan %s: %s", plan_id, e)
             raise ValidationError(f"Failed to delete meal plan: {str(e)}")
     
-    def get_meal_plan_statistics(self, user_id: Optional[str] = None) -> Dict[str, Any]:
+    def get_meal_plan_statistics(self, user_id: Optional[str] = None) -> MealPlanStatistics:
         """Get comprehensive meal plan statistics"""
+        cache_key = read_cache_key(user_id, __name__, 'statistics')
+        cached = get_cached_read(cache_key)
+        if cached is not None:
+            return cached
+        
         try:
-            query = self.session.query(MealPlan).filter(MealPlan.is_active == True)
-            
+            conditions = [MealPlan.is_active == True]
             if user_id:
-                query = query.filter(MealPlan.user_id == user_id)
-            
-            meal_plans = query.all()
+                conditions.append(MealPlan.user_id == user_id)
+            
+            # Everything is computed by the database as a single aggregate row
+            is_rated = MealPlan.user_rating != 0
+            total_plans, total_cost, within_budget, total_calories, rated_count, avg_rating = self.session.execute(
+                select(
+                    func.count(MealPlan.id),
+                    func.coalesce(func.sum(MealPlan.estimated_total_cost_usd), 0),
+                    func.count().filter(MealPlan.within_budget_clause()),
+                    func.coalesce(func.sum(MealPlan.total_nutrition_summary['calories'].as_float()), 0),
+                    func.count().filter(is_rated),
+                    func.avg(MealPlan.user_rating).filter(is_rated),
+                ).where(*conditions)
+            ).one()
             
-            total_plans = len(meal_plans)
-            total_cost = sum([plan.estimated_total_cost_usd or 0 for plan in meal_plans])
             avg_cost = total_cost / total_plans if total_plans > 0 else 0
-            
-            # Calculate budget compliance
-            within_budget = len([plan for plan in meal_plans if plan.is_within_budget])
             budget_compliance = (within_budget / total_plans * 100) if total_plans > 0 else 0
-            
-            # Nutrition analysis
-            total_calories = sum([plan.total_nutrition_summary.get('calories', 0) 
-                                for plan in meal_plans if plan.total_nutrition_summary])
             avg_calories = total_calories / total_plans if total_plans > 0 else 0
             
-            # User feedback analysis
-            rated_plans = [plan for plan in meal_plans if plan.user_rating]
-            avg_rating = sum([plan.user_rating for plan in rated_plans]) / len(rated_plans) if rated_plans else 0
-            
-            stats = {
+            stats: MealPlanStatistics = {
                 'total_meal_plans': total_plans,
                 'total_cost_usd': total_cost,
                 'average_cost_per_plan': avg_cost,
                 'budget_compliance_percentage': budget_compliance,
                 'average_calories_per_plan': avg_calories,
-                'average_user_rating': avg_rating,
-                'total_rated_plans': len(rated_plans)
+                'average_user_rating': float(avg_rating) if avg_rating is not None else 0,
+                'total_rated_plans': rated_count
             }
             
             if user_id:
-                logger.debug(f"Meal plan statistics for user {user_id}: {stats}")
+                logger.debug("Meal plan statistics for user %s: %s", user_id, stats)
             else:
-                logger.debug(f"Global meal plan statistics: {stats}")
+                logger.debug("Global meal plan statistics: %s", stats)
             
+            cache_read(cache_key, stats)
             return stats
             
         except Exception as e:
-            logger.error(f"Error getting meal plan statistics: {str(e)}")
+            logger.error("Error getting meal plan statistics: %s", e)
             raise ValidationError(f"Failed to get statistics: {str(e)}")
     
     def get_popular_recipes(self, user_id: Optional[str] = None, limit: int = 10) -> List[Dict[str, Any]]:
         """Get most popular recipes from meal plans"""
+        cache_key = read_cache_key(user_id, __name__, 'popular_recipes', limit)
+        cached = get_cached_read(cache_key)
+        if cached is not None:
+            return cached
+        
         try:
-            query = self.session.query(MealPlan).filter(MealPlan.is_active == True)
-            
+            if self.session.get_bind().dialect.name == 'postgresql':
+                # Unnest and count server-side; only the top rows come back
+                params = {'limit': limit}
+                user_filter = ''
+                if user_id:
+                    user_filter = 'AND user_id = :user_id'
+                    params['user_id'] = user_id
+                statement = text(_POPULAR_RECIPES_SQL.format(user_filter=user_filter))
+                if user_id:
+                    statement = statement.bindparams(bindparam('user_id', type_=MealPlan.__table__.c.user_id.type))
+                result = [dict(row) for row in self.session.execute(statement, params).mappings()]
+                logger.debug("Found %s popular recipes", len(result))
+                cache_read(cache_key, result)
+                return result
+            
+            conditions = [MealPlan.is_active == True]
             if user_id:
-                query = query.filter(MealPlan.user_id == user_id)
-            
-            meal_plans = query.all()
+                conditions.append(MealPlan.user_id == user_id)
             
-            # Count recipe occurrences
+            # Only the meals column is needed; skip building MealPlan objects
+            # and count plans while streaming instead of keeping them in a list
             recipe_counts = {}
-            for plan in meal_plans:
-                for meal in plan.meals:
+            plan_count = 0
+            meals_stmt = select(MealPlan.meals).where(*conditions).execution_options(yield_per=MEAL_PLAN_STREAM_BATCH_SIZE)
+            for meals in self.session.execute(meals_stmt).scalars():
+                plan_count += 1
+                for meal in meals:
                     recipe_id = meal.get('recipe_id')
                     if recipe_id:
                         if recipe_id not in recipe_counts:
                             recipe_counts[recipe_id] = 0
                         recipe_counts[recipe_id] += 1
             
-            # Sort by popularity and limit
-            popular_recipes = sorted(recipe_counts.items(), key=lambda x: x[1], reverse=True)[:limit]
+            # Sort by popularity, ties by recipe_id like the SQL path, and limit
+            popular_recipes = sorted(recipe_counts.items(), key=lambda x: (-x[1], str(x[0])))[:limit]
             
             result = [
                 {
                     'recipe_id': recipe_id,
                     'usage_count': count,
-                    'popularity_score': count / len(meal_plans) if meal_plans else 0
+                    'popularity_score': count / plan_count if plan_count else 0
                 }
                 for recipe_id, count in popular_recipes
             ]
             
-            logger.debug(f"Found {len(result)} popular recipes")
+            logger.debug("Found %s popular recipes", len(result))
+            cache_read(cache_key, result)
             return result
             
         except Exception as e:
-            logger.error(f"Error getting popular recipes: {str(e)}")
+            logger.error("Error getting popular recipes: %s", e)
             raise ValidationError(f"Failed to get popular recipes: {str(e)}")
     
-    def check_for_existing_plan(self, user_id: str, plan_date: date, duration_days: int) -> Optional[MealPlan]:
-        """Check if a meal plan already exists for the given date range"""
+    def check_for_existing_plan(self, user_id: str, plan_date: date, duration_days: int) -> bool:
+        """Check if an active meal plan overlaps with the requested period"""
         try:
             end_date = plan_date + timedelta(days=duration_days - 1)
             
-            existing_plan = self.session.query(MealPlan).filter(
-                and_(
-                    MealPlan.user_id == user_id,
-                    MealPlan.is_active == True,
-                    # Check for overlap
-                    MealPlan.plan_date <= end_date,
-                    # Using the calculated end_date property
-                    # Note: This might need adjustment based on your exact end_date calculation
+            # Overlap: existing plan starts on/before our end and ends on/after our start
+            exists = self.session.execute(
+                select(
+                    select(MealPlan.id).where(
+                        MealPlan.user_id == user_id,
+                        MealPlan.is_active == True,
+                        MealPlan.plan_date <= end_date,
+                        MealPlan.end_date >= plan_date
+                    ).exists()
                 )
-            ).first()
+            ).scalar()
             
-            if existing_plan:
-                logger.debug(f"Existing meal plan found for user {user_id} overlapping with {plan_date}")
+            if exists:
+                logger.debug("Existing meal plan found for user %s overlapping with %s", user_id, plan_date)
             
-            return existing_plan
+            return bool(exists)
             
         except Exception as e:
-            logger.error(f"Error checking for existing meal plan: {str(e)}")
+            logger.error("Error checking for existing meal plan: %s", e)
             raise ValidationError(f"Failed to check for existing plan: {str(e)}")
     
-    def get_nutrition_trends(self, user_id: str, days: int = 30) -> Dict[str, Any]:
+    def get_nutrition_trends(self, user_id: str, days: int = 30) -> NutritionTrends:
         """Get nutrition trends for a user over time"""
+        cache_key = read_cache_key(user_id, __name__, 'nutrition_trends', days)
+        cached = get_cached_read(cache_key)
+        if cached is not None:
+            return cached
+        
         try:
             cutoff_date = date.today() - timedelta(days=days)
             
-            meal_plans = self.session.query(MealPlan).filter(
-                and_(
-                    MealPlan.user_id == user_id,
-                    MealPlan.plan_date >= cutoff_date,
-                    MealPlan.is_active == True
-                )
-            ).order_by(MealPlan.plan_date).all()
+            summary = MealPlan.total_nutrition_summary
+            nutrient_keys = ('calories', 'protein', 'carbs', 'fat')
+            filters = (
+                MealPlan.user_id == user_id,
+                MealPlan.plan_date >= cutoff_date,
+                MealPlan.is_active == True,
+                # Every plan with a non-empty summary counts as a day; missing nutrients are 0
+                summary.isnot(None),
+                cast(summary, Text).notin_(_EMPTY_JSON_TEXTS),
+            )
             
-            # Analyze nutrition trends
-            nutrition_data = []
-            for plan in meal_plans:
-                if plan.total_nutrition_summary:
-                    nutrition_data.append({
-                        'date': plan.plan_date.isoformat(),
-                        'calories': plan.total_nutrition_summary.get('calories', 0),
-                        'protein': plan.total_nutrition_summary.get('protein', 0),
-                        'carbs': plan.total_nutrition_summary.get('carbs', 0),
-                        'fat': plan.total_nutrition_summary.get('fat', 0)
-                    })
-            
-            # Calculate averages
-            if nutrition_data:
-                avg_calories = sum([d['calories'] for d in nutrition_data]) / len(nutrition_data)
-                avg_protein = sum([d['protein'] for d in nutrition_data]) / len(nutrition_data)
-                avg_carbs = sum([d['carbs'] for d in nutrition_data]) / len(nutrition_data)
-                avg_fat = sum([d['fat'] for d in nutrition_data]) / len(nutrition_data)
-            else:
-                avg_calories = avg_protein = avg_carbs = avg_fat = 0
+            # Lightweight rows for the time series, no ORM hydration; values keep their stored type
+            rows = self.session.execute(
+                select(MealPlan.plan_date, *(summary[key].label(key) for key in nutrient_keys))
+                .where(*filters)
+                .order_by(MealPlan.plan_date)
+                .execution_options(yield_per=MEAL_PLAN_STREAM_BATCH_SIZE)
+            )
+            nutrition_data: List[DailyNutrition] = [
+                {
+                    'date': row.plan_date.isoformat(),
+                    'calories': 0 if row.calories is None else row.calories,
+                    'protein': 0 if row.protein is None else row.protein,
+                    'carbs': 0 if row.carbs is None else row.carbs,
+                    'fat': 0 if row.fat is None else row.fat
+                }
+                for row in rows
+            ]
             
-            trends = {
+            # Averages in a single aggregate row
+            averages = self.session.execute(
+                select(*(
+                    func.avg(func.coalesce(summary[key].as_float(), 0.0)).label(key)
+                    for key in nutrient_keys
+                )).where(*filters)
+            ).one()
+            avg_calories = 0.0 if averages.calories is None else averages.calories
+            avg_protein = 0.0 if averages.protein is None else averages.protein
+            avg_carbs = 0.0 if averages.carbs is None else averages.carbs
+            avg_fat = 0.0 if averages.fat is None else averages.fat
+            
+            trends: NutritionTrends = {
                 'daily_nutrition': nutrition_data,
                 'averages': {
                     'calories': avg_calories,
@@ -378,9 +492,10 @@ class MealPlanRepository:
                 }
             }
             
-            logger.debug(f"Nutrition trends calculated for user {user_id}: {days} days")
+            logger.debug("Nutrition trends calculated for user %s: %s days", user_id, days)
+            cache_read(cache_key, trends)
             return trends
             
         except Exception as e:
-            logger.error(f"Error getting nutrition trends for user {user_id}: {str(e)}")
+            logger.error("Error getting nutrition trends for user %s: %s", user_id, e)
             raise ValidationError(f"Failed to get nutrition trends: {str(e)}") 
\ No newline at end of file
@@ -6,7 +6,7 @@ Data access layer for Recipe model operations
 import logging
 from typing import Optional, List, Dict, Any
 from sqlalchemy.orm import Session
-from sqlalchemy import and_, or_
+from sqlalchemy import and_, or_, func, update
 
 from core.models.recipe import Recipe
 from core.exceptions import ValidationError
@@ -14,6 +14,12 @@ from data_access.database import db
 
 logger = logging.getLogger(__name__)
 
+# Columns update_recipe may write; anything else in update_data is ignored.
+# dietary_tags is derived from the recipe content, never set directly
+_UPDATABLE_COLUMNS = frozenset(column.key for column in Recipe.__table__.columns) - {
+    'id', 'created_at', 'dietary_tags',
+}
+
 class RecipeRepository:
     """Repository for Recipe data access operations"""
     
@@ -88,19 +94,21 @@ class RecipeRepository:
             logger.error(f"Error getting recipes by meal type {meal_type}: {str(e)}")
             raise ValidationError(f"Failed to get recipes: {str(e)}")
     
+    def _dietary_filter(self, dietary_restrictions: List[str]):
+        """Dietary restriction clause for the session's database dialect"""
+        return Recipe.dietary_restrictions_filter(
+            dietary_restrictions, self.session.get_bind().dialect.name
+        )
+    
     def get_recipes_by_dietary_restrictions(self, dietary_restrictions: List[str]) -> List[Recipe]:
         """Get recipes that match dietary restrictions"""
         try:
-            recipes = self.session.query(Recipe).filter(Recipe.is_active == True).all()
-            
-            # Filter in Python using the model's method
-            filtered_recipes = [
-                recipe for recipe in recipes 
-                if recipe.matches_dietary_restrictions(dietary_restrictions)
-            ]
+            recipes = self.session.query(Recipe).filter(
+                and_(Recipe.is_active == True, self._dietary_filter(dietary_restrictions))
+            ).all()
             
-            logger.debug(f"Found {len(filtered_recipes)} recipes matching dietary restrictions: {dietary_restrictions}")
-            return filtered_recipes
+            logger.debug(f"Found {len(recipes)} recipes matching dietary restrictions: {dietary_restrictions}")
+            return recipes
             
         except Exception as e:
             logger.error(f"Error filtering recipes by dietary restrictions: {str(e)}")
@@ -189,16 +197,12 @@ class RecipeRepository:
                 if 'max_cost_usd' in filters:
                     max_cost_cents = int(filters['max_cost_usd'] * 100)
                     query = query.filter(Recipe.estimated_cost_usd <= max_cost_cents)
+                
+                if 'dietary_restrictions' in filters:
+                    query = query.filter(self._dietary_filter(filters['dietary_restrictions']))
             
             recipes = query.all()
             
-            # Additional filtering for dietary restrictions (if specified)
-            if filters and 'dietary_restrictions' in filters:
-                recipes = [
-                    recipe for recipe in recipes 
-                    if recipe.matches_dietary_restrictions(filters['dietary_restrictions'])
-                ]
-            
             logger.debug(f"Found {len(recipes)} recipes matching search: {search_term}")
             return recipes
             
@@ -228,14 +232,22 @@ class RecipeRepository:
     def update_recipe(self, recipe_id: str, update_data: Dict[str, Any]) -> Recipe:
         """Update an existing recipe"""
         try:
-            recipe = self.get_recipe_by_id(recipe_id)
+            values = {field: value for field, value in update_data.items() if field in _UPDATABLE_COLUMNS}
+            if values:
+                # Single UPDATE ... RETURNING instead of SELECT then UPDATE
+                recipe = self.session.execute(
+                    update(Recipe)
+                    .where(Recipe.id == recipe_id, Recipe.is_active == True)
+                    .values(**values)
+                    .returning(Recipe)
+                ).scalar_one_or_none()
+            else:
+                recipe = self.get_recipe_by_id(recipe_id)
             if not recipe:
                 raise ValidationError(f"Recipe not found: {recipe_id}")
             
-            # Update fields
-            for field, value in update_data.items():
-                if hasattr(recipe, field):
-                    setattr(recipe, field, value)
+            if values.keys() & {'name', 'description', 'ingredients'}:
+                recipe.refresh_dietary_tags()
             
             self.session.commit()
             logger.info(f"Recipe updated successfully: {recipe_id}")
@@ -249,12 +261,16 @@ class RecipeRepository:
     def delete_recipe(self, recipe_id: str) -> bool:
         """Soft delete a recipe (mark as inactive)"""
         try:
-            recipe = self.get_recipe_by_id(recipe_id)
-            if not recipe:
+            deleted_id = self.session.execute(
+                update(Recipe)
+                .where(Recipe.id == recipe_id, Recipe.is_active == True)
+                .values(is_active=False)
+                .returning(Recipe.id)
+            ).scalar_one_or_none()
+            if deleted_id is None:
                 logger.warning(f"Recipe not found for deletion: {recipe_id}")
                 return False
             
-            recipe.is_active = False
             self.session.commit()
             
             logger.info(f"Recipe soft deleted successfully: {recipe_id}")
@@ -268,7 +284,9 @@ class RecipeRepository:
     def get_recipe_count(self) -> int:
         """Get total count of active recipes"""
         try:
-            count = self.session.query(Recipe).filter(Recipe.is_active == True).count()
+            # Plain count(id) rather than Query.count()'s subquery wrap, so the
+            # partial index can answer it with an index-only scan
+            count = self.session.query(func.count(Recipe.id)).filter(Recipe.is_active == True).scalar()
             logger.debug(f"Total active recipes: {count}")
             return count
             
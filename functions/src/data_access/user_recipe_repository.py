@@ -5,7 +5,7 @@ Handles database operations for user recipes and categories
 
 from typing import List, Optional, Dict, Any, Tuple
 from sqlalchemy import and_, or_, func, desc, asc
-from sqlalchemy.orm import Session, joinedload
+from sqlalchemy.orm import Session, joinedload, selectinload
 from sqlalchemy.exc import IntegrityError
 
 from core.models.user_recipe import UserRecipe
@@ -39,10 +39,11 @@ class UserRecipeRepository:
         # Apply sorting
         query = self._apply_sorting(query, sort_by, sort_order)
         
-        # Apply pagination
+        # Apply pagination; categories load in one extra query per level for the
+        # whole page, rather than being joined into the LIMITed row set
         offset = (page - 1) * page_size
         recipes = query.offset(offset).limit(page_size).options(
-            joinedload(UserRecipe.category_assignments).joinedload(UserRecipeCategoryAssignment.category)
+            selectinload(UserRecipe.category_assignments).selectinload(UserRecipeCategoryAssignment.category)
         ).all()
         
         return recipes, total_count
@@ -282,7 +283,9 @@ class UserRecipeRepository:
         total_count = query.count()
         
         offset = (page - 1) * page_size
-        recipes = query.order_by(desc(UserRecipe.created_at)).offset(offset).limit(page_size).all()
+        recipes = query.order_by(desc(UserRecipe.created_at)).offset(offset).limit(page_size).options(
+            selectinload(UserRecipe.category_assignments).selectinload(UserRecipeCategoryAssignment.category)
+        ).all()
         
         return recipes, total_count
     
@@ -324,9 +327,7 @@ class UserRecipeRepository:
         # Cooking time filter (max minutes)
         if 'max_total_time' in filters and filters['max_total_time']:
             max_time = filters['max_total_time']
-            query = query.filter(
-                (UserRecipe.prep_time_minutes + UserRecipe.cook_time_minutes) <= max_time
-            )
+            query = query.filter(UserRecipe.total_time_minutes <= max_time)
         
         # Category filter
         if 'category_id' in filters and filters['category_id']:
@@ -137,8 +137,8 @@ class GroceryListService:
         saved_list = self.grocery_list_repo.create(grocery_list)
         
         # 7. Create grocery list items
-        for item_data in categorized_items:
-            item = GroceryListItem(
+        items = [
+            GroceryListItem(
                 grocery_list_id=str(saved_list.id),
                 ingredient_name=item_data['name'],
                 quantity=item_data['quantity'],
@@ -147,7 +147,9 @@ class GroceryListService:
                 estimated_cost=item_data['cost'],
                 is_custom=False
             )
-            self.grocery_list_repo.add_item(item)
+            for item_data in categorized_items
+        ]
+        self.grocery_list_repo.bulk_add_items(items)
         
         logger.info(f"Generated grocery list {saved_list.id} with {len(categorized_items)} items")
         
@@ -164,24 +166,21 @@ class GroceryListService:
         Returns:
             Dictionary with grocery list and items, or None if not found
         """
-        grocery_list = self.grocery_list_repo.get_by_id(list_id)
-        if not grocery_list or str(grocery_list.user_id) != user_id:
+        grocery_list = self.grocery_list_repo.get_by_id(list_id, user_id=user_id)
+        if not grocery_list:
             return None
         
-        items = self.grocery_list_repo.get_items_by_list_id(list_id)
-        
-        # Group items by category
-        items_by_category = {}
-        for item in items:
-            category = item.category or 'other'
-            if category not in items_by_category:
-                items_by_category[category] = []
-            items_by_category[category].append(item.to_dict())
+        # Items come back already grouped by category from an index-ordered query
+        grouped_items = self.grocery_list_repo.get_items_grouped_by_category(list_id)
+        items_by_category = {
+            category: [item.to_dict() for item in items]
+            for category, items in grouped_items.items()
+        }
         
         return {
             'grocery_list': grocery_list.to_dict(),
             'items_by_category': items_by_category,
-            'total_items': len(items)
+            'total_items': sum(len(items) for items in grouped_items.values())
         }
     
     def update_grocery_list(self, list_id: str, user_id: str, 
@@ -197,11 +196,8 @@ class GroceryListService:
         Returns:
             Updated GroceryList object or None if not found
         """
-        grocery_list = self.grocery_list_repo.get_by_id(list_id)
-        if not grocery_list or str(grocery_list.user_id) != user_id:
-            return None
-        
-        return self.grocery_list_repo.update(list_id, updates)
+        # Ownership is checked in the UPDATE's WHERE clause
+        return self.grocery_list_repo.update(list_id, updates, user_id=user_id)
     
     def add_custom_item(self, list_id: str, user_id: str, item_data: Dict[str, Any]) -> Optional[GroceryListItem]:
         """
@@ -215,8 +211,8 @@ class GroceryListService:
         Returns:
             Created GroceryListItem or None if list not found
         """
-        grocery_list = self.grocery_list_repo.get_by_id(list_id)
-        if not grocery_list or str(grocery_list.user_id) != user_id:
+        grocery_list = self.grocery_list_repo.get_by_id(list_id, user_id=user_id)
+        if not grocery_list:
             return None
         
         # Categorize the custom item
@@ -237,7 +233,8 @@ class GroceryListService:
             is_custom=True
         )
         
-        created_item = self.grocery_list_repo.add_item(item)
+        # Adding an ingredient already on the list merges into that row
+        created_item = self.grocery_list_repo.upsert_item(item)
         
         # Update total cost of grocery list
         self._recalculate_list_total(list_id)
@@ -246,29 +243,18 @@ class GroceryListService:
     
     def toggle_item_checked(self, item_id: str, user_id: str) -> Optional[GroceryListItem]:
         """Toggle the checked status of a grocery list item"""
-        item = self.grocery_list_repo.get_item_by_id(item_id)
-        if not item:
-            return None
-        
-        # Verify user owns the grocery list
-        grocery_list = self.grocery_list_repo.get_by_id(str(item.grocery_list_id))
-        if not grocery_list or str(grocery_list.user_id) != user_id:
-            return None
-        
-        return self.grocery_list_repo.toggle_item_checked(item_id)
+        # Ownership is checked in the UPDATE's WHERE clause
+        return self.grocery_list_repo.toggle_item_checked(item_id, user_id=user_id)
     
     def update_item_quantity(self, item_id: str, user_id: str, 
                            new_quantity: str, new_unit: Optional[str] = None) -> Optional[GroceryListItem]:
         """Update the quantity and unit of a grocery list item"""
-        item = self.grocery_list_repo.get_item_by_id(item_id)
+        # Current name and unit are needed to re-estimate the cost; the lookup
+        # also verifies the user owns the item's list
+        item = self.grocery_list_repo.get_item_by_id(item_id, user_id=user_id)
         if not item:
             return None
         
-        # Verify user owns the grocery list
-        grocery_list = self.grocery_list_repo.get_by_id(str(item.grocery_list_id))
-        if not grocery_list or str(grocery_list.user_id) != user_id:
-            return None
-        
         # Recalculate cost based on new quantity
         new_cost = self._estimate_ingredient_cost(item.ingredient_name, new_quantity, new_unit or item.unit)
         
@@ -288,33 +274,27 @@ class GroceryListService:
     
     def delete_item(self, item_id: str, user_id: str) -> bool:
         """Delete a grocery list item"""
-        item = self.grocery_list_repo.get_item_by_id(item_id)
-        if not item:
-            return False
+        # Ownership is checked in the DELETE's WHERE clause
+        list_id = self.grocery_list_repo.delete_item(item_id, user_id=user_id)
         
-        # Verify user owns the grocery list
-        grocery_list = self.grocery_list_repo.get_by_id(str(item.grocery_list_id))
-        if not grocery_list or str(grocery_list.user_id) != user_id:
+        if list_id is None:
             return False
         
-        success = self.grocery_list_repo.delete_item(item_id)
-        
-        if success:
-            # Update total cost of grocery list
-            self._recalculate_list_total(str(item.grocery_list_id))
-        
-        return success
+        # Update total cost of grocery list
+        self._recalculate_list_total(str(list_id))
+        return True
     
     def get_user_grocery_lists(self, user_id: str) -> List[Dict[str, Any]]:
         """Get all grocery lists for a user"""
         lists = self.grocery_list_repo.get_by_user_id(user_id)
+        counts = self.grocery_list_repo.get_counts_for_lists([grocery_list.id for grocery_list in lists])
         result = []
         
         for grocery_list in lists:
-            items = self.grocery_list_repo.get_items_by_list_id(str(grocery_list.id))
+            checked, unchecked = counts[str(grocery_list.id)]
             list_data = grocery_list.to_dict()
-            list_data['item_count'] = len(items)
-            list_data['checked_count'] = len([item for item in items if item.is_checked])
+            list_data['item_count'] = checked + unchecked
+            list_data['checked_count'] = checked
             result.append(list_data)
         
         return result
@@ -530,7 +510,6 @@ class GroceryListService:
     
     def _recalculate_list_total(self, list_id: str) -> None:
         """Recalculate and update the total cost of a grocery list"""
-        items = self.grocery_list_repo.get_items_by_list_id(list_id)
-        total_cost = sum(item.estimated_cost or 0 for item in items)
+        total_cost = self.grocery_list_repo.get_items_total_cost(list_id)
         
         self.grocery_list_repo.update(list_id, {'total_estimated_cost': total_cost}) 
\ No newline at end of file
@@ -13,6 +13,7 @@ from core.models.meal_plan import MealPlan
 from core.models.user_preferences import UserPreferences
 from core.exceptions import ValidationError, AppError
 from data_access.database import db
+from data_access.meal_plan_repository import invalidate_read_cache
 from services.preference_learning_service import PreferenceLearningService
 from sqlalchemy.orm.attributes import flag_modified
 
@@ -173,8 +174,9 @@ class MealSubstitutionService:
         # Recalculate nutritional summaries
         self._recalculate_meal_plan_nutrition(meal_plan)
         
-        # Save changes
+        # Save changes; cached plan statistics and trends are now stale
         db.session.commit()
+        invalidate_read_cache(user_id)
         
         logger.info(f"Substitution applied successfully: {original_recipe_id} -> {new_recipe_id}")
         return meal_plan
@@ -214,8 +216,9 @@ class MealSubstitutionService:
         # Remove from history
         self._remove_substitution_history(history)
         
-        # Save changes
+        # Save changes; cached plan statistics and trends are now stale
         db.session.commit()
+        invalidate_read_cache(user_id)
         
         logger.info(f"Substitution undone successfully: {history.new_recipe_id} -> {history.original_recipe_id}")
         return meal_plan
@@ -39,14 +39,8 @@ class PreferenceLearningService:
             if user_prefs and 'preferences' in user_prefs:
                 dietary_restrictions = user_prefs['preferences'].get('dietary_restrictions', [])
             
-            # Get all active recipes
-            all_recipes = self.recipe_repository.get_all_active_recipes()
-            
-            # Filter by dietary restrictions
-            filtered_recipes = [
-                recipe for recipe in all_recipes 
-                if recipe.matches_dietary_restrictions(dietary_restrictions)
-            ]
+            # Get active recipes matching dietary restrictions
+            filtered_recipes = self.recipe_repository.get_recipes_by_dietary_restrictions(dietary_restrictions)
             
             # Get recipes user hasn't swiped on yet
             swipe_prefs = self.user_preferences.get_swipe_preferences(user_id)
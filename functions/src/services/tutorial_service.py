@@ -9,7 +9,7 @@ from dataclasses import dataclass
 from sqlalchemy.orm import Session
 import math
 
-from core.models.tutorial import Tutorial, TutorialProgress
+from core.models.tutorial import Tutorial, TutorialProgress, TutorialDifficulty
 from core.models.user import User
 from data_access.tutorial_repository import TutorialRepository, TutorialProgressRepository
 from data_access.user_repository import UserRepository
@@ -388,7 +388,7 @@ class TutorialService:
             categories = [cat['category'] for cat in self.get_tutorial_categories()]
             
             # Define available difficulty levels
-            difficulty_levels = ['beginner', 'intermediate', 'advanced']
+            difficulty_levels = [level.value for level in TutorialDifficulty]
             
             # Define duration options (in minutes)
             duration_options = [15, 30, 60, 120]  # Up to 15min, 30min, 1hr, 2hr